@@ -9,13 +9,21 @@ from time import perf_counter
 from typing import TYPE_CHECKING
 
 from src.argsbuilder import build_parser
-from src.factories import SCISCRAPERS, read_factory
+from src.batch import BatchSciScraper
+from src.factories import (
+    SCISCRAPERS,
+    WATCHER,
+    read_factory,
+    select_extractor,
+)
 from src.log import logger
 from src.profilers import get_profiler
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from src.fetch import SciScraper
+
 
 def main(argv: Sequence[str] | None = None) -> None:
     """
@@ -23,8 +31,8 @@ def main(argv: Sequence[str] | None = None) -> None:
 
     The function uses the `argparse` module to parse command line arguments passed in the `argv` parameter.
     The parsed arguments are used to determine the actions to be taken, which may include running the `sciscrape`
-    function with the specified file and export options, running a benchmark on the `sciscrape` function, or
-    conducting a memory profile of the `sciscrape` function.
+    function with the specified file and export options, running a benchmark on the `sciscrape` function,
+    conducting a memory profile of the `sciscrape` function, or watching the source directory for new .pdfs.
 
     Parameters
     ---------
@@ -40,7 +48,29 @@ def main(argv: Sequence[str] | None = None) -> None:
     start = perf_counter()
     args = build_parser(argv)
 
-    sciscrape = read_factory() if args.mode is None else SCISCRAPERS[args.mode]
+    if args.extractor is not None:
+        select_extractor(args.extractor)
+
+    if args.watch:
+        WATCHER.run()
+        return
+
+    sciscrapers = (
+        {mode: SCISCRAPERS[mode] for mode in args.mode}
+        if args.mode is not None
+        else {"": read_factory()}
+    )
+    for sciscraper in sciscrapers.values():
+        sciscraper.export_format = args.format
+        sciscraper.partition_by_year = args.partition_by_year
+        for fetcher in (sciscraper.scraper, sciscraper.stager):
+            if fetcher is not None:
+                fetcher.force = args.force
+    sciscrape: SciScraper | BatchSciScraper = (
+        BatchSciScraper(sciscrapers)
+        if len(sciscrapers) > 1
+        else next(iter(sciscrapers.values()))
+    )
     logger.debug(repr(args.file))
 
     get_profiler(args, sciscrape)
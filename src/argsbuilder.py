@@ -10,6 +10,8 @@ from typing import TYPE_CHECKING
 from pydantic import FilePath
 
 from src.config import config
+from src.exporters import EXPORT_FORMATS
+from src.extractors import EXTRACTORS
 from src.factories import SCISCRAPERS
 
 if TYPE_CHECKING:
@@ -68,9 +70,46 @@ def build_parser(argv: Sequence[str] | None) -> Namespace:
         "--mode",
         default=None,
         type=str,
+        nargs="+",
         choices=([key for key, _ in SCISCRAPERS.items()]),
-        help="Specify the sciscraper to be used,\
-            if None is provided, the user will be prompted\
-            with an input: %(default)s)",
+        help="Specify the sciscraper, or sciscrapers, to be used.\
+            Modes that share a scrape run it once, and each writes\
+            its own export. If None is provided, the user will be\
+            prompted with an input: %(default)s)",
+    )
+    parser.add_argument(
+        "-o",
+        "--format",
+        default="csv",
+        choices=EXPORT_FORMATS,
+        help="Specify the format of the export, Parquet and Feather\
+            keep each column's dtype: default: %(default)s)",
+    )
+    parser.add_argument(
+        "--partition-by-year",
+        action="store_true",
+        help="Split Parquet exports into one directory per year\
+            of publication: default: %(default)s)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Fetch every term again, even those downloaded or scored\
+            in earlier runs: default: %(default)s)",
+    )
+    parser.add_argument(
+        "-x",
+        "--extractor",
+        default=None,
+        choices=list(EXTRACTORS),
+        help="Specify the .pdf text extraction backend,\
+            if None is provided, pdfplumber is used: %(default)s)",
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help="Watch the configured source directory, scoring .pdfs\
+            as they arrive, until interrupted: default: %(default)s)",
     )
     return parser.parse_args(argv)
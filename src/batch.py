@@ -0,0 +1,111 @@
+"""batch.py runs several sciscraper modes over one file in a single pass.
+
+Most modes share their first stage, so a `BatchSciScraper` runs each
+distinct `ScrapeFetcher` once, and feeds its dataframe to the stager
+of every mode that shares it, as a branch. Branches whose stagers
+request different hosts run concurrently, in threads of their own,
+while branches that request the same host run one after another,
+so that no host is sent more requests at once than in a single run.
+Each branch writes its own export, named after its mode.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from src.log import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    import pandas as pd
+
+    from src.fetch import Fetcher, SciScraper
+
+LOCAL_LANE = "local"
+
+
+def lane(stager: Fetcher | None) -> str:
+    """Returns the host a stager requests, or, for stagers that make no
+    requests of a single host, a lane of their own."""
+    if stager is None:
+        return LOCAL_LANE
+    url = getattr(stager.scraper, "url", None)
+    host = urlparse(url).netloc if isinstance(url, str) else ""
+    return host or type(stager.scraper).__name__
+
+
+@dataclass
+class BatchSciScraper:
+    """
+    BatchSciScraper runs each of `sciscrapers`, keyed by their mode,
+    over the same target, sharing each of their scrapes.
+
+    Attributes
+    ---------
+    sciscrapers : Mapping[str, SciScraper]
+        The modes to be run, and the sciscraper of each.
+    """
+
+    sciscrapers: Mapping[str, SciScraper]
+
+    def __call__(self, target: Path) -> None:
+        shared: dict[int, list[str]] = {}
+        for mode, sciscraper in self.sciscrapers.items():
+            shared.setdefault(id(sciscraper.scraper), []).append(mode)
+        logger.info(
+            "modes=%s, scrapes=%d, target=%s",
+            ",".join(self.sciscrapers),
+            len(shared),
+            target,
+        )
+        for modes in shared.values():
+            first = self.sciscrapers[modes[0]]
+            first.set_logging()
+            self.run_branches(first.scraper(target), modes)
+
+    def run_branches(self, dataframe: pd.DataFrame, modes: list[str]) -> None:
+        """
+        Runs the branch of each mode over the scraped dataframe, each lane
+        in a thread of its own. A failed branch does not stop the others,
+        and its error is raised once they have all finished.
+        """
+        lanes: dict[str, list[str]] = {}
+        for mode in modes:
+            stager = self.sciscrapers[mode].stager
+            lanes.setdefault(lane(stager), []).append(mode)
+        logger.info(
+            "lanes=%s",
+            "; ".join(
+                f"{host}: {', '.join(lane_modes)}"
+                for host, lane_modes in lanes.items()
+            ),
+        )
+
+        def run_lane(lane_modes: list[str]) -> list[BaseException]:
+            errors = []
+            for mode in lane_modes:
+                try:
+                    self.sciscrapers[mode].branch(dataframe, mode)
+                except Exception as e:
+                    logger.error(
+                        "mode=%s, error=%s, action_undertaken=%s",
+                        mode,
+                        e,
+                        "Continuing with the remaining branches",
+                    )
+                    errors.append(e)
+            return errors
+
+        with ThreadPoolExecutor(max_workers=len(lanes)) as executor:
+            errors = [
+                error
+                for errors in executor.map(run_lane, lanes.values())
+                for error in errors
+            ]
+        if errors:
+            raise errors[0]
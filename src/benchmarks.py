@@ -0,0 +1,635 @@
+"""benchmarks.py contains comparative benchmarks for sciscraper's
+performance-sensitive components.
+
+Each benchmark returns a dataframe of its measurements, and can be run
+from the command line, e.g.:
+
+    python -m src.benchmarks extractors tests/test_dirs
+"""
+
+from __future__ import annotations
+
+import pickle
+import random
+import tracemalloc
+from argparse import ArgumentParser
+from collections import Counter, deque
+from dataclasses import MISSING, field, fields, make_dataclass
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from src.columnar import ColumnarBuilder
+from src.config import KEY_TYPE_PAIRINGS
+from src.docscraper import DocumentResult
+from src.exporters import EXPORT_FORMATS, export_dataframe, read_export
+from src.extractors import EXTRACTORS
+from src.fetch import SciScraper
+from src.log import logger
+from src.scheduling import page_count, simulate_makespan
+from src.serials import (
+    CSV_ENGINE,
+    clean_any_nested_columns,
+    clean_nested_series,
+    decode_nested_cell,
+    list_with_na_replacement,
+    serialize_from_csv,
+    stream_from_csv,
+)
+from src.stagers import stage_from_series, stage_with_reference
+from src.webscrapers import WebScrapeResult
+from src.workers import SupervisedPool
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+    from src.config import FilePath
+
+
+def token_agreement(text: str, reference: str) -> float:
+    """
+    Returns the weighted Jaccard similarity between the bags of words
+    of `text` and `reference`: 1.0 when both contain exactly
+    the same words with the same frequencies.
+    """
+    tokens = Counter(text.lower().split())
+    reference_tokens = Counter(reference.lower().split())
+    union = sum((tokens | reference_tokens).values())
+    if not union:
+        return 1.0
+    return sum((tokens & reference_tokens).values()) / union
+
+
+def benchmark_extractors(
+    corpus: FilePath,
+    names: Sequence[str] | None = None,
+    reference: str = "pdfplumber",
+) -> pd.DataFrame:
+    """
+    Extracts the text of every .pdf in `corpus` with each backend,
+    and compares their speed, in pages per second, and the agreement
+    of their tokens with those of the `reference` backend.
+
+    :param FilePath corpus: A directory of .pdfs to extract.
+    :param Sequence[str] | None names: The backends to compare. Defaults to all of them.
+    :param str reference: The backend whose text is treated as correct.
+    :rtype pd.DataFrame:
+    :returns: One row per backend.
+    """
+    pdfs = sorted(Path(corpus).rglob("*.pdf"))
+    names = list(names or EXTRACTORS)
+    texts: dict[str, list[str]] = {}
+    rows = []
+    for name in dict.fromkeys([reference, *names]):
+        extractor = EXTRACTORS[name]()
+        pages = 0
+        texts[name] = []
+        start = perf_counter()
+        for pdf in pdfs:
+            page_texts = extractor.extract_pages(pdf)
+            pages += len(page_texts)
+            texts[name].append(" ".join(page_texts))
+        elapsed = perf_counter() - start
+        agreement = [
+            token_agreement(text, reference_text)
+            for text, reference_text in zip(texts[name], texts[reference])
+        ]
+        rows.append({
+            "extractor": name,
+            "documents": len(pdfs),
+            "pages": pages,
+            "seconds": elapsed,
+            "pages_per_second": pages / elapsed if elapsed else 0.0,
+            "token_agreement": (
+                sum(agreement) / len(agreement) if agreement else 1.0
+            ),
+        })
+    return pd.DataFrame(rows).set_index("extractor")
+
+
+def mixed_size_costs(
+    small: int = 120, large: int = 8, seed: int = 315
+) -> list[float]:
+    """
+    Returns the page counts of a mixed-size fixture set:
+    many short papers, with a few long proceedings found last,
+    as can happen with `rglob` order.
+    """
+    rng = random.Random(seed)
+    papers = [float(rng.randint(4, 30)) for _ in range(small)]
+    proceedings = [float(rng.randint(300, 800)) for _ in range(large)]
+    return papers + proceedings
+
+
+def _sleep_for(seconds: float) -> float:
+    sleep(seconds)
+    return seconds
+
+
+def benchmark_scheduling(
+    costs: Sequence[float] | None = None,
+    workers: int = 4,
+    seconds_per_run: float | None = 2.0,
+) -> pd.DataFrame:
+    """
+    Compares the makespan of handing out work in its original (FIFO)
+    order against handing out the largest items first.
+
+    The makespan of each order is estimated by simulation and,
+    if `seconds_per_run` is provided, also measured by running sleeping
+    tasks, scaled to their costs, through a `SupervisedPool`.
+
+    :param Sequence[float] | None costs: The cost of each item. Defaults to `mixed_size_costs()`.
+    :param int workers: The number of workers.
+    :param float | None seconds_per_run: Roughly how long each measured run should take.
+    :rtype pd.DataFrame:
+    :returns: One row per order.
+    """
+    costs = list(costs or mixed_size_costs())
+    rows = []
+    for order, pool_cost in (("fifo", None), ("largest_first", float)):
+        ordered = sorted(costs, reverse=True) if pool_cost else costs
+        row = {
+            "order": order,
+            "items": len(costs),
+            "workers": workers,
+            "estimated_makespan": simulate_makespan(ordered, workers),
+        }
+        if seconds_per_run:
+            scale = seconds_per_run * workers / sum(costs)
+            pool = SupervisedPool(workers, cost=pool_cost)
+            start = perf_counter()
+            list(pool.map(_sleep_for, [cost * scale for cost in costs]))
+            row["measured_seconds"] = perf_counter() - start
+        rows.append(row)
+    results = pd.DataFrame(rows).set_index("order")
+    results["improvement"] = 1 - (
+        results["estimated_makespan"]
+        / results.loc["fifo", "estimated_makespan"]
+    )
+    return results
+
+
+def write_synthetic_export(
+    target: FilePath, rows: int, seed: int = 315
+) -> None:
+    """Writes a Dimensions-style export of `rows` papers,
+    each with a title, a DOI and a few hundred characters of abstract."""
+    rng = random.Random(seed)
+    words = ["nudge", "choice", "default", "salience", "framing", "habit"]
+    pd.DataFrame({
+        "title": [f"Paper {n}" for n in range(rows)],
+        "doi": [f"10.1000/{n}" for n in range(rows)],
+        "abstract": [" ".join(rng.choices(words, k=60)) for _ in range(rows)],
+    }).to_csv(target)
+
+
+def measure(func: Callable[[], object]) -> tuple[float, float]:
+    """Returns the seconds taken by `func`, and the peak memory,
+    in MiB, allocated through Python while it ran. Tracing slows
+    allocations down, so `func` is timed in a separate, untraced run."""
+    start = perf_counter()
+    func()
+    elapsed = perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1 << 20)
+
+
+def benchmark_csv_ingestion(rows: int = 200_000) -> pd.DataFrame:
+    """
+    Compares reading the abstracts and titles of a .csv export by loading
+    it twice, as `abstract_lookup` once did, against streaming both
+    columns from it in a single, chunked pass.
+
+    Peak memory is measured with `tracemalloc`, so buffers that pyarrow
+    allocates outside of Python are not counted.
+
+    :param int rows: The number of papers in the synthetic export.
+    :rtype pd.DataFrame:
+    :returns: One row per method.
+    """
+    methods: dict[str, Callable[[Path], object]] = {
+        "read_csv_twice": lambda target: (
+            serialize_from_csv(target, "abstract"),
+            serialize_from_csv(target, "title"),
+        ),
+        "stream_c": lambda target: deque(
+            stream_from_csv(target, "abstract", ("title",), engine="c"),
+            maxlen=0,
+        ),
+    }
+    if CSV_ENGINE == "pyarrow":
+        methods["stream_pyarrow"] = lambda target: deque(
+            stream_from_csv(target, "abstract", ("title",), engine="pyarrow"),
+            maxlen=0,
+        )
+    with TemporaryDirectory() as directory:
+        target = Path(directory, "export.csv")
+        write_synthetic_export(target, rows)
+        size = target.stat().st_size / (1 << 20)
+        results = []
+        for method, read in methods.items():
+            seconds, peak = measure(lambda: read(target))
+            results.append({
+                "method": method,
+                "rows": rows,
+                "file_mib": size,
+                "seconds": seconds,
+                "peak_mib": peak,
+            })
+    return pd.DataFrame(results).set_index("method")
+
+
+def nested_column(
+    rows: int = 1_000_000, distinct: int = 1_000, share: float = 0.5
+) -> pd.Series:
+    """Returns an "authors" column in which `share` of the cells are
+    dict-encoded, drawn from `distinct` different payloads."""
+    rng = random.Random(315)
+    payloads = [
+        repr({"authors": f"Author {n}", "authors_id": n, "uni_id": str(n)})
+        for n in range(distinct)
+    ]
+    return pd.Series(
+        [
+            rng.choice(payloads) if rng.random() < share else f"Author {n}"
+            for n in range(rows)
+        ],
+        dtype=object,
+    )
+
+
+def _eval_nested_cells(data_list: list[str], column: str) -> list[str]:
+    # The `eval`-based decoder that `clean_nested_series` replaced.
+    initial_terms = [term for term in data_list if not term.startswith("{")]
+    nested_terms = [
+        eval(term).get(column, "")
+        for term in data_list
+        if term.startswith("{")
+    ]
+    return initial_terms + nested_terms
+
+
+def benchmark_nested_decoding(
+    rows: int = 1_000_000, distinct: int = 1_000
+) -> pd.DataFrame:
+    """
+    Compares decoding the dict-encoded cells of a column with `eval`,
+    cell by cell, against `clean_nested_series`, which decodes each
+    distinct payload once with a literal parser.
+
+    :param int rows: The number of cells in the column.
+    :param int distinct: The number of distinct dict-encoded payloads.
+    :rtype pd.DataFrame:
+    :returns: One row per decoder.
+    """
+    column = nested_column(rows, distinct)
+    data_list = column.to_list()
+    decode_nested_cell.cache_clear()
+    decoders: dict[str, Callable[[], object]] = {
+        "eval": lambda: _eval_nested_cells(data_list, "authors"),
+        "clean_nested_series": lambda: clean_nested_series(column, "authors"),
+    }
+    results = []
+    for decoder, decode in decoders.items():
+        start = perf_counter()
+        decode()
+        results.append({
+            "decoder": decoder,
+            "rows": rows,
+            "distinct_payloads": distinct,
+            "seconds": perf_counter() - start,
+        })
+    return pd.DataFrame(results).set_index("decoder")
+
+
+def citations_frame(rows: int = 200_000, seed: int = 315) -> pd.DataFrame:
+    """Returns a frame shaped like a Dimensions export,
+    with an abstract and a list of cited papers per row."""
+    rng = random.Random(seed)
+    words = ["nudge", "choice", "default", "salience", "framing", "habit"]
+    return pd.DataFrame({
+        "title": [f"Paper {n}" for n in range(rows)],
+        "doi": [f"10.1000/{n}" for n in range(rows)],
+        "times_cited": [rng.randint(0, 500) for _ in range(rows)],
+        "abstract": [" ".join(rng.choices(words, k=60)) for _ in range(rows)],
+        "citations": [
+            [f"pub.{rng.randint(0, 10**8)}" for _ in range(rng.randint(0, 6))]
+            for _ in range(rows)
+        ],
+    })
+
+
+def _copying_stage_from_series(target: pd.DataFrame, column: str) -> list[str]:
+    # Staging as it was before `stage_from_series` stopped copying.
+    return clean_any_nested_columns(
+        list_with_na_replacement(target.copy(), column), column
+    )
+
+
+def _copying_stage_with_reference(
+    target: pd.DataFrame, column_x: str, column_y: str
+) -> tuple[list[str], list[str]]:
+    data = target.copy().explode(column_x)
+    return (
+        clean_any_nested_columns(
+            list_with_na_replacement(data, column_x), column_x
+        ),
+        clean_any_nested_columns(
+            list_with_na_replacement(data, column_y), column_y
+        ),
+    )
+
+
+def benchmark_staging(rows: int = 200_000) -> pd.DataFrame:
+    """
+    Compares the peak memory of staging terms by copying the prior
+    dataframe, and materializing lists, against staging them lazily
+    from views of its columns, as a fetcher consumes them.
+
+    :param int rows: The number of papers in the prior dataframe.
+    :rtype pd.DataFrame:
+    :returns: One row per stager and method.
+    """
+    target = citations_frame(rows)
+    stagers: dict[tuple[str, str], Callable[[], object]] = {
+        ("series", "copying"): lambda: _copying_stage_from_series(
+            target, "abstract"
+        ),
+        ("series", "lazy"): lambda: deque(
+            stage_from_series(target, "abstract"), maxlen=0
+        ),
+        ("reference", "copying"): lambda: _copying_stage_with_reference(
+            target, "citations", "title"
+        ),
+        ("reference", "compact"): lambda: deque(
+            stage_with_reference(target, "citations", "title").terms,
+            maxlen=0,
+        ),
+    }
+    results = []
+    for (stager, method), stage in stagers.items():
+        seconds, peak = measure(stage)
+        results.append({
+            "stager": stager,
+            "method": method,
+            "rows": rows,
+            "seconds": seconds,
+            "peak_mib": peak,
+        })
+    return pd.DataFrame(results).set_index(["stager", "method"])
+
+
+def document_results(rows: int, seed: int = 315) -> Iterator[DocumentResult]:
+    """Yields `rows` scored documents, as `DocScraper` would."""
+    rng = random.Random(seed)
+    for n in range(rows):
+        matching, bycatch = rng.randint(0, 300), rng.randint(0, 50)
+        yield DocumentResult(
+            doi_from_pdf=f"10.1000/{n}",
+            matching_terms=matching,
+            bycatch_terms=bycatch,
+            total_word_count=rng.randint(1_000, 20_000),
+            wordscore=rng.random() * 100,
+            target_terms_top_3=[("nudge", matching)],
+            bycatch_terms_top_3=[("mouse", bycatch)],
+            document_id=f"paper_{n}.pdf",
+        )
+
+
+def _list_then_cast(rows: int) -> pd.DataFrame:
+    # Building the frame as `Fetcher.fetch` did before `ColumnarBuilder`.
+    dataframe = pd.DataFrame(list(document_results(rows)))
+    for key, dtype in KEY_TYPE_PAIRINGS.items():
+        if key in dataframe:
+            dataframe[key] = dataframe[key].astype(dtype)
+    return dataframe
+
+
+def _columnar(rows: int) -> pd.DataFrame:
+    builder = ColumnarBuilder()
+    builder.extend(document_results(rows))
+    return builder.build()
+
+
+def benchmark_columnar(rows: int = 1_000_000) -> pd.DataFrame:
+    """
+    Compares building a dataframe of scored documents from a list of
+    dataclasses, and then casting its columns, against collecting each
+    document into typed columns as it arrives.
+
+    :param int rows: The number of documents.
+    :rtype pd.DataFrame:
+    :returns: One row per method.
+    """
+    methods: dict[str, Callable[[], object]] = {
+        "list_then_cast": lambda: _list_then_cast(rows),
+        "columnar": lambda: _columnar(rows),
+    }
+    results = []
+    for method, build in methods.items():
+        seconds, peak = measure(build)
+        results.append({
+            "method": method,
+            "rows": rows,
+            "seconds": seconds,
+            "peak_mib": peak,
+        })
+    return pd.DataFrame(results).set_index("method")
+
+
+def _dict_backed(cls: type) -> type:
+    # A copy of a record class as it was before `slots=True`,
+    # with a `__dict__` per instance and no interning.
+    specs = []
+    for item in fields(cls):
+        if item.default is not MISSING:
+            spec = field(default=item.default)
+        elif item.default_factory is not MISSING:
+            spec = field(default_factory=item.default_factory)
+        else:
+            spec = field()
+        specs.append((item.name, item.type, spec))
+    record = make_dataclass(f"Dict{cls.__name__}", specs, frozen=True)
+    record.__module__ = __name__
+    return record
+
+
+DictWebScrapeResult = _dict_backed(WebScrapeResult)
+
+
+def citation_records(
+    record: Callable[..., object], rows: int, seed: int = 315
+) -> list[object]:
+    """Returns `rows` citations, as `DimensionsScraper` would,
+    drawn from a few hundred journals and a few decades."""
+    rng = random.Random(seed)
+    return [
+        record(
+            title=f"Paper {n}",
+            pub_date=str(rng.randint(1990, 2023)),
+            doi=f"10.1000/{n}",
+            internal_id=f"pub.{n}",
+            journal_title=f"Journal of Behavior {rng.randint(0, 300)}",
+            times_cited=rng.randint(0, 500),
+        )
+        for n in range(rows)
+    ]
+
+
+def benchmark_records(rows: int = 1_000_000) -> pd.DataFrame:
+    """
+    Compares the memory held by citation records, and their size when
+    pickled, with and without slots, interning and compact pickling.
+
+    :param int rows: The number of records.
+    :rtype pd.DataFrame:
+    :returns: One row per representation.
+    """
+    representations: dict[str, Callable[..., object]] = {
+        "dict": DictWebScrapeResult,
+        "slotted": WebScrapeResult,
+    }
+    results = []
+    for representation, record in representations.items():
+        tracemalloc.start()
+        records = citation_records(record, rows)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = perf_counter()
+        pickled = pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+        pickle.loads(pickled)
+        results.append({
+            "representation": representation,
+            "rows": rows,
+            "held_mib": held / (1 << 20),
+            "pickled_mib": len(pickled) / (1 << 20),
+            "round_trip_seconds": perf_counter() - start,
+        })
+        del records, pickled
+    return pd.DataFrame(results).set_index("representation")
+
+
+def benchmark_exports(rows: int = 200_000) -> pd.DataFrame:
+    """
+    Compares writing a casted frame of citations to each export format,
+    reading it back, and whether its dtypes survive the round trip.
+
+    :param int rows: The number of papers in the frame.
+    :rtype pd.DataFrame:
+    :returns: One row per format.
+    """
+    dataframe = citations_frame(rows)
+    dataframe["pub_date"] = pd.to_datetime(
+        pd.Series(range(rows)) % 30 + 1990, format="%Y"
+    )
+    dataframe = SciScraper.dataframe_casting(dataframe)
+    results = []
+    with TemporaryDirectory() as directory:
+        for export_format in EXPORT_FORMATS:
+            start = perf_counter()
+            export_path = export_dataframe(
+                dataframe, directory, "export", export_format
+            )
+            written = perf_counter() - start
+            start = perf_counter()
+            round_tripped = read_export(export_path)
+            results.append({
+                "format": export_format,
+                "rows": rows,
+                "write_seconds": written,
+                "read_seconds": perf_counter() - start,
+                "file_mib": export_path.stat().st_size / (1 << 20),
+                "dtypes_kept": round_tripped.dtypes.equals(dataframe.dtypes),
+            })
+    return pd.DataFrame(results).set_index("format")
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = ArgumentParser(
+        prog="python -m src.benchmarks",
+        description="Run one of sciscraper's comparative benchmarks.",
+    )
+    benchmarks = parser.add_subparsers(dest="benchmark", required=True)
+    extractors = benchmarks.add_parser(
+        "extractors", help="Compare the .pdf text extraction backends."
+    )
+    extractors.add_argument("corpus", help="A directory of .pdfs.")
+    extractors.add_argument(
+        "--reference", default="pdfplumber", choices=list(EXTRACTORS)
+    )
+    scheduling = benchmarks.add_parser(
+        "scheduling",
+        help="Compare FIFO and largest-first scheduling of .pdfs.",
+    )
+    scheduling.add_argument(
+        "corpus",
+        nargs="?",
+        help="A directory of .pdfs. Defaults to a synthetic mixed-size set.",
+    )
+    scheduling.add_argument("--workers", type=int, default=4)
+    csv = benchmarks.add_parser(
+        "csv",
+        help="Compare loading a .csv export with streaming it in chunks.",
+    )
+    csv.add_argument("--rows", type=int, default=200_000)
+    nested = benchmarks.add_parser(
+        "nested",
+        help="Compare decoders for dict-encoded .csv cells.",
+    )
+    nested.add_argument("--rows", type=int, default=1_000_000)
+    nested.add_argument("--distinct", type=int, default=1_000)
+    staging = benchmarks.add_parser(
+        "staging",
+        help="Compare the memory used by copying and lazy staging.",
+    )
+    staging.add_argument("--rows", type=int, default=200_000)
+    columnar = benchmarks.add_parser(
+        "columnar",
+        help="Compare building results from dataclasses and in columns.",
+    )
+    columnar.add_argument("--rows", type=int, default=1_000_000)
+    records = benchmarks.add_parser(
+        "records",
+        help="Compare the memory and pickled size of result records.",
+    )
+    records.add_argument("--rows", type=int, default=1_000_000)
+    exports = benchmarks.add_parser(
+        "exports",
+        help="Compare writing and reading each export format.",
+    )
+    exports.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "extractors":
+        results = benchmark_extractors(args.corpus, reference=args.reference)
+    elif args.benchmark == "scheduling":
+        costs = (
+            [page_count(pdf) for pdf in Path(args.corpus).rglob("*.pdf")]
+            if args.corpus
+            else None
+        )
+        results = benchmark_scheduling(costs, args.workers)
+    elif args.benchmark == "csv":
+        results = benchmark_csv_ingestion(args.rows)
+    elif args.benchmark == "nested":
+        results = benchmark_nested_decoding(args.rows, args.distinct)
+    elif args.benchmark == "staging":
+        results = benchmark_staging(args.rows)
+    elif args.benchmark == "columnar":
+        results = benchmark_columnar(args.rows)
+    elif args.benchmark == "records":
+        results = benchmark_records(args.rows)
+    elif args.benchmark == "exports":
+        results = benchmark_exports(args.rows)
+    logger.info("\n\n%s", results.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""columnar.py builds the dataframes of scraped results column by column.
+
+Building a dataframe from a list of dataclasses makes pandas convert
+every result into a dictionary, and keeps every result alive until
+the frame is built, after which `SciScraper.dataframe_casting` casts
+each column a second time. `ColumnarBuilder` instead appends each field
+of a result to a typed column as soon as the result arrives, so that
+the result itself can be freed, and casts each column to its dtype
+in `KEY_TYPE_PAIRINGS` as the frame is built.
+
+Numeric columns are held in preallocated numpy buffers, which double in
+size as they fill. Columns of any other values are held in lists.
+Given a `ResultSink`, the builder writes its columns to disk,
+and starts them afresh, whenever they hold `sink.buffer_rows` rows,
+so that a long run holds one batch of results in memory at a time.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from src.config import KEY_TYPE_PAIRINGS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from src.sinks import ResultSink
+
+INITIAL_CAPACITY = 1_024
+NUMERIC_DTYPES: dict[type, type[np.generic]] = {
+    bool: np.bool_,
+    int: np.int64,
+    float: np.float64,
+}
+
+
+def fits(values: np.ndarray, dtype: Any) -> bool:
+    """Returns whether numeric `values` can be cast to an integer `dtype`
+    without overflowing it, or losing their fractional parts."""
+    try:
+        dtype = np.dtype(dtype)
+    except TypeError:
+        return True  # Pandas' extension dtypes, such as "boolean".
+    if dtype.kind not in "iu" or values.dtype.kind not in "iuf":
+        return True
+    if not len(values):
+        return True
+    if values.dtype.kind == "f" and not np.array_equal(
+        values, np.trunc(values)
+    ):
+        return False
+    limits = np.iinfo(dtype)
+    return bool(limits.min <= values.min() and values.max() <= limits.max)
+
+
+@dataclass
+class TypedColumn:
+    """
+    A single column of results. Values are kept in a numpy buffer while
+    they all share a numeric type, and in a list once any do not.
+    Missing values are recorded in `missing`.
+    """
+
+    kind: type | None = None
+    buffer: np.ndarray | list[Any] | None = None
+    missing: bytearray = field(default_factory=bytearray)
+
+    def __len__(self) -> int:
+        return len(self.missing)
+
+    def append(self, value: Any) -> None:
+        size = len(self.missing)
+        if value is None:
+            self.missing.append(True)
+            if isinstance(self.buffer, list):
+                self.buffer.append(None)
+            elif self.buffer is not None:
+                self._reserve(size + 1)
+            return
+        self.missing.append(False)
+        if self.buffer is None:
+            self._start(type(value), size)
+        elif self.kind is not type(value) and self.kind is not None:
+            self._widen(type(value))
+        if isinstance(self.buffer, list):
+            self.buffer.append(value)
+        else:
+            self._reserve(size + 1)
+            self.buffer[size] = value  # type: ignore[index]
+
+    def to_series(self, rows: np.ndarray | None = None) -> pd.Series:
+        """Returns the column as a series, with missing values as NaN
+        in numeric columns, and None otherwise, taking only `rows`
+        if they are given."""
+        missing = np.frombuffer(self.missing, dtype=np.bool_)
+        if self.buffer is None:
+            values: Any = np.full(len(missing), None, dtype=object)
+        elif isinstance(self.buffer, list):
+            values = pd.Series(self.buffer, dtype=object).to_numpy()
+        else:
+            values = self.buffer[: len(missing)]
+            if missing.any():
+                values = (
+                    values.astype(np.float64)
+                    if self.kind is not bool
+                    else values.astype(object)
+                )
+                values[missing] = np.nan if self.kind is not bool else None
+        if rows is not None:
+            values = values[rows]
+        return pd.Series(values, copy=False)
+
+    def _start(self, kind: type, size: int) -> None:
+        if kind in NUMERIC_DTYPES:
+            self.kind = kind
+            self.buffer = np.zeros(
+                max(INITIAL_CAPACITY, 2 * size), dtype=NUMERIC_DTYPES[kind]
+            )
+        else:
+            self.buffer = [None] * size
+
+    def _widen(self, kind: type) -> None:
+        # Integers fit in a column of floats, and floats widen a column
+        # of integers. Any other mix of types is kept as objects.
+        if {self.kind, kind} == {int, float}:
+            if self.kind is int:
+                self.buffer = self.buffer.astype(np.float64)  # type: ignore[union-attr]
+                self.kind = float
+            return
+        size = len(self.missing) - 1
+        values: list[Any] = self.buffer[:size].tolist()  # type: ignore[index]
+        for row in np.flatnonzero(np.frombuffer(self.missing, np.bool_)):
+            values[row] = None
+        self.kind, self.buffer = None, values
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self.buffer)  # type: ignore[arg-type]
+        if size > capacity:
+            self.buffer = np.resize(self.buffer, max(size, 2 * capacity))  # type: ignore[arg-type]
+
+
+@dataclass
+class ColumnarBuilder:
+    """
+    ColumnarBuilder collects scraped results into typed columns,
+    as they arrive, and builds them into a dataframe in one step.
+    Results may be dataclasses, or dictionaries of fields. Columns are
+    ordered by their first appearance, and a result without a column
+    that others have leaves it missing.
+
+    Attributes
+    ---------
+    dtypes : Mapping[str, Any]
+        The dtype each named column is cast to, where its values fit.
+        Defaults to `KEY_TYPE_PAIRINGS`.
+    sink : ResultSink | None
+        Where batches of rows are written as they are collected, if
+        anywhere. Rows written to the sink are read back by `build`.
+    """
+
+    dtypes: Mapping[str, Any] = field(
+        default_factory=lambda: KEY_TYPE_PAIRINGS
+    )
+    sink: ResultSink | None = None
+    _columns: dict[Any, TypedColumn] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _length: int = field(default=0, init=False, repr=False)
+    _buffered: int = field(default=0, init=False, repr=False)
+    _fields: dict[type, tuple[str, ...]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(
+        self, result: Any, extra: tuple[tuple[str, Any], ...] = ()
+    ) -> None:
+        """Appends each field of `result`, and any `extra` named values,
+        which take the place of fields of the same name, as a new row."""
+        pairs = self.items(result)
+        if extra:
+            pairs = {**dict(pairs), **dict(extra)}.items()
+        for name, value in pairs:
+            column = self._columns.get(name)
+            if column is None:
+                column = self._columns[name] = TypedColumn()
+                for _ in range(self._buffered):
+                    column.append(None)
+            column.append(value)
+        self._length += 1
+        self._buffered += 1
+        for column in self._columns.values():
+            if len(column) < self._buffered:
+                column.append(None)
+        if self.sink is not None and self._buffered >= self.sink.buffer_rows:
+            self.spill()
+
+    def spill(self) -> None:
+        """Writes the rows held in memory to the sink,
+        and empties each column."""
+        if self.sink is None or not self._buffered:
+            return
+        self.sink.write(self.frame())
+        self._columns = {name: TypedColumn() for name in self._columns}
+        self._buffered = 0
+
+    def extend(
+        self, results: Iterable[Any], extra: Iterable[tuple[str, Any]] = ()
+    ) -> None:
+        extra = tuple(extra)
+        for result in results:
+            self.append(result, extra)
+
+    def items(self, result: Any) -> Iterable[tuple[Any, Any]]:
+        """Returns the name and value of each field of `result`."""
+        if isinstance(result, dict):
+            return result.items()
+        if is_dataclass(result) and not isinstance(result, type):
+            names = self._fields.get(type(result))
+            if names is None:
+                names = self._fields[type(result)] = tuple(
+                    item.name for item in fields(result)
+                )
+            return ((name, getattr(result, name)) for name in names)
+        return ((0, result),)
+
+    def build(
+        self,
+        index: Iterable[Any] | None = None,
+        rows: np.ndarray | None = None,
+    ) -> pd.DataFrame:
+        """
+        Builds the dataframe, casting each column to its dtype.
+
+        :param Iterable | None index: The index of the dataframe.
+            Defaults to a range.
+        :param np.ndarray | None rows: The rows to be taken, in order,
+            which may repeat. Defaults to every row.
+        :rtype pd.DataFrame:
+        """
+        if self.sink is None or not self.sink.rows:
+            dataframe = self.frame(rows)
+        else:
+            # Batches are read back from disk only now.
+            frames = [self.sink.read()]
+            if self._buffered:
+                frames.append(self.frame())
+            dataframe = pd.concat(frames, ignore_index=True)
+            if rows is not None:
+                dataframe = dataframe.take(rows).reset_index(drop=True)
+        if index is not None:
+            dataframe.index = pd.Index(index)
+        return dataframe
+
+    def frame(self, rows: np.ndarray | None = None) -> pd.DataFrame:
+        """Returns the rows held in memory as a dataframe."""
+        columns = {
+            name: self.cast(name, column.to_series(rows))
+            for name, column in self._columns.items()
+        }
+        length = self._buffered if rows is None else len(rows)
+        return pd.DataFrame(columns, index=pd.RangeIndex(length))
+
+    def cast(self, name: Any, series: pd.Series) -> pd.Series:
+        """Casts a column to its dtype, if one is given, and its values
+        can be cast without overflowing or being coerced."""
+        dtype = self.dtypes.get(name)
+        if dtype is None:
+            return series
+        if series.dtype.kind in "iuf" and not fits(series.to_numpy(), dtype):
+            return series
+        try:
+            return series.astype(dtype)
+        except (TypeError, ValueError):
+            return series
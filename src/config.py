@@ -12,11 +12,12 @@ import json
 from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 import numpy as np
 
 FilePath = str | Path
+PdfSource = FilePath | bytes | bytearray | memoryview | IO[bytes]
 UTF = "utf-8"
 
 
@@ -62,6 +63,44 @@ class ScrapeConfig:
         bycatch, i.e. words that suggest the Doc is not a match.
     sleep_interval : float
         The default time between web requests.
+    pdf_workers : int
+        The number of worker processes that extract text from .pdfs.
+    pdf_timeout : float
+        The wall-clock limit, in seconds, for scoring any single .pdf.
+    pdf_max_rss_mb : float
+        The memory limit, in MiB, for any single .pdf worker.
+    page_parallel_threshold : int
+        Documents with more pages than this have their pages
+        extracted in parallel.
+    page_workers : int
+        The number of processes that share the pages of a long document.
+    download_prefetch : int
+        The number of papers downloaded concurrently
+        while earlier downloads are scored.
+    crawl_depth : int
+        The number of hops the `crawl` mode takes from the original papers.
+    crawl_batch_size : int
+        The number of papers requested in each query while crawling.
+    crawl_max_nodes : int
+        The greatest number of papers in a crawled citation graph.
+    crawl_max_requests : int
+        The greatest number of queries made in a single crawl.
+    sink_buffer_rows : int
+        The number of results held in memory before they are
+        journaled to disk, while results are fetched.
+    sink_stale_after : float
+        The number of seconds since its last write after which
+        a `.part` directory is taken to be left by a run that failed.
+    journal_sync_every : int
+        The number of completed terms checkpointed between each fsync.
+    journal_sync_interval : float
+        The greatest number of seconds between each fsync of a checkpoint.
+    seen_capacity : int
+        The number of terms each set of previously fetched terms
+        is sized for, when it is created.
+    seen_error_rate : float
+        The rate at which those sets' Bloom filters report a new term
+        as present, which their tables then rule out.
 
     """
 
@@ -80,6 +119,22 @@ class ScrapeConfig:
     bycatch_words: str
     sleep_interval: float
     profiling_path: str
+    pdf_workers: int
+    pdf_timeout: float
+    pdf_max_rss_mb: float
+    page_parallel_threshold: int
+    page_workers: int
+    download_prefetch: int
+    crawl_depth: int
+    crawl_batch_size: int
+    crawl_max_nodes: int
+    crawl_max_requests: int
+    sink_buffer_rows: int
+    sink_stale_after: float
+    journal_sync_every: int
+    journal_sync_interval: float
+    seen_capacity: int
+    seen_error_rate: float
     today: str = date.today().strftime("%y%m%d")
 
 
@@ -121,15 +176,18 @@ KEY_TYPE_PAIRINGS: dict[str, Any] = {
     "title": "string",
     "doi": "string",
     "internal_id": "string",
-    "times_cited": np.int16,
-    "matching_terms": np.int16,
-    "bycatch_terms": np.int16,
-    "total_word_count": np.int16,
-    "wordscore": np.float16,
+    "times_cited": np.int64,
+    "matching_terms": np.int64,
+    "bycatch_terms": np.int64,
+    "total_word_count": np.int64,
+    "wordscore": np.float64,
     "abstract": "string",
     "biblio": "string",
     "journal_title": "string",
     "downloader": "string",
     "filepath": "string",
     "paper_parentheticals": "string",
+    "document_id": "string",
+    "failure": "string",
+    "doi_confirmed": "boolean",
 }
@@ -0,0 +1,379 @@
+"""crawl.py expands the citation graph of a set of papers
+beyond the single hop taken by the `citations` mode.
+
+The graph is crawled breadth first, one level of distance from the
+original papers at a time. Each level's frontier is split into batches,
+and every batch is requested from dimensions.ai in a single query.
+Papers are identified by their dimensions.ai id, and every id that has
+been seen is kept in a visited set, so no paper is requested twice.
+
+Edges are held as two compact integer arrays while crawling, and are
+saved in compressed sparse row (CSR) form, alongside the visited set,
+to a `.npz` file after every level. Each input has a graph file of its
+own, named by a digest of the papers it was seeded with, so a crawl
+that is interrupted, or that runs out of its request budget, resumes
+from the graph of the same papers, and never from another input's.
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from src.config import FilePath, config
+from src.fetch import Fetcher
+from src.log import logger
+from src.memo import frame_key
+from src.webscrapers import DimensionsScraper
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+GRAPH_NAME = "citation_graph.npz"
+
+
+def to_csr(
+    sources: Sequence[int], targets: Sequence[int], node_count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converts a list of edges into compressed sparse row form.
+
+    :param Sequence sources: The node each edge starts from.
+    :param Sequence targets: The node each edge points to.
+    :param int node_count: The number of nodes in the graph.
+    :rtype tuple:
+    :returns: `indptr` and `indices`, where the edges leaving node `n`
+        point to `indices[indptr[n]:indptr[n + 1]]`.
+    """
+    starts = np.asarray(sources, dtype=np.int32)
+    ends = np.asarray(targets, dtype=np.int32)
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(starts, minlength=node_count), out=indptr[1:])
+    indices = ends[np.argsort(starts, kind="stable")]
+    return indptr, indices
+
+
+@dataclass
+class CitationGraph:
+    """
+    CitationGraph is the visited set, and the edges between them,
+    of a crawl in progress. Each paper is numbered in the order it was
+    first seen, and `depth` records its distance from the original papers.
+
+    Attributes
+    ---------
+    ids : list[str]
+        The dimensions.ai id of each paper.
+    depth : array
+        The distance of each paper from the original papers.
+    expanded : bytearray
+        Whether each paper has been requested.
+    dois, titles : list[str]
+        The DOI and title of each paper, once it has been requested.
+    sources, targets : array
+        The paper each edge starts from, and the paper it cites.
+    """
+
+    ids: list[str] = field(default_factory=list)
+    depth: array[int] = field(default_factory=lambda: array("b"))
+    expanded: bytearray = field(default_factory=bytearray)
+    dois: list[str] = field(default_factory=list)
+    titles: list[str] = field(default_factory=list)
+    sources: array[int] = field(default_factory=lambda: array("i"))
+    targets: array[int] = field(default_factory=lambda: array("i"))
+    _index: dict[str, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._index = {paper: number for number, paper in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, paper: object) -> bool:
+        return paper in self._index
+
+    def add(self, paper: str, depth: int) -> int:
+        """Adds a paper to the visited set, if it has not been seen,
+        and returns its number."""
+        number = self._index.get(paper)
+        if number is not None:
+            return number
+        number = self._index[paper] = len(self.ids)
+        self.ids.append(paper)
+        self.depth.append(depth)
+        self.expanded.append(False)
+        self.dois.append("")
+        self.titles.append("")
+        return number
+
+    def record(self, number: int, result: dict[str, Any]) -> None:
+        """Marks a paper as requested, keeping its DOI and title."""
+        self.expanded[number] = True
+        doi, title = result.get("doi"), result.get("title")
+        self.dois[number] = doi if isinstance(doi, str) else ""
+        self.titles[number] = title if isinstance(title, str) else ""
+
+    def link(self, source: int, target: int) -> None:
+        self.sources.append(source)
+        self.targets.append(target)
+
+    def frontier(self, depth: int) -> list[int]:
+        """Returns the papers at `depth` that have not been requested."""
+        return [
+            number
+            for number, (distance, expanded) in enumerate(
+                zip(self.depth, self.expanded)
+            )
+            if distance == depth and not expanded
+        ]
+
+    def save(self, graph_file: FilePath) -> None:
+        """Writes the graph, in CSR form, to `graph_file`, replacing it
+        only once the new file has been written in full."""
+        indptr, indices = to_csr(self.sources, self.targets, len(self))
+        location = Path(graph_file)
+        location.parent.mkdir(parents=True, exist_ok=True)
+        temporary = location.with_name(f"{location.name}.tmp")
+        with open(temporary, "wb") as file:
+            np.savez_compressed(
+                file,
+                ids=np.asarray(self.ids, dtype=str),
+                depth=np.frombuffer(self.depth, dtype=np.int8),
+                expanded=np.frombuffer(self.expanded, dtype=np.bool_),
+                dois=np.asarray(self.dois, dtype=str),
+                titles=np.asarray(self.titles, dtype=str),
+                indptr=indptr,
+                indices=indices,
+            )
+        os.replace(temporary, location)
+
+    @classmethod
+    def load(cls, graph_file: FilePath) -> CitationGraph:
+        """Reads a graph saved by `save`, or returns an empty graph
+        if there is none."""
+        if not Path(graph_file).exists():
+            return cls()
+        with np.load(graph_file) as saved:
+            indptr = saved["indptr"]
+            return cls(
+                ids=saved["ids"].tolist(),
+                depth=array("b", saved["depth"].tobytes()),
+                expanded=bytearray(saved["expanded"].tobytes()),
+                dois=saved["dois"].tolist(),
+                titles=saved["titles"].tolist(),
+                sources=array(
+                    "i",
+                    np.repeat(
+                        np.arange(len(indptr) - 1, dtype=np.int32),
+                        np.diff(indptr),
+                    ).tobytes(),
+                ),
+                targets=array(
+                    "i", saved["indices"].astype(np.int32).tobytes()
+                ),
+            )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns one row per paper, with the number of papers
+        it references, and is cited by, within the graph."""
+        node_count = len(self)
+        return pd.DataFrame({
+            "internal_id": pd.Series(self.ids, dtype="string"),
+            "doi": pd.Series(self.dois, dtype="string"),
+            "title": pd.Series(self.titles, dtype="string"),
+            "depth": np.frombuffer(self.depth, dtype=np.int8),
+            "expanded": np.frombuffer(self.expanded, dtype=np.bool_),
+            "references": np.bincount(
+                np.frombuffer(self.sources, dtype=np.int32),
+                minlength=node_count,
+            ),
+            "cited_by": np.bincount(
+                np.frombuffer(self.targets, dtype=np.int32),
+                minlength=node_count,
+            ),
+        })
+
+
+@dataclass
+class CitationCrawler(Fetcher):
+    """
+    CitationCrawler takes the dataframe of papers scraped from a .csv,
+    and crawls the papers they cite, and the papers those cite,
+    up to `depth` hops away. Papers `depth` hops away are added to the
+    graph, as cited papers, but are not themselves requested.
+
+    Attributes
+    ---------
+    scraper : DimensionsScraper
+        The scraper that requests each batch of papers.
+    graph_dir : FilePath | None
+        The directory in which the graph of each input is saved after
+        every level, and resumed from. None keeps the graph in memory only.
+    depth : int
+        The greatest number of hops from the original papers.
+    batch_size : int
+        The number of papers requested in each query.
+    max_nodes : int
+        The greatest number of papers in the graph. Once reached,
+        citations of papers outside the graph are dropped.
+    max_requests : int
+        The greatest number of queries made in a single run.
+    """
+
+    scraper: DimensionsScraper
+    graph_dir: FilePath | None = None
+    depth: int = config.crawl_depth
+    batch_size: int = config.crawl_batch_size
+    max_nodes: int = config.crawl_max_nodes
+    max_requests: int = config.crawl_max_requests
+
+    def __call__(self, prior_dataframe: pd.DataFrame) -> pd.DataFrame:
+        graph_file = self.graph_file(prior_dataframe)
+        graph = (
+            CitationGraph()
+            if graph_file is None
+            else CitationGraph.load(graph_file)
+        )
+        logger.info(
+            "graph_file=%s, papers=%d, citations=%d",
+            graph_file,
+            len(graph),
+            len(graph.sources),
+        )
+        self.seed(graph, prior_dataframe)
+        self.crawl(graph, graph_file)
+        return graph.to_dataframe()
+
+    def graph_file(self, prior_dataframe: pd.DataFrame) -> Path | None:
+        """Returns where the graph seeded with `prior_dataframe`
+        is saved, or None if it is kept in memory only."""
+        if self.graph_dir is None:
+            return None
+        seeds = (
+            prior_dataframe[["internal_id"]]
+            if "internal_id" in prior_dataframe
+            else prior_dataframe
+        )
+        name = f"{Path(GRAPH_NAME).stem}_{frame_key(seeds)}.npz"
+        return Path(self.graph_dir, name)
+
+    def seed(
+        self, graph: CitationGraph, prior_dataframe: pd.DataFrame
+    ) -> None:
+        """Adds the papers already scraped, and the papers they cite,
+        to the graph, without requesting them again."""
+        if "internal_id" not in prior_dataframe:
+            return
+        missing = pd.Series(None, index=prior_dataframe.index, dtype=object)
+        for paper, doi, title, cited in zip(
+            prior_dataframe["internal_id"],
+            prior_dataframe.get("doi", missing),
+            prior_dataframe.get("title", missing),
+            prior_dataframe.get("citations", missing),
+        ):
+            if not isinstance(paper, str) or paper in graph:
+                continue
+            result = {"doi": doi, "title": title, "citations": cited}
+            self.expand(graph, graph.add(paper, 0), result)
+
+    def crawl(
+        self, graph: CitationGraph, graph_file: FilePath | None = None
+    ) -> None:
+        """Requests each level of the graph in turn, in batches,
+        until `depth` is reached or the request budget is spent,
+        saving it to `graph_file`, if given, after every level."""
+        requests = 0
+        for depth in range(self.depth):
+            frontier = graph.frontier(depth)
+            batches = [
+                frontier[start : start + self.batch_size]
+                for start in range(0, len(frontier), self.batch_size)
+            ]
+            if requests + len(batches) > self.max_requests:
+                logger.warning(
+                    "depth=%d, batches=%d, action_undertaken=%s",
+                    depth,
+                    len(batches),
+                    "Request budget reached, stopping crawl",
+                )
+                batches = batches[: self.max_requests - requests]
+            requests += len(batches)
+            outcomes = self.request(graph, batches)
+            for batch, results in zip(batches, outcomes):
+                self.record_batch(graph, batch, results)
+            logger.info(
+                "depth=%d, frontier=%d, requests=%d, papers=%d, citations=%d",
+                depth,
+                len(frontier),
+                requests,
+                len(graph),
+                len(graph.sources),
+            )
+            if len(graph) >= self.max_nodes:
+                logger.warning(
+                    "papers=%d, action_undertaken=%s",
+                    len(graph),
+                    "Paper limit reached, citations of new papers dropped",
+                )
+            if graph_file is not None:
+                graph.save(graph_file)
+            if requests >= self.max_requests:
+                break
+
+    def request(
+        self, graph: CitationGraph, batches: list[list[int]]
+    ) -> Iterable[Any]:
+        """Requests each batch of papers by their ids,
+        in the `pool` if one is provided."""
+        queries = (
+            [graph.ids[number] for number in batch] for batch in batches
+        )
+        return (
+            map(self.scraper.obtain_batch, queries)
+            if self.pool is None
+            else self.pool.map(self.scraper.obtain_batch, queries)
+        )
+
+    def record_batch(
+        self, graph: CitationGraph, batch: list[int], results: Any
+    ) -> None:
+        """Records the papers of a batch that were found. Papers missing
+        from a successful response are marked as requested, so they are
+        not retried. A batch whose request failed is left unrequested,
+        so that the next run retries it."""
+        if not isinstance(results, list):
+            logger.error(
+                "batch=%d, reason=%s, action_undertaken=%s",
+                len(batch),
+                getattr(results, "reason", "request failed"),
+                "Leaving batch to be retried",
+            )
+            return
+        found = {result["internal_id"]: result for result in results}
+        for number in batch:
+            result = found.get(graph.ids[number])
+            if result is None:
+                graph.expanded[number] = True
+            else:
+                self.expand(graph, number, result)
+
+    def expand(
+        self, graph: CitationGraph, number: int, result: dict[str, Any]
+    ) -> None:
+        """Records a requested paper, and links it to every paper it cites,
+        adding those to the graph while there is room."""
+        graph.record(number, result)
+        cited = result.get("citations")
+        if not isinstance(cited, list):
+            return
+        depth = graph.depth[number] + 1
+        for paper in cited:
+            if paper not in graph and len(graph) >= self.max_nodes:
+                continue
+            graph.link(number, graph.add(paper, depth))
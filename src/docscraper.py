@@ -3,20 +3,22 @@ from __future__ import annotations
 import re
 from collections import Counter
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
-import pdfplumber
-
-from src.config import UTF, FilePath
+from src.config import UTF, FilePath, PdfSource
 from src.doifrompdf import doi_from_pdf
+from src.extractors import PdfplumberExtractor, TextExtractor
 from src.log import logger
+from src.records import CompactRecord
+from src.serials import ArchiveMember
 
 
 PAPER_STATISTIC = re.compile(r"\(.*\=.*\)")
 
 
-@dataclass(frozen=True)
-class FreqDistAndCount:
+@dataclass(frozen=True, slots=True)
+class FreqDistAndCount(CompactRecord):
     """FreqDistAndCount
 
     A dataclass with a the 3 most common words
@@ -34,12 +36,13 @@ class FreqDistAndCount:
     frequency_dist: list[tuple[str, int]] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
-class DocumentResult:
+@dataclass(frozen=True, slots=True)
+class DocumentResult(CompactRecord):
     """DocumentResult contains the WordscoreCalculator\
     scoring relevance, and two lists, each with\
     the three most frequent target and bycatch words respectively.\
     This gets passed back to a pandas dataframe.\
+    If the document could not be scored, `failure` gives the reason.\
     """
 
     doi_from_pdf: str | None
@@ -50,6 +53,8 @@ class DocumentResult:
     target_terms_top_3: list[tuple[str, int]] = field(default_factory=list)
     bycatch_terms_top_3: list[tuple[str, int]] = field(default_factory=list)
     paper_parentheticals: list[Any] = field(default_factory=list)
+    document_id: str | None = None
+    failure: str | None = None
 
 
 def match_terms(target: list[str], word_set: set[str]) -> FreqDistAndCount:
@@ -101,11 +106,13 @@ class DocScraper:
     From these, it generates an analysis of its relevance,
     according to provided target and bycatch words, in the form of
     a percentage grade called WordscoreCalculator.
+    The text of each .pdf is read by the provided `extractor` backend.
     """
 
     target_words_file: FilePath
     bycatch_words_file: FilePath
     is_pdf: bool = True
+    extractor: TextExtractor = field(default_factory=PdfplumberExtractor)
 
     def unpack_txt_files(self, txtfile: FilePath) -> set[str]:
         """
@@ -126,7 +133,11 @@ class DocScraper:
             )
             return wordset
 
-    def obtain(self, search_text: str) -> DocumentResult | None:
+    def obtain(
+        self,
+        search_text: PdfSource | ArchiveMember,
+        document_id: str | None = None,
+    ) -> DocumentResult | None:
         """
         Given the provided search string, it extracts the text from
         the pdf or abstract provided, it cleans the text in question,
@@ -136,6 +147,10 @@ class DocScraper:
         Parameters:
             search_text(str) : The initially provided search string from
                 a prior list comprehension, often in the form of either a filepath or the abstract of a paper.
+                A .pdf that is already held in memory may be passed as bytes, a memoryview, an open binary file
+                or an `ArchiveMember`.
+            document_id(str | None) : Identifies the document in the result.
+                Defaults to the filepath of the .pdf.
 
         Returns:
             DocumentResult | None : It either returns a formatted DocumentResult dataclass, which is
@@ -143,6 +158,10 @@ class DocScraper:
         """
 
         logger.debug(repr(self))
+        if document_id is None and self.is_pdf:
+            document_id = describe_source(search_text)
+        if isinstance(search_text, ArchiveMember):
+            search_text = search_text.data
         target_set = self.unpack_txt_files(self.target_words_file)
         bycatch_set = self.unpack_txt_files(self.bycatch_words_file)
         preprint: str = (
@@ -169,10 +188,35 @@ class DocScraper:
             target_terms_top_3=target.frequency_dist,
             bycatch_terms_top_3=bycatch.frequency_dist,
             paper_parentheticals=PAPER_STATISTIC.findall(preprint),
+            document_id=document_id,
         )
         logger.debug(repr(doc))
         return doc
 
+    def failed(
+        self, search_text: PdfSource | ArchiveMember, reason: str
+    ) -> DocumentResult:
+        """
+        Returns an empty `DocumentResult` recording why
+        the provided document could not be scored.
+
+        Parameters:
+            search_text(PdfSource) : The .pdf or abstract that could not be scored.
+            reason(str) : Why the document could not be scored.
+
+        Returns:
+            DocumentResult : A result with no matches, and its `failure` set.
+        """
+        return DocumentResult(
+            doi_from_pdf=None,
+            matching_terms=0,
+            bycatch_terms=0,
+            total_word_count=0,
+            wordscore=0.0,
+            document_id=describe_source(search_text) if self.is_pdf else None,
+            failure=reason,
+        )
+
     def format_manuscript(self, preprint: str) -> list[str]:
         """
         This function takes a preprint string and returns a list of words after cleaning the text.
@@ -185,11 +229,10 @@ class DocScraper:
         """
         return preprint.strip().lower().split(" ")
 
-    def extract_text_from_pdf(self, pdf_path: FilePath) -> str:
+    def extract_text_from_pdf(self, pdf_path: PdfSource) -> str:
         """
         Given the provided filepath, `search_text`, it opens the .pdf
-        file and cleans the text. Returning the words from each page
-        as a Generator object.
+        file with the configured `extractor`, and returns its text.
 
         Parameters:
             search_text(str): The initially provided filepath from a prior list comprehension.
@@ -197,12 +240,17 @@ class DocScraper:
         Returns:
             str: A string of unformatted words from the entire document.
         """
-        with pdfplumber.open(pdf_path) as pdf:
-            text_pages = [
-                page.extract_text(x_tolerance=1, y_tolerance=3)
-                for page in pdf.pages
-            ]
-        return " ".join(text_pages)
+        return self.extractor.extract_text(pdf_path)
+
+
+def describe_source(source: PdfSource | ArchiveMember) -> str | None:
+    """Returns the filepath of a .pdf on disk, or its path within an archive,
+    to identify it in results. Other .pdfs held in memory have no path of their own."""
+    return (
+        str(source)
+        if isinstance(source, str | Path | ArchiveMember)
+        else None
+    )
 
 
 def calculate_likelihood(
@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 import pdfplumber
 from feedparser import FeedParserDict
@@ -12,32 +12,38 @@ from feedparser import (
 )  # type: ignore[import-untyped, unused-ignore]
 from googlesearch import search  # type: ignore[import-untyped, unused-ignore]
 
-from src.config import FilePath
+from src.config import PdfSource
 from src.doi_regex import IDENTIFIER_PATTERNS, extract_identifier
+from src.extractors import open_pdf
 from src.log import logger
+from src.records import CompactRecord
 from src.webscrapers import client
 
 
-@dataclass(frozen=True)
-class DOIFromPDFResult:
+@dataclass(frozen=True, slots=True)
+class DOIFromPDFResult(CompactRecord):
     "A data class containing the extracted identifier, and its type."
 
+    interned: ClassVar[tuple[str, ...]] = ("identifier_type",)
+
     identifier: str | None = None
     identifier_type: str | None = None
     validation_info: str | bool | None = True
 
 
-def doi_from_pdf(file: FilePath, preprint: str) -> DOIFromPDFResult | None:
+def doi_from_pdf(file: PdfSource, preprint: str) -> DOIFromPDFResult | None:
     """
     Extracts a DOI from a PDF file using a set of heuristics.
 
-    :param FilePath file: The path to the PDF file.
+    :param PdfSource file: The path to the PDF file, or its contents in memory.
     :param str preprint: A preprint identifier, such as a manuscript ID, or arXiv ID.
 
     :returns: A data class containing the extracted DOI, if any, and its type.
     """
     metadata: dict[Any, Any] = extract_metadata(file)
-    title: str = metadata.get("Title", Path(file).stem)
+    title: str = metadata.get(
+        "Title", Path(file).stem if isinstance(file, str | Path) else ""
+    )
     handlers: dict[Any, Any] = {
         find_identifier_in_metadata: (metadata,),
         find_identifier_in_pdf_info: (metadata,),
@@ -111,16 +117,16 @@ def find_identifier_in_pdf_info(
     return result
 
 
-def extract_metadata(file: FilePath) -> dict[Any, Any]:
+def extract_metadata(file: PdfSource) -> dict[Any, Any]:
     """
     Extracts metadata from a PDF file using the pdfplumber library.
 
-    :param FilePath file: The path to the PDF file.
+    :param PdfSource file: The path to the PDF file, or its contents in memory.
 
     :rtype: dict[Any, Any]
     :returns: A dictionary containing the metadata key-value pairs.
     """
-    with pdfplumber.open(file) as pdf:
+    with open_pdf(file) as source, pdfplumber.open(source) as pdf:
         metadata: dict[Any, Any] = pdf.metadata
         logger.debug(metadata)
     return metadata
@@ -7,30 +7,31 @@ from __future__ import annotations
 import random
 import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from tempfile import TemporaryFile
 from time import sleep
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from selectolax.parser import HTMLParser
 
-from src.change_dir import change_dir
 from src.config import config, FilePath
 from src.log import logger
+from src.records import CompactRecord
 from src.webscrapers import client
 
 if TYPE_CHECKING:
     from requests import Response
 
+    from src.docscraper import DocScraper, DocumentResult
+
 
 LINK_CLEANING_PATTERN = re.compile(
     r"(?P<location>location\.href=\')(?P<sep>/+)?"
 )
 
 
-@dataclass(frozen=True)
-class DownloadReceipt:
+@dataclass(frozen=True, slots=True)
+class DownloadReceipt(CompactRecord):
     """
     A representation of the receipt describing whether
     or not the download was successful, and,
@@ -47,6 +48,8 @@ class DownloadReceipt:
         Where the file is located if downloaded. Defaults to 'N/A'.
     """
 
+    interned: ClassVar[tuple[str, ...]] = ("downloader",)
+
     downloader: str
     success: bool = False
     filepath: str = "N/A"
@@ -94,27 +97,23 @@ class Downloader(ABC):
         contents: bytes,
     ) -> None:
         """
-        `create_document` goes to, and downloads, the isolated download link.
-        It is sent as bytes to a temporary text file.
-        The temporary text file is then used as a basis to generate a new pdf.
-        Afterwards, the temporary text file is deleted
-        in preparation for the next pdf.
+        `create_document` writes the downloaded contents
+        to a new file in the export directory.
 
         Parameters
         ----------
-        search_text : str
-            The initial term to be rendered in the filename.
-        link : str
-            The link to be followed.
+        filename : FilePath
+            The name of the file, within `export_dir`.
+        contents : bytes
+            The downloaded file.
 
         Returns
         -------
             A .pdf or .png file, depending on the `Downloader` in use.
         """
-        with change_dir(self.export_dir), TemporaryFile() as temp:
-            temp.write(contents)
-            with open(filename, "wb") as file:
-                file.writelines(temp)
+        export_dir = Path(self.export_dir)
+        export_dir.mkdir(parents=True, exist_ok=True)
+        Path(export_dir, filename).write_bytes(contents)
 
 
 @dataclass
@@ -159,27 +158,54 @@ class BulkPDFScraper(Downloader):
             the download was successful, and,
             if so, where the ensuing .pdf may be found.
         """
+        paper_title = self.format_paper_title(search_text)
+        formatted_src: str | None = self.locate_paper(search_text)
+        if not formatted_src:
+            return DownloadReceipt(self.cls_name)
+        receipt, _ = self.download_paper(formatted_src, paper_title)
+        return receipt
+
+    def locate_paper(self, search_text: str) -> str | None:
+        """Submits `search_text` to the downloader website,
+        and returns the link from which its paper may be downloaded, if any."""
         payload = {"request": search_text}
-        paper_title = Path(f"{config.today}_{search_text.replace('/','')}.pdf")
         response_text = self.get_response(payload)
 
         download_link: str | None = self.find_download_link(response_text)
         formatted_src: str | None = self.format_download_link(download_link)
         logger.debug("download_link=%s", formatted_src)
-        return (
-            self.download_paper(paper_title, formatted_src)
-            if formatted_src
-            else DownloadReceipt(self.cls_name)
-        )
+        return formatted_src
+
+    def format_paper_title(self, search_text: str) -> Path:
+        return Path(f"{config.today}_{search_text.replace('/','')}.pdf")
 
     def download_paper(
-        self, paper_title: FilePath, formatted_src: str
-    ) -> DownloadReceipt:
-        paper_contents = client.get(formatted_src, stream=True).content
-        self.create_document(paper_title, paper_contents)
-        return DownloadReceipt(
-            self.cls_name, True, f"{self.export_dir}/{paper_title}"
-        )
+        self, formatted_src: str, paper_title: FilePath | None = None
+    ) -> tuple[DownloadReceipt, bytes | None]:
+        """
+        Downloads the paper found at `formatted_src`, writing it
+        to `paper_title` within the export directory, if given.
+
+        :param str formatted_src: The link from which the paper may be downloaded.
+        :param FilePath | None paper_title: The name of the file to write, if any.
+        :rtype tuple[DownloadReceipt, bytes | None]:
+        :returns: The receipt of the download, and the paper's contents, unless the download failed.
+        """
+        response = client.get(formatted_src, stream=True)
+        if not response.ok:
+            logger.warning(
+                "download_link=%s, status_code=%s, action_undertaken=%s",
+                formatted_src,
+                response.status_code,
+                "Recording failure",
+            )
+            return DownloadReceipt(self.cls_name), None
+        paper_contents = response.content
+        filepath = "N/A"
+        if paper_title is not None:
+            self.create_document(paper_title, paper_contents)
+            filepath = f"{self.export_dir}/{paper_title}"
+        return DownloadReceipt(self.cls_name, True, filepath), paper_contents
 
     def get_response(self, payload: dict[str, str]) -> str | None:
         response = client.post(
@@ -364,3 +390,93 @@ class ImagesDownloader(Downloader):
         filename = Path(f"{config.today}_{etag}_{file_id}.{ext}")
         logger.debug("filename=%s", filename)
         return filename
+
+
+@dataclass
+class ScoringDownloader(BulkPDFScraper):
+    """
+    The ScoringDownloader class downloads papers as `BulkPDFScraper` does,
+    but hands each downloaded .pdf straight to `scorer`, which scores it
+    in memory and extracts its DOI, so that the paper does not have
+    to be read back from disk by a later `directory` run.
+
+    Its results combine the `DownloadReceipt` and the `DocumentResult`
+    of each paper, along with whether the DOI found within the .pdf
+    confirms the DOI that was requested.
+
+    Attributes
+    ----------
+    scorer : DocScraper
+        The scraper that scores each downloaded .pdf.
+    keep_files : bool
+        Whether the downloaded .pdfs are also written to the
+        export directory. Defaults to True.
+    """
+
+    scorer: DocScraper = field(kw_only=True)
+    keep_files: bool = field(default=True, kw_only=True)
+
+    def obtain(self, search_text: str) -> dict[str, Any]:
+        """
+        Downloads the paper with the given DOI and scores it.
+
+        Parameters
+        ----------
+        search_text : str
+            the digital object identifier (DOI) of the paper in question.
+
+        Returns
+        -------
+        dict[str, Any]
+            The fields of the paper's `DownloadReceipt` and
+            `DocumentResult`, and `doi_confirmed`.
+        """
+        formatted_src: str | None = self.locate_paper(search_text)
+        if not formatted_src:
+            return self.failed(search_text, "No download link found.")
+        receipt, paper_contents = self.download_paper(
+            formatted_src,
+            self.format_paper_title(search_text) if self.keep_files else None,
+        )
+        if paper_contents is None:
+            return self.failed(search_text, "The download failed.")
+        try:
+            result = self.scorer.obtain(
+                paper_contents, document_id=search_text
+            )
+        except Exception as e:
+            logger.error(
+                "doi=%s, error=%s, action_undertaken=%s",
+                search_text,
+                e,
+                "Recording failure",
+            )
+            result = self.scorer.failed(
+                search_text, f"{type(e).__name__}: {e}"
+            )
+        return self.combine(search_text, receipt, result)
+
+    def failed(self, search_text: str, reason: str) -> dict[str, Any]:
+        """Returns the combined result of a paper that
+        could not be downloaded, recording why."""
+        return self.combine(
+            search_text,
+            DownloadReceipt(self.cls_name),
+            self.scorer.failed(search_text, reason),
+        )
+
+    @staticmethod
+    def combine(
+        search_text: str,
+        receipt: DownloadReceipt,
+        result: DocumentResult | None,
+    ) -> dict[str, Any]:
+        found_doi = result.doi_from_pdf if result else None
+        return {
+            **asdict(receipt),
+            **(asdict(result) if result else {}),
+            "doi_confirmed": (
+                found_doi is not None
+                and found_doi.strip().lower() == search_text.strip().lower()
+            ),
+        }
@@ -0,0 +1,158 @@
+"""dtypes.py chooses compact dtypes for the columns of exported frames.
+
+Rather than casting each column to a fixed dtype, which can overflow,
+`optimize_dtypes` inspects the values of each column: integers are
+given the smallest signed type that holds their range, floats are
+narrowed to single precision where that keeps each value to within
+one part in a million, strings with few distinct values
+become categoricals, and all other strings are stored as Arrow-backed
+strings where `pyarrow` is installed.
+
+`KEY_TYPE_PAIRINGS` still states what each known column holds,
+so that, for example, citation counts that were read as floats,
+because some are missing, are stored as nullable integers.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    infer_dtype,
+    is_bool_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
+
+from src.config import KEY_TYPE_PAIRINGS
+from src.log import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    STRING_DTYPE = "string"
+else:
+    STRING_DTYPE = "string[pyarrow]"
+
+CATEGORY_RATIO = 0.5
+INTEGER_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+FLOAT_TOLERANCE = 1e-6
+
+
+def smallest_integer(values: pd.Series) -> Any:
+    """Returns the smallest signed integer dtype that holds
+    every value, as a nullable dtype if any are missing."""
+    present = values.dropna()
+    low, high = (present.min(), present.max()) if len(present) else (0, 0)
+    for dtype in INTEGER_DTYPES:
+        limits = np.iinfo(dtype)
+        if limits.min <= low and high <= limits.max:
+            break
+    if values.isna().any() or not isinstance(values.dtype, np.dtype):
+        return pd.api.types.pandas_dtype(np.dtype(dtype).name.capitalize())
+    return dtype
+
+
+def is_integral(values: pd.Series) -> bool:
+    """Returns whether every value present in a float column is whole."""
+    present = values.dropna().to_numpy(dtype=np.float64)
+    return bool(
+        np.isfinite(present).all() and (present == np.trunc(present)).all()
+    )
+
+
+def fits_float32(values: pd.Series) -> bool:
+    """Returns whether every value in a float column keeps
+    its magnitude, to within `FLOAT_TOLERANCE`, as a float32."""
+    present = values.dropna().to_numpy(dtype=np.float64)
+    with np.errstate(over="ignore"):
+        narrowed = present.astype(np.float32).astype(np.float64)
+    return bool(np.allclose(narrowed, present, rtol=FLOAT_TOLERANCE, atol=0.0))
+
+
+def optimal_dtype(
+    values: pd.Series,
+    hint: Any = None,
+    category_ratio: float = CATEGORY_RATIO,
+) -> Any:
+    """
+    Chooses the most compact dtype that holds every value of a column.
+
+    :param pd.Series values: The column.
+    :param Any hint: The dtype the column is known to hold, if any,
+        from `KEY_TYPE_PAIRINGS`.
+    :param float category_ratio: Strings are stored as categoricals
+        when there are at most this many distinct values per value.
+    :rtype Any:
+    :returns: The chosen dtype, or None if the column is best left as is.
+    """
+    dtype = values.dtype
+    if is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+        return None
+    if is_integer_dtype(dtype):
+        return smallest_integer(values)
+    if is_float_dtype(dtype):
+        hinted_integer = hint is not None and is_integer_dtype(hint)
+        if hinted_integer and is_integral(values):
+            return smallest_integer(values)
+        return np.float32 if fits_float32(values) else None
+    if not (is_object_dtype(dtype) or is_string_dtype(dtype)):
+        return None
+    kind = infer_dtype(values, skipna=True)
+    if kind == "boolean" and hint == "boolean":
+        return "boolean"
+    if kind not in {"string", "empty"}:
+        return None
+    present = values.count()
+    if present and values.nunique() <= category_ratio * present:
+        return "category"
+    return STRING_DTYPE
+
+
+def optimize_dtypes(
+    dataframe: pd.DataFrame,
+    hints: Mapping[str, Any] = KEY_TYPE_PAIRINGS,
+    category_ratio: float = CATEGORY_RATIO,
+) -> pd.DataFrame:
+    """
+    Casts each column of `dataframe` to its most compact safe dtype,
+    logging the memory each column used before and after.
+
+    :param pd.DataFrame dataframe: The frame to be optimized.
+    :param Mapping hints: The dtype each known column holds.
+    :param float category_ratio: See `optimal_dtype`.
+    :rtype pd.DataFrame:
+    :returns: The optimized frame.
+    """
+    before_total = after_total = 0
+    for column in dataframe.columns:
+        values = dataframe[column]
+        dtype = optimal_dtype(values, hints.get(column), category_ratio)
+        before = values.memory_usage(index=False, deep=True)
+        if dtype is not None:
+            dataframe[column] = values.astype(dtype)
+        after = dataframe[column].memory_usage(index=False, deep=True)
+        before_total += before
+        after_total += after
+        logger.info(
+            "column=%s, dtype=%s->%s, memory_kib=%.1f->%.1f",
+            column,
+            values.dtype,
+            dataframe[column].dtype,
+            before / 1024,
+            after / 1024,
+        )
+    logger.info(
+        "columns=%d, memory_kib=%.1f->%.1f",
+        len(dataframe.columns),
+        before_total / 1024,
+        after_total / 1024,
+    )
+    return dataframe
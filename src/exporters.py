@@ -0,0 +1,146 @@
+"""exporters.py writes the final dataframe of a sciscrape to disk.
+
+.csv remains the default, but loses every dtype that
+`SciScraper.dataframe_casting` chose, so that anything reading it back
+has to parse each column again. Where `pyarrow` is installed, frames
+may instead be exported as Parquet or as Feather (Arrow IPC) files,
+which keep narrowed integers, nullable values, datetimes, categoricals
+and lists as they are, and are compressed with zstd.
+
+Parquet exports may also be partitioned by the year of `pub_date`,
+into a directory holding one subdirectory per year.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_object_dtype
+
+from src.log import logger
+
+if TYPE_CHECKING:
+    from src.config import FilePath
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+EXPORT_FORMATS = ("csv", "parquet", "feather")
+COMPRESSION = "zstd"
+PARTITION_COLUMN = "pub_year"
+UNKNOWN_YEAR = "unknown"
+
+
+def arrow_compatible(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns `dataframe` with every object column that Arrow cannot
+    represent, such as lists of (word, count) tuples, written out as
+    text, as it would be in a .csv. Lists of strings, and other
+    columns that Arrow can represent, are kept as they are.
+    """
+    converted = {}
+    for column in dataframe.columns:
+        values = dataframe[column]
+        if not is_object_dtype(values.dtype):
+            continue
+        try:
+            pa.array(values, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            converted[column] = values.map(
+                lambda value: value if value is None else str(value)
+            )
+    return dataframe.assign(**converted) if converted else dataframe
+
+
+def with_publication_year(dataframe: pd.DataFrame) -> pd.DataFrame | None:
+    """Adds the year of each paper's `pub_date`, by which exports
+    are partitioned, or returns None if there is no such date."""
+    if "pub_date" not in dataframe or not is_datetime64_any_dtype(
+        dataframe["pub_date"]
+    ):
+        return None
+    # Partition keys are kept as text, which pandas can read back
+    # from a partitioned dataset as a categorical, and papers without
+    # a date are put in a partition of their own.
+    years = dataframe["pub_date"].dt.year.astype("Int16").astype("string")
+    years = years.fillna(UNKNOWN_YEAR)
+    return dataframe.assign(**{PARTITION_COLUMN: years})
+
+
+def export_dataframe(
+    dataframe: pd.DataFrame,
+    export_dir: FilePath,
+    stem: str,
+    export_format: str = "csv",
+    partition_by_year: bool = False,
+) -> Path:
+    """
+    Writes `dataframe` to `export_dir`, in the given format.
+
+    :param pd.DataFrame dataframe: The frame to be exported.
+    :param FilePath export_dir: The directory the export is written into.
+    :param str stem: The name of the export, without its suffix.
+    :param str export_format: One of `EXPORT_FORMATS`. Formats other than
+        "csv" fall back to it if `pyarrow` is not installed.
+    :param bool partition_by_year: Whether Parquet exports are split into
+        one directory per year of `pub_date`.
+    :rtype Path:
+    :returns: Where the export was written.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    if export_format != "csv" and pa is None:
+        logger.error(
+            "export_format=%s, reason=%s, action_undertaken=%s",
+            export_format,
+            "pyarrow is not installed",
+            "Exporting as .csv",
+        )
+        export_format = "csv"
+    Path(export_dir).mkdir(parents=True, exist_ok=True)
+    export_path = Path(export_dir, f"{stem}.{export_format}")
+
+    if export_format == "csv":
+        dataframe.to_csv(export_path, index=False)
+        return export_path
+
+    dataframe = arrow_compatible(dataframe.reset_index(drop=True))
+    if export_format == "feather":
+        dataframe.to_feather(export_path, compression=COMPRESSION)
+        return export_path
+
+    partitioned = (
+        with_publication_year(dataframe) if partition_by_year else None
+    )
+    if partition_by_year and partitioned is None:
+        logger.warning(
+            "reason=%s, action_undertaken=%s",
+            "no publication dates to partition by",
+            "Exporting a single .parquet file",
+        )
+    if partitioned is not None:
+        partitioned.to_parquet(
+            export_path,
+            compression=COMPRESSION,
+            index=False,
+            partition_cols=[PARTITION_COLUMN],
+        )
+    else:
+        dataframe.to_parquet(export_path, compression=COMPRESSION, index=False)
+    return export_path
+
+
+def read_export(export_path: FilePath) -> pd.DataFrame:
+    """Reads an export written by `export_dataframe`, in any format,
+    with strings read back into Arrow-backed columns."""
+    suffix = Path(export_path).suffix
+    if suffix == ".csv":
+        return pd.read_csv(export_path)
+    with pd.option_context("mode.string_storage", "pyarrow"):
+        if suffix == ".feather":
+            return pd.read_feather(export_path)
+        return pd.read_parquet(export_path)
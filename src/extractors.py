@@ -0,0 +1,352 @@
+"""extractors.py contains the interchangeable backends
+that `DocScraper` uses to extract text from .pdfs.
+
+`pdfplumber` remains the default, and performs full character-level
+layout analysis. For bag-of-words scoring that analysis is rarely
+needed, so two faster raw-text backends are also provided:
+pdfminer's low-level interpreter without layout analysis,
+and pypdfium2, which wraps the PDFium C++ library.
+
+Documents longer than `page_threshold` pages have their pages split
+into ranges, which are extracted in parallel worker processes
+and merged back together in order.
+"""
+
+from __future__ import annotations
+
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from io import SEEK_CUR, SEEK_END, SEEK_SET, RawIOBase, StringIO
+from math import ceil
+from mmap import ACCESS_READ, mmap
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, ClassVar
+
+import pdfplumber
+import pypdfium2 as pdfium
+from pdfminer.converter import TextConverter
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+from src.config import PdfSource, config
+from src.log import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+CHUNKS_PER_WORKER = 4
+
+
+class MemoryReader(RawIOBase):
+    """
+    A read-only binary file over a buffer in memory, such as downloaded
+    bytes or a memory-mapped file. Reads are served as slices
+    of the buffer, which is never copied as a whole.
+    """
+
+    def __init__(self, buffer: bytes | bytearray | memoryview | mmap) -> None:
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        end = (
+            len(self._view)
+            if size is None or size < 0
+            else min(self._position + size, len(self._view))
+        )
+        start, self._position = self._position, max(end, self._position)
+        return self._view[start:end].tobytes()
+
+    def readinto(self, buffer: Any) -> int:
+        with memoryview(buffer).cast("B") as target:
+            data = self._view[self._position : self._position + len(target)]
+            target[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        base = {
+            SEEK_SET: 0,
+            SEEK_CUR: self._position,
+            SEEK_END: len(self._view),
+        }
+        self._position = max(0, base[whence] + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        self._view.release()
+        super().close()
+
+
+@contextmanager
+def open_pdf(source: PdfSource) -> Iterator[IO[bytes]]:
+    """
+    Opens a .pdf for reading. Files on disk are memory-mapped,
+    rather than read, and bytes in memory are read in place.
+    A file that is already open is passed through as-is.
+    """
+    if isinstance(source, str | Path):
+        with open(source, "rb") as file:
+            if not os.fstat(file.fileno()).st_size:
+                yield file  # Empty files cannot be mapped.
+                return
+            with mmap(file.fileno(), 0, access=ACCESS_READ) as mapped:
+                with MemoryReader(mapped) as reader:
+                    yield reader  # type: ignore[misc]
+    elif isinstance(source, bytes | bytearray | memoryview):
+        with MemoryReader(source) as reader:
+            yield reader  # type: ignore[misc]
+    else:
+        yield source
+
+
+@contextmanager
+def open_pdfium(source: PdfSource) -> Iterator[pdfium.PdfDocument]:
+    """Opens a .pdf with PDFium, which reads files
+    on disk and `bytes` in place by itself."""
+    if isinstance(source, bytearray | memoryview):
+        with MemoryReader(source) as reader:
+            pdf = pdfium.PdfDocument(reader)
+            try:
+                yield pdf
+            finally:
+                pdf.close()
+        return
+    pdf = pdfium.PdfDocument(source)
+    try:
+        yield pdf
+    finally:
+        pdf.close()
+
+
+def count_pages(source: PdfSource) -> int:
+    """Returns the number of pages in a .pdf, reading only its cross-reference table."""
+    with open_pdfium(source) as pdf:
+        return len(pdf)
+
+
+@dataclass(frozen=True)
+class SharedPdf:
+    """
+    A .pdf held in shared memory, which page-parallel workers
+    attach to by `name`, rather than each receiving a pickled copy.
+    """
+
+    name: str
+    size: int
+
+
+@contextmanager
+def share_pdf(source: PdfSource) -> Iterator[PdfSource | SharedPdf]:
+    """
+    Makes a .pdf available to worker processes. Files on disk are
+    shared by their path, and .pdfs in memory are copied once into
+    shared memory, which is freed when the context exits.
+    """
+    if isinstance(source, str | Path):
+        yield source
+        return
+    if not isinstance(source, bytes | bytearray | memoryview):
+        source.seek(0)
+        source = source.read()
+    with memoryview(source).cast("B") as view:
+        shared = SharedMemory(create=True, size=max(1, len(view)))
+        try:
+            shared.buf[: len(view)] = view
+            yield SharedPdf(shared.name, len(view))
+        finally:
+            shared.close()
+            shared.unlink()
+
+
+def split_pages(page_count: int, chunks: int) -> list[range]:
+    """Splits `page_count` pages into at most `chunks` contiguous, ordered ranges."""
+    size = max(1, ceil(page_count / max(1, chunks)))
+    return [
+        range(start, min(start + size, page_count))
+        for start in range(0, page_count, size)
+    ]
+
+
+@dataclass
+class TextExtractor(ABC):
+    """
+    An abstract representation of a .pdf text extraction backend.
+
+    Attributes
+    ---------
+    page_threshold : int | None
+        Documents with more pages than this are extracted in parallel.
+        None disables page-parallel extraction.
+    page_workers : int
+        The number of processes used for page-parallel extraction.
+    """
+
+    name: ClassVar[str]
+    page_threshold: int | None = field(
+        default=config.page_parallel_threshold, kw_only=True
+    )
+    page_workers: int = field(default=config.page_workers, kw_only=True)
+
+    @abstractmethod
+    def extract_pages(
+        self, source: PdfSource, pages: range | None = None
+    ) -> list[str]:
+        """
+        Extracts the text of each page in the .pdf at `source`.
+
+        Parameters:
+            source(PdfSource): The .pdf to be read, or its contents in memory.
+            pages(range | None): The zero-indexed pages to be read. Defaults to all of them.
+
+        Returns:
+            list[str]: The text of each page, in order.
+        """
+
+    def extract_text(self, source: PdfSource) -> str:
+        """Returns the text of every page in the .pdf, joined by spaces.
+        Long documents are split across `page_workers` processes."""
+        if self.page_threshold is None or self.page_workers < 2:
+            return " ".join(self.extract_pages(source))
+        page_count = count_pages(source)
+        if page_count <= self.page_threshold:
+            return " ".join(self.extract_pages(source))
+        return " ".join(self.extract_pages_in_parallel(source, page_count))
+
+    def extract_pages_in_parallel(
+        self, source: PdfSource, page_count: int
+    ) -> list[str]:
+        """
+        Splits the document's pages into ranges, extracts each range
+        in a separate process, and merges the pages back in order.
+        """
+        ranges = split_pages(page_count, self.page_workers * CHUNKS_PER_WORKER)
+        logger.debug(
+            "source=%s, pages=%d, ranges=%d, workers=%d",
+            source,
+            page_count,
+            len(ranges),
+            self.page_workers,
+        )
+        with (
+            share_pdf(source) as shared,
+            ProcessPoolExecutor(self.page_workers) as pool,
+        ):
+            chunks = pool.map(
+                _extract_range,
+                [self] * len(ranges),
+                [shared] * len(ranges),
+                ranges,
+            )
+            return [text for chunk in chunks for text in chunk]
+
+
+def _extract_range(
+    extractor: TextExtractor, source: PdfSource | SharedPdf, pages: range
+) -> list[str]:
+    if not isinstance(source, SharedPdf):
+        return extractor.extract_pages(source, pages)
+    shared = SharedMemory(source.name)
+    try:
+        with shared.buf[: source.size] as view:
+            return extractor.extract_pages(view, pages)
+    finally:
+        shared.close()
+
+
+@dataclass
+class PdfplumberExtractor(TextExtractor):
+    """
+    Extracts text with pdfplumber, which groups individual characters
+    into words and lines according to the provided tolerances.
+    """
+
+    name: ClassVar[str] = "pdfplumber"
+    x_tolerance: float = 1
+    y_tolerance: float = 3
+
+    def extract_pages(
+        self, source: PdfSource, pages: range | None = None
+    ) -> list[str]:
+        page_numbers = None if pages is None else [n + 1 for n in pages]
+        with (
+            open_pdf(source) as file,
+            pdfplumber.open(file, pages=page_numbers) as pdf,
+        ):
+            return [
+                page.extract_text(
+                    x_tolerance=self.x_tolerance,
+                    y_tolerance=self.y_tolerance,
+                )
+                for page in pdf.pages
+            ]
+
+
+@dataclass
+class PdfminerExtractor(TextExtractor):
+    """
+    Extracts text with pdfminer's low-level page interpreter,
+    with layout analysis switched off. Text is emitted in content
+    stream order, so line breaks are not reconstructed.
+    """
+
+    name: ClassVar[str] = "pdfminer"
+
+    def extract_pages(
+        self, source: PdfSource, pages: range | None = None
+    ) -> list[str]:
+        manager = PDFResourceManager(caching=True)
+        texts: list[str] = []
+        with open_pdf(source) as file:
+            for page in PDFPage.get_pages(
+                file, pagenos=None if pages is None else set(pages)
+            ):
+                output = StringIO()
+                device = TextConverter(manager, output, laparams=None)
+                PDFPageInterpreter(manager, device).process_page(page)
+                device.close()
+                texts.append(output.getvalue())
+        return texts
+
+
+@dataclass
+class PypdfiumExtractor(TextExtractor):
+    """Extracts raw text with PDFium, through pypdfium2."""
+
+    name: ClassVar[str] = "pypdfium2"
+
+    def extract_pages(
+        self, source: PdfSource, pages: range | None = None
+    ) -> list[str]:
+        with open_pdfium(source) as pdf:
+            texts: list[str] = []
+            for number in range(len(pdf)) if pages is None else pages:
+                page = pdf[number]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return texts
+
+
+EXTRACTORS: dict[str, type[TextExtractor]] = {
+    extractor.name: extractor
+    for extractor in (
+        PdfplumberExtractor,
+        PdfminerExtractor,
+        PypdfiumExtractor,
+    )
+}
@@ -11,17 +11,32 @@ from functools import partial
 from pathlib import Path
 
 from src.config import config
+from src.crawl import CitationCrawler
 from src.docscraper import DocScraper
-from src.downloaders import BulkPDFScraper, ImagesDownloader
+from src.downloaders import (
+    BulkPDFScraper,
+    ImagesDownloader,
+    ScoringDownloader,
+)
+from src.extractors import EXTRACTORS
 from src.fetch import SciScraper, ScrapeFetcher, StagingFetcher
+from src.journal import JOURNAL_DIR
 from src.log import logger
+from src.manifest import MANIFEST_NAME
+from src.memo import MEMO_DIR
+from src.scheduling import file_size
+from src.seen import SEEN_DIR, SeenSet
 from src.serials import (
-    serialize_from_csv,
+    serialize_from_archive,
     serialize_from_directory,
     serialize_from_txt,
+    stream_from_csv,
 )
 from src.stagers import stage_from_series, stage_with_reference
+from src.store import STORE_NAME, ResultStore
+from src.watch import DirectoryWatcher
 from src.webscrapers import DimensionsScraper, GoogleScholarScraper
+from src.workers import SupervisedPool, ThreadedPool
 
 SCRAPERS: dict[str, ScrapeFetcher] = {
     "pdf_lookup": ScrapeFetcher(
@@ -30,10 +45,31 @@ SCRAPERS: dict[str, ScrapeFetcher] = {
             Path(config.bycatch_words).resolve(),
         ),
         serialize_from_directory,
+        manifest_file=Path(config.export_dir, MANIFEST_NAME),
+        status="scored",
+        pool=SupervisedPool(
+            config.pdf_workers,
+            config.pdf_timeout,
+            config.pdf_max_rss_mb,
+            cost=file_size,
+        ),
+    ),
+    "archive_lookup": ScrapeFetcher(
+        DocScraper(
+            Path(config.target_words).resolve(),
+            Path(config.bycatch_words).resolve(),
+        ),
+        serialize_from_archive,
+        status="scored",
+        pool=SupervisedPool(
+            config.pdf_workers,
+            config.pdf_timeout,
+            config.pdf_max_rss_mb,
+        ),
     ),
     "csv_lookup": ScrapeFetcher(
         DimensionsScraper(config.dimensions_ai_dataset_url),
-        serialize_from_csv,
+        stream_from_csv,
     ),
     "abstract_lookup": ScrapeFetcher(
         DocScraper(
@@ -42,13 +78,12 @@ SCRAPERS: dict[str, ScrapeFetcher] = {
             is_pdf=False,
         ),
         partial(
-            serialize_from_csv,
+            stream_from_csv,
             column="abstract",
+            carry=("title",),
         ),
-        title_serializer=partial(
-            serialize_from_csv,
-            column="title",
-        ),
+        carried_columns=("title",),
+        status="scored",
     ),
     "google_lookup": ScrapeFetcher(
         GoogleScholarScraper(
@@ -72,6 +107,7 @@ STAGERS: dict[str, StagingFetcher] = {
             False,
         ),
         stage_from_series,
+        status="scored",
     ),
     "citations": StagingFetcher(
         DimensionsScraper(config.dimensions_ai_dataset_url),
@@ -80,6 +116,19 @@ STAGERS: dict[str, StagingFetcher] = {
     "download": StagingFetcher(
         BulkPDFScraper(config.downloader_url),
         partial(stage_from_series, column="doi"),
+        status="downloaded",
+    ),
+    "download_score": StagingFetcher(
+        ScoringDownloader(
+            config.downloader_url,
+            scorer=DocScraper(
+                Path(config.target_words).resolve(),
+                Path(config.bycatch_words).resolve(),
+            ),
+        ),
+        partial(stage_from_series, column="doi"),
+        pool=ThreadedPool(config.download_prefetch),
+        status="downloaded",
     ),
     "images": StagingFetcher(
         ImagesDownloader(url=""),
@@ -88,21 +137,103 @@ STAGERS: dict[str, StagingFetcher] = {
     "pdf_expanded": StagingFetcher(
         DimensionsScraper(config.dimensions_ai_dataset_url),
         partial(stage_from_series, column="doi_from_pdf"),
+        status="enriched",
+        # The manifest decides which .pdfs are exported, so those
+        # already enriched are taken from the store, not left out.
+        keep_known=True,
     ),
 }
 
 
+STORE = ResultStore(Path(config.export_dir, STORE_NAME))
+# The fetchers that skip terms completed in earlier runs, each with a set
+# of its own. .pdfs are scored by path, and may change in place, so the
+# directory and archive scrapers rely on the manifest instead.
+SEEN_FETCHERS = ("abstract_lookup", "abstracts", "download", "download_score")
+
+
+# The first stage of each mode is memoized, so that modes run over
+# the same file share a single scrape.
+for scrape_fetcher in SCRAPERS.values():
+    scrape_fetcher.memo_dir = Path(config.export_dir, MEMO_DIR)
+
+
+# Results are journaled to the export directory as they are fetched,
+# and completed terms are checkpointed, so that a run that fails
+# partway through neither loses them nor has to request them again.
+# Papers already found in the store with a stager's status are skipped,
+# as are the terms of any fetcher that downloads or scores papers,
+# if it has completed them before.
+for name, fetcher in (*SCRAPERS.items(), *STAGERS.items()):
+    fetcher.name = name
+    fetcher.sink_dir = Path(config.export_dir)
+    fetcher.journal_dir = Path(config.export_dir, JOURNAL_DIR)
+    fetcher.store = STORE
+    if name in SEEN_FETCHERS:
+        fetcher.seen = SeenSet(
+            Path(config.export_dir, SEEN_DIR, f"{name}.bloom")
+        )
+
+
+CRAWLER = CitationCrawler(
+    DimensionsScraper(config.dimensions_ai_dataset_url),
+    graph_dir=Path(config.export_dir),
+)
+
+
 SCISCRAPERS: dict[str, SciScraper] = {
     "directory": SciScraper(SCRAPERS["pdf_lookup"], STAGERS["pdf_expanded"]),
+    "archive": SciScraper(SCRAPERS["archive_lookup"], STAGERS["pdf_expanded"]),
     "wordscore": SciScraper(SCRAPERS["csv_lookup"], STAGERS["abstracts"]),
     "citations": SciScraper(SCRAPERS["csv_lookup"], STAGERS["citations"]),
+    "crawl": SciScraper(SCRAPERS["csv_lookup"], CRAWLER),
     "download": SciScraper(SCRAPERS["csv_lookup"], STAGERS["download"]),
+    "download_score": SciScraper(
+        SCRAPERS["csv_lookup"], STAGERS["download_score"]
+    ),
     "images": SciScraper(SCRAPERS["csv_lookup"], STAGERS["images"]),
     "fastscore": SciScraper(SCRAPERS["abstract_lookup"], None),
     "google": SciScraper(SCRAPERS["google_lookup"], None),
 }
 
 
+for sciscraper in SCISCRAPERS.values():
+    sciscraper.store = STORE
+
+
+WATCHER = DirectoryWatcher(
+    DocScraper(
+        Path(config.target_words).resolve(),
+        Path(config.bycatch_words).resolve(),
+    ),
+    config.source_dir,
+    pool=SupervisedPool(
+        config.pdf_workers,
+        config.pdf_timeout,
+        config.pdf_max_rss_mb,
+    ),
+)
+
+
+def select_extractor(name: str) -> None:
+    """
+    Sets the .pdf text extraction backend, `name`,
+    for every `DocScraper` used in this run.
+    """
+    extractor = EXTRACTORS[name]()
+    fetchers = [*SCRAPERS.values(), *STAGERS.values()]
+    scrapers = [fetcher.scraper for fetcher in fetchers] + [WATCHER.scraper]
+    scrapers += [
+        scraper.scorer
+        for scraper in scrapers
+        if isinstance(scraper, ScoringDownloader)
+    ]
+    for scraper in scrapers:
+        if isinstance(scraper, DocScraper):
+            scraper.extractor = extractor
+    logger.debug("extractor=%r", extractor)
+
+
 def read_factory() -> SciScraper:
     """
     Constructs an exporter factory based on the user's preference.
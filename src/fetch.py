@@ -3,36 +3,84 @@ returning various dataframes for each"""
 
 from __future__ import annotations
 
+import shutil
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Iterable
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sized
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-from src.change_dir import change_dir
-from src.config import KEY_TYPE_PAIRINGS, FilePath, config
+from src.columnar import ColumnarBuilder
+from src.config import FilePath, config
 from src.docscraper import DocScraper, DocumentResult
 from src.downloaders import Downloader, DownloadReceipt
+from src.dtypes import optimize_dtypes
+from src.exporters import export_dataframe
+from src.journal import MISSING, RunJournal, completed
 from src.log import logger
+from src.manifest import Manifest
+from src.memo import (
+    configuration,
+    frame_key,
+    load_memo,
+    memo_key,
+    save_memo,
+    strategy_name,
+)
+from src.seen import SeenSet
+from src.serials import term_key
+from src.sinks import ResultSink, stale
+from src.store import ResultStore, paper_keys
+from src.stagers import StagedReference
 from src.webscrapers import WebScraper, WebScrapeResult
+from src.workers import SupervisedPool, ThreadedPool, WorkerFailure
 
-SerializationStrategyFunction = Callable[[Path], list[Any]]
+SerializationStrategyFunction = Callable[[Path], Iterable[Any]]
 StagingStrategyFunction = Callable[[pd.DataFrame], Iterable[Any]]
-ScrapeResult = DocumentResult | WebScrapeResult | DownloadReceipt
+ScrapeResult = (
+    DocumentResult | WebScrapeResult | DownloadReceipt | dict[str, Any]
+)
 Scraper = DocScraper | WebScraper | Downloader
+SKIPPED = object()
 
 
 @dataclass
 class Fetcher(ABC):
     """
     Fetcher is the overarching abstract class for fetching data
-    from a given query.
+    from a given query. If a `pool` is provided, the terms are
+    scraped in its supervised worker processes, or its threads.
+    If a `sink_dir` is provided, results are journaled to a `.part`
+    directory within it as they are fetched, which is removed once
+    the fetch completes, and is left behind if it does not, until
+    a later fetch finds it stale.
+    If a `journal_dir` is provided, each completed term is checkpointed
+    within it, so that a fetch that stopped partway through resumes
+    from the first term it did not complete. Each journal is named
+    after the fetcher's `name` and the `run_key` of its input.
+    `status` names the status, in the `store`, that the fetcher's
+    results give each paper, if any.
+    Terms in the `seen` set, completed in any earlier run, are skipped
+    without being obtained, unless `force` is set.
     """
 
     scraper: Scraper
+    pool: SupervisedPool | ThreadedPool | None = field(
+        default=None, kw_only=True
+    )
+    name: str | None = field(default=None, kw_only=True)
+    sink_dir: FilePath | None = field(default=None, kw_only=True)
+    journal_dir: FilePath | None = field(default=None, kw_only=True)
+    store: ResultStore | None = field(default=None, kw_only=True)
+    status: str | None = field(default=None, kw_only=True)
+    seen: SeenSet | None = field(default=None, kw_only=True)
+    force: bool = field(default=False, kw_only=True)
 
     @abstractmethod
     def __call__(self, *args: Any, **kwargs: Any) -> pd.DataFrame:
@@ -50,38 +98,258 @@ class Fetcher(ABC):
         """
 
     def fetch(
-        self, search_terms: list[str], tqdm_unit: str = "abstracts"
+        self,
+        search_terms: Iterable[Any],
+        tqdm_unit: str = "abstracts",
+        run_key: str | None = None,
     ) -> pd.DataFrame:
         """
         fetch runs a scrape using the given search terms and returns a dataframe.
+        Repeated terms are only scraped once, and their results are
+        copied to every position at which the term appears.
 
         Parameters
         ----------
-        search_terms : list[str]
-            A serialized list of terms to be scraped.
+        search_terms : Iterable[Any]
+            A serialized list, or stream, of terms to be scraped.
+        run_key : str | None
+            The key of the fetch's input, by which its journal is named.
 
         Returns
         -------
         pd.DataFrame
-            A dataframe containing biliographic data.
+            A dataframe containing biliographic data, indexed by
+            the position of the search term that produced each row.
         """
-        data: list[ScrapeResult] = []
-        for term in tqdm(
-            search_terms, desc="[sciscraper]: ", unit=f"{tqdm_unit}"
-        ):
-            results = self.scraper.obtain(term)
-            # Check if results is a single ScrapeResult, and if so, convert it to a list
-            if not isinstance(results, Iterable) or isinstance(
-                results, str
-            ):  # Including `isinstance(results, str)` to exclude strings
-                results = [results]  # type: ignore[assignment]
+        occurrences: list[list[int]] = []
+        unique_terms = self.deduplicate(search_terms, occurrences)
+        builder = ColumnarBuilder(sink=self.open_sink())
+        spans: list[tuple[int, int]] = []
+        for results in self.scrape(unique_terms, tqdm_unit, run_key):
+            start = len(builder)
+            builder.extend(results)
+            spans.append((start, len(builder)))
+
+        total = sum(len(seen) for seen in occurrences)
+        logger.info(
+            "terms=%d, unique_terms=%d, dedupe_ratio=%.2f",
+            total,
+            len(occurrences),
+            total / len(occurrences) if occurrences else 1.0,
+        )
+        if total == len(occurrences):
+            positions = [seen[0] for seen in occurrences]
+            return self.build(
+                builder,
+                index=np.repeat(
+                    np.asarray(positions, dtype=np.int64),
+                    [end - start for start, end in spans],
+                ),
+            )
+        # Duplicates may appear after their term was scraped,
+        # so results are only fanned out once the terms are exhausted.
+        rows: list[int] = []
+        fanned_positions: list[int] = []
+        for (start, end), seen_at in zip(spans, occurrences):
+            for position in seen_at:
+                rows.extend(range(start, end))
+                fanned_positions.extend([position] * (end - start))
+        order = np.argsort(fanned_positions, kind="stable")
+        return self.build(
+            builder,
+            index=np.asarray(fanned_positions, dtype=np.int64)[order],
+            rows=np.asarray(rows, dtype=np.int64)[order],
+        )
+
+    def open_sink(self) -> ResultSink | None:
+        """Opens a sink for this fetch's results, if `sink_dir` is set.
+        `.part` directories left by this fetcher's failed runs are
+        removed if its terms are journaled, as the journal replays
+        their results, and are otherwise kept for `ResultSink.recover`."""
+        if self.sink_dir is None:
+            return None
+        name = type(self.scraper).__name__
+        for location in stale(self.sink_dir, name):
+            if self.journal_dir is None:
+                logger.warning(
+                    "sink=%s, status=stale, action_undertaken=%s",
+                    location,
+                    "Kept for recovery",
+                )
+                continue
+            logger.info(
+                "sink=%s, status=stale, action_undertaken=%s",
+                location,
+                "Removed, as the journal replays its results",
+            )
+            shutil.rmtree(location, ignore_errors=True)
+        return ResultSink.open(self.sink_dir, f"{config.today}_{name}")
+
+    @staticmethod
+    def build(builder: ColumnarBuilder, **kwargs: Any) -> pd.DataFrame:
+        """Builds the fetched results into a dataframe, reading back
+        any that were journaled, and then removes the journal."""
+        dataframe = builder.build(**kwargs)
+        if builder.sink is not None:
+            builder.sink.discard()
+        return dataframe
+
+    @staticmethod
+    def deduplicate(
+        search_terms: Iterable[Any], occurrences: list[list[int]]
+    ) -> Iterator[Any]:
+        """
+        Lazily yields each distinct term once. For the nth distinct term,
+        `occurrences[n]` lists every position at which it appears,
+        and is complete once the terms are exhausted.
+        Terms are compared by their `term_key`, so that terms carrying
+        their contents, such as archive members, are not held on to.
+        Unhashable terms are never treated as duplicates.
+        """
+        first_seen: dict[Hashable, int] = {}
+        for position, term in enumerate(search_terms):
+            key = term_key(term)
+            index = None if key is None else first_seen.get(key)
+            if index is not None:
+                occurrences[index].append(position)
+                continue
+            if key is not None:
+                first_seen[key] = len(occurrences)
+            occurrences.append([position])
+            yield term
+
+    def scrape(
+        self,
+        search_terms: Iterable[Any],
+        tqdm_unit: str = "abstracts",
+        run_key: str | None = None,
+        use_seen: bool = True,
+    ) -> Iterator[list[ScrapeResult]]:
+        """
+        scrape obtains each of the search terms in turn, yielding
+        the list of results produced for each term, in order.
+        Terms completed by an earlier, unfinished run are taken from
+        the journal, if there is one, rather than obtained again,
+        and terms in the `seen` set are skipped, unless `force` is set,
+        or `use_seen` is not.
+        """
+        journal = self.open_journal(run_key)
+        seen = self.seen if use_seen else None
+        if journal is None and seen is None:
+            yield from self.obtain_all(search_terms, tqdm_unit)
+            return
+        # Each term is queued with its known results, or MISSING,
+        # and only missing terms are obtained, so results are yielded
+        # in order once every term queued before them is resolved.
+        queue: deque[tuple[Any, Any]] = deque()
+        skipped = 0
+
+        def missing_terms() -> Iterator[Any]:
+            nonlocal skipped
+            for term in search_terms:
+                results = MISSING if journal is None else journal.lookup(term)
+                if (
+                    results is MISSING
+                    and seen is not None
+                    and not self.force
+                    and term in seen
+                ):
+                    # Skipped terms yield no results, and are not re-added.
+                    results, term = [], SKIPPED
+                    skipped += 1
+                queue.append((term, results))
+                if results is MISSING:
+                    yield term
+
+        obtained: deque[list[ScrapeResult]] = deque()
+        outcomes = self.obtain_all(missing_terms(), tqdm_unit)
+        exhausted = False
+        with journal or nullcontext(), seen or nullcontext():
+            while True:
+                while queue and (queue[0][1] is not MISSING or obtained):
+                    term, results = queue.popleft()
+                    if results is MISSING:
+                        results = obtained.popleft()
+                        if journal is not None:
+                            journal.record(term, results)
+                    if seen is not None and term is not SKIPPED:
+                        if completed(results):
+                            seen.add(term)
+                    yield results
+                if exhausted:
+                    break
+                # Pulling the last missing term may also queue the known
+                # terms after it, which are yielded before leaving.
+                try:
+                    obtained.append(next(outcomes))
+                except StopIteration:
+                    exhausted = True
+        if skipped:
+            logger.info(
+                "seen=%d, action_undertaken=%s",
+                skipped,
+                "Skipping terms completed in earlier runs",
+            )
+        if journal is not None:
+            journal.discard()
+
+    def open_journal(self, run_key: str | None = None) -> RunJournal | None:
+        """Loads this fetcher's journal of the input with `run_key`,
+        if `journal_dir` is set."""
+        if self.journal_dir is None:
+            return None
+        name = self.name or (
+            f"{type(self).__name__}_{type(self.scraper).__name__}"
+        )
+        suffix = f"_{run_key}" if run_key else ""
+        return RunJournal.load(
+            Path(self.journal_dir, f"{name}{suffix}.journal")
+        )
 
-            for result in results:  # type: ignore[arg-type, union-attr]
-                if result is not None:
-                    data.append(result)
+    def obtain_all(
+        self, search_terms: Iterable[Any], tqdm_unit: str = "abstracts"
+    ) -> Iterator[list[ScrapeResult]]:
+        """Obtains each of the search terms, in the pool if there is one,
+        yielding the list of results produced for each term, in order."""
+        outcomes = (
+            map(self.scraper.obtain, search_terms)
+            if self.pool is None
+            else self.pool.map(self.scraper.obtain, search_terms)
+        )
+        for outcome in tqdm(
+            outcomes,
+            desc="[sciscraper]: ",
+            unit=f"{tqdm_unit}",
+            total=(
+                len(search_terms) if isinstance(search_terms, Sized) else None
+            ),
+        ):
+            if isinstance(outcome, WorkerFailure):
+                outcome = self.recover(outcome)
+            yield self.collect(outcome)
+
+    def recover(self, failure: WorkerFailure) -> ScrapeResult | None:
+        """Turns a term that failed in a worker into a failed row,
+        where the scraper supports it. Otherwise, the term is dropped."""
+        logger.error(
+            "term=%s, reason=%s, action_undertaken=%s",
+            failure.item,
+            failure.reason,
+            "Recording failure",
+        )
+        failed = getattr(self.scraper, "failed", None)
+        return failed(failure.item, failure.reason) if failed else None
 
-        logger.debug(data)
-        return pd.DataFrame(data, index=None)
+    @staticmethod
+    def collect(results: Any) -> list[ScrapeResult]:
+        """Normalizes whatever a scraper's `obtain` returned
+        into a list of results, with any empty results removed."""
+        # Check if results is a single ScrapeResult, and if so, convert it to a list
+        if not isinstance(results, Iterable) or isinstance(
+            results, str | dict
+        ):  # Including `isinstance(results, str | dict)` to exclude strings and single rows
+            results = [results]
+        return [result for result in results if result is not None]
 
 
 @dataclass
@@ -90,69 +358,272 @@ class ScrapeFetcher(Fetcher):
     ScrapeFetcher takes a string `target`
     serialized into a list of strings with serializer
     It then puts it into fetch, where it returns a dataframe.
+    If `carried_columns` are named, the serializer instead yields tuples
+    of each term followed by the values of those columns,
+    which are added to the term's results.
+    If a `memo_dir` is provided, the dataframe produced from a file
+    `target` is memoized within it, and returned by later calls with
+    the same file and configuration, unless `force` is set.
     """
 
     serializer: SerializationStrategyFunction
-    title_serializer: SerializationStrategyFunction | None = None
+    carried_columns: tuple[str, ...] = ()
+    manifest_file: FilePath | None = None
+    memo_dir: FilePath | None = None
 
     def __call__(self, target: Path) -> pd.DataFrame:
-        search_terms: list[str] = self.serializer(target)
-        outcome = self.fetch(search_terms)
-        if self.title_serializer:
-            outcome["title"] = self.title_serializer(target)
-        return outcome
+        run_key = self.run_key(target)
+        memo = self.memo_path(target, run_key)
+        if memo is not None and not self.force:
+            dataframe = load_memo(memo)
+            if dataframe is not None:
+                logger.info(
+                    "memo=%s, rows=%d, action_undertaken=%s",
+                    memo,
+                    len(dataframe),
+                    "Reusing the results of an earlier scrape",
+                )
+                return dataframe
+        search_terms: Iterable[Any] = self.serializer(target)
+        if self.carried_columns:
+            dataframe = self.fetch_with_carried_columns(search_terms, run_key)
+        elif self.manifest_file:
+            dataframe = self.fetch_incrementally(list(search_terms), run_key)
+        else:
+            dataframe = self.fetch(search_terms, run_key=run_key)
+        if memo is not None:
+            save_memo(memo, dataframe)
+        return dataframe
+
+    def run_key(self, target: FilePath) -> str | None:
+        """Returns the key of a scrape of `target` with this fetcher's
+        configuration, if it is memoized or journaled."""
+        if self.memo_dir is None and self.journal_dir is None:
+            return None
+        return memo_key(
+            target,
+            configuration(self.scraper),
+            strategy_name(self.serializer),
+            repr(self.carried_columns),
+        )
+
+    def memo_path(self, target: FilePath, run_key: str | None) -> Path | None:
+        """Returns where the scrape of a file `target` is memoized,
+        or None if it is not memoized."""
+        if self.memo_dir is None or not Path(target).is_file():
+            return None
+        return Path(
+            self.memo_dir, f"{type(self.scraper).__name__}_{run_key}.pkl"
+        )
+
+    def fetch_with_carried_columns(
+        self, rows: Iterable[tuple[Any, ...]], run_key: str | None = None
+    ) -> pd.DataFrame:
+        """
+        fetch_with_carried_columns scrapes the first value of each row,
+        and adds the rest of the row, as `carried_columns`,
+        to every result of that term. Rows are read lazily,
+        so the serializer is only passed over once.
+        """
+        carried: deque[tuple[Any, ...]] = deque()
+
+        def search_terms() -> Iterator[Any]:
+            for term, *values in rows:
+                carried.append(tuple(values))
+                yield term
+
+        builder = ColumnarBuilder(sink=self.open_sink())
+        for results in self.scrape(search_terms(), run_key=run_key):
+            values = carried.popleft()
+            builder.extend(results, zip(self.carried_columns, values))
+        return self.build(builder)
+
+    def fetch_incrementally(
+        self, search_terms: list[Any], run_key: str | None = None
+    ) -> pd.DataFrame:
+        """
+        fetch_incrementally consults the manifest at `manifest_file`,
+        and only scrapes those files that are new or have changed
+        since they were last recorded. The cached results of every
+        other file are merged back in, in their original order.
+        The manifest takes the place of the `seen` set, as files
+        are known by their path, and may have changed since.
+        """
+        manifest = Manifest.load(self.manifest_file)  # type: ignore[arg-type]
+        cached = {term: manifest.lookup(term) for term in search_terms}
+        stale = [term for term, result in cached.items() if result is None]
+        logger.info(
+            "manifest=%s, unchanged=%d, new_or_changed=%d",
+            manifest.location,
+            len(cached) - len(stale),
+            len(stale),
+        )
+        with manifest:
+            for term, results in zip(
+                stale, self.scrape(stale, "pdfs", run_key, use_seen=False)
+            ):
+                # A file without a result never takes the place
+                # of its manifest entry.
+                if not results:
+                    continue
+                result = cached[term] = results[0]
+                if getattr(result, "failure", None) is None:
+                    manifest.record(term, result)
+        manifest.retain(search_terms)
+        manifest.save()
+        builder = ColumnarBuilder()
+        builder.extend(
+            result
+            for result in (cached[term] for term in search_terms)
+            if result is not None
+        )
+        return builder.build()
 
 
 @dataclass
 class StagingFetcher(Fetcher):
     """
     StagingFetcher takes a dataframe, `prior_dataframe` with one of its columns
-    isolated and staged, via `stager`, into a list of `staged_terms`.
+    isolated and staged, via `stager`, into an iterable of `staged_terms`,
+    or a tuple of two, which may be read lazily.
     It then puts it into fetch, where it returns the final dataframe.
+    Papers that already have this fetcher's `status` in the `store`
+    are skipped, unless `force` is set, and are left out of its output,
+    unless `keep_known` is set, in which case they keep their place
+    in it, with the fields the store recorded for them.
     """
 
     stager: StagingStrategyFunction
+    keep_known: bool = field(default=False, kw_only=True)
 
     def __call__(self, prior_dataframe: pd.DataFrame) -> pd.DataFrame:
+        known = self.find_known(prior_dataframe)
+        if not known.any():
+            return self.stage(prior_dataframe)
+        if not self.keep_known:
+            return self.stage(prior_dataframe[~known])
+        # Rows are held by position while they are apart,
+        # as the prior index may repeat.
+        positional = prior_dataframe.reset_index(drop=True)
+        staged = self.stage(positional[~known])
+        recalled = self.recall(positional[known])
+        dataframe = (
+            pd.concat([staged, recalled]) if len(staged) else recalled
+        ).sort_index(kind="stable")
+        dataframe.index = prior_dataframe.index[dataframe.index]
+        return dataframe
+
+    def stage(self, prior_dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Stages the terms of `prior_dataframe`, and fetches them."""
+        run_key = self.run_key(prior_dataframe)
         staged_terms: Iterable[Any] = self.stager(prior_dataframe)
-        if isinstance(staged_terms, list):
+        if isinstance(staged_terms, tuple):
+            dataframe = self.fetch_with_staged_reference(staged_terms, run_key)
+        elif isinstance(staged_terms, Iterable):
             dataframe = self.fetch_from_staged_series(
-                prior_dataframe, staged_terms
+                prior_dataframe, staged_terms, run_key
             )
-        elif isinstance(staged_terms, tuple):
-            dataframe = self.fetch_with_staged_reference(staged_terms)
         else:
-            raise ValueError("Staged terms must be lists or tuples.")
+            raise ValueError("Staged terms must be iterables or tuples.")
         return dataframe
 
+    def find_known(self, prior_dataframe: pd.DataFrame) -> np.ndarray:
+        """Returns whether each paper already has this fetcher's `status`
+        in the `store`, from an earlier run. None do if `force` is set."""
+        if self.store is None or self.status is None or self.force:
+            return np.zeros(len(prior_dataframe), dtype=bool)
+        keys = paper_keys(prior_dataframe)
+        with self.store:
+            known = self.store.known(keys.dropna(), self.status)
+        skipped = keys.isin(known).to_numpy()
+        logger.info(
+            "status=%s, known=%d, action_undertaken=%s",
+            self.status,
+            skipped.sum(),
+            (
+                "Taking papers found in the store from it"
+                if self.keep_known
+                else "Skipping papers found in the store"
+            ),
+        )
+        return skipped
+
+    def recall(self, prior_dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Returns the papers of `prior_dataframe`, with each field
+        the store recorded for them that they do not already have."""
+        keys = paper_keys(prior_dataframe)
+        with self.store:  # type: ignore[union-attr]
+            records = self.store.records(keys.dropna())  # type: ignore[union-attr]
+        stored = pd.DataFrame.from_records(
+            [records.get(key, {}) for key in keys],
+            index=prior_dataframe.index,
+        )
+        return prior_dataframe.join(
+            stored[[name for name in stored if name not in prior_dataframe]]
+        )
+
+    def run_key(self, prior_dataframe: pd.DataFrame) -> str | None:
+        """Returns the key of a staging of `prior_dataframe`
+        with this fetcher's configuration, if it is journaled."""
+        if self.journal_dir is None:
+            return None
+        return frame_key(
+            prior_dataframe,
+            configuration(self.scraper),
+            strategy_name(self.stager),
+        )
+
     def fetch_from_staged_series(
-        self, prior_dataframe: pd.DataFrame, staged_terms: list[Any]
+        self,
+        prior_dataframe: pd.DataFrame,
+        staged_terms: Iterable[Any],
+        run_key: str | None = None,
     ) -> pd.DataFrame:
         """If the terms are staged as a list, then the dataframe is extended
         along the provided query, and then it is appended to the existing dataframe.
+        Each staged term is taken from the row at the same position,
+        so the results are joined by position, and the prior index,
+        which may repeat, is only restored afterwards.
         """
-        dataframe_ext: pd.DataFrame = self.fetch(staged_terms)
-        dataframe: pd.DataFrame = prior_dataframe.join(dataframe_ext)
+        dataframe_ext: pd.DataFrame = self.fetch(staged_terms, run_key=run_key)
+        dataframe: pd.DataFrame = prior_dataframe.reset_index(drop=True).join(
+            dataframe_ext
+        )
+        dataframe.index = prior_dataframe.index[dataframe.index]
         return dataframe
 
     def fetch_with_staged_reference(
         self,
-        staged_terms: tuple[
-            list[Any],
-            list[Any],
-        ],
+        staged_terms: (
+            StagedReference
+            | tuple[
+                Iterable[Any],
+                Iterable[Any],
+            ]
+        ),
+        run_key: str | None = None,
     ) -> pd.DataFrame:
-        """If the terms are staged as a tuple of two lists,
+        """If the terms are staged as a tuple of two iterables,
         then the first part of the tuple gets extended
         along the provided query. Then the second part of the tuple gets
         exploded out and appended. The default version of this
         provide the source titles, from which the ensuing citations
-        were originally found. The prior dataframe is not kept."""
+        were originally found. The prior dataframe is not kept.
+        A `StagedReference` instead provides the position of each
+        term's source, which is used to look up its categorical title."""
+        if isinstance(staged_terms, StagedReference):
+            ref_dataframe = self.fetch(staged_terms.terms, run_key=run_key)
+            titles = staged_terms.source_titles
+            ref_dataframe["source_titles"] = pd.Categorical.from_codes(
+                titles.codes[staged_terms.sources[ref_dataframe.index]],
+                dtype=titles.dtype,
+            )
+            return ref_dataframe
         citations, src_titles = staged_terms
-        ref_dataframe = self.fetch(citations)
+        ref_dataframe = self.fetch(citations, run_key=run_key)
         dataframe = ref_dataframe.join(
             pd.Series(
-                src_titles,
+                list(src_titles),
                 dtype="string",
                 name="source_titles",
             )
@@ -168,11 +639,14 @@ class SciScraper:
     """
 
     scraper: ScrapeFetcher
-    stager: StagingFetcher | None
+    stager: StagingFetcher | Fetcher | None
     logger = logger
     downcast: bool = True
     debug: bool = True
     export: bool = True
+    export_format: str = "csv"
+    partition_by_year: bool = False
+    store: ResultStore | None = None
 
     def __call__(
         self,
@@ -186,12 +660,60 @@ class SciScraper:
             target,
         )
         dataframe: pd.DataFrame = self.scraper(target)
-        dataframe = self.stager(dataframe) if self.stager else dataframe
-        dataframe = self.remove_empty_columns(dataframe)
+        self.branch(dataframe)
+
+    def branch(self, dataframe: pd.DataFrame, mode: str | None = None) -> None:
+        """
+        Stages the scraped dataframe, if there is a stager, and then
+        casts, exports and stores the results. Batch runs call this once
+        for each mode, with the dataframe their modes share.
+
+        :param pd.DataFrame dataframe: The output of the `scraper`.
+        :param str | None mode: The mode being run, if it is one of many,
+            which is added to the name of its export.
+        """
+        staged = self.stager(dataframe) if self.stager else dataframe
+        # A row has the stager's status only if the stager found
+        # something for it, in a column that it added.
+        added = staged.columns.difference(dataframe.columns)
+        reached = staged[added].notna().any(axis=1).to_numpy()
+        dataframe = self.remove_empty_columns(staged)
         dataframe = (
             self.dataframe_casting(dataframe) if self.downcast else dataframe
         )
-        self.export_sciscrape_results(dataframe) if self.export else None
+        if self.export:
+            self.export_sciscrape_results(
+                dataframe,
+                export_format=self.export_format,
+                partition_by_year=self.partition_by_year,
+                export_name=self.create_export_name(mode),
+            )
+        if self.store is not None:
+            self.store_results(dataframe, reached)
+
+    def store_results(
+        self, dataframe: pd.DataFrame, reached: np.ndarray | None = None
+    ) -> None:
+        """Upserts the results into the store, with the statuses
+        given by each of the run's fetchers. The stager's status is
+        only given to the rows it `reached`, if they are given."""
+        statuses = {"scraped"} | {
+            fetcher.status
+            for fetcher in (self.scraper, self.stager)
+            if fetcher is not None and fetcher.status is not None
+        }
+        stager_status = None if self.stager is None else self.stager.status
+        partly_reached = (
+            {stager_status: reached}
+            if stager_status is not None
+            and stager_status != self.scraper.status
+            and reached is not None
+            else {}
+        )
+        with self.store:  # type: ignore[union-attr]
+            self.store.upsert(  # type: ignore[union-attr]
+                dataframe, statuses, partly_reached
+            )
 
     def set_logging(self) -> None:
         """Sets the logging level to debug if specified,
@@ -220,11 +742,8 @@ class SciScraper:
                 dataframe
             )
 
-        # Convert columns in KEY_TYPE_PAIRINGS dictionary to specified data types
-        for scikey, value in KEY_TYPE_PAIRINGS.items():
-            if scikey in dataframe:
-                dataframe[scikey] = dataframe[scikey].astype(value)
-        return dataframe
+        # Give every other column the most compact dtype its values allow
+        return optimize_dtypes(dataframe)
 
     @staticmethod
     def downcast_available_datetimes(
@@ -237,17 +756,25 @@ class SciScraper:
     def export_sciscrape_results(
         dataframe: pd.DataFrame,
         export_dir: FilePath = Path(config.export_dir),
+        export_format: str = "csv",
+        partition_by_year: bool = False,
+        export_name: FilePath | None = None,
     ) -> None:
-        """Export data to the specified export directory."""
+        """Export data to the specified export directory,
+        as .csv, Parquet or Feather."""
         SciScraper.dataframe_logging(dataframe)
-        export_name = SciScraper.create_export_name()
-        with change_dir(export_dir):
-            logger.info(
-                "A spreadsheet was exported as %s in %s.",
-                export_name,
-                export_dir,
-            )
-            dataframe.to_csv(export_name, index=False)
+        export_path = export_dataframe(
+            dataframe,
+            export_dir,
+            Path(export_name or SciScraper.create_export_name()).stem,
+            export_format,
+            partition_by_year,
+        )
+        logger.info(
+            "A spreadsheet was exported as %s in %s.",
+            export_path.name,
+            export_dir,
+        )
 
     @staticmethod
     def dataframe_logging(dataframe: pd.DataFrame) -> None:
@@ -256,8 +783,9 @@ class SciScraper:
         logger.info("\n\n%s", dataframe.head(10))
 
     @staticmethod
-    def create_export_name() -> FilePath:
+    def create_export_name(mode: str | None = None) -> FilePath:
         """Returns a `export_name` for the spreadsheet with
-        both today's date and a randomly generated `print_id`
-        number."""
-        return Path(f"{config.today}_sciscraper.csv")
+        today's date, and the `mode` it was produced by,
+        if it was one of many run at once."""
+        suffix = f"_{mode}" if mode else ""
+        return Path(f"{config.today}_sciscraper{suffix}.csv")
@@ -0,0 +1,170 @@
+"""journal.py checkpoints the terms a fetch has completed,
+so that a run that stops partway through can resume where it stopped.
+
+Each fetch has a journal of its own, named after the fetcher and
+keyed by its input and configuration. As each term is scraped,
+the term's `term_key`, rather than the term itself, is appended
+to the journal with its results as a pickled record. Records are
+flushed as they are written, but only fsynced every
+`journal_sync_every` records, or every `journal_sync_interval`
+seconds, so that journaling costs little more than the write itself.
+When a run on the same input is started again, every term whose key
+is in the journal is taken from it, rather than being requested again.
+The journal is removed once the fetch completes.
+
+A record cut short by a crash is discarded when the journal is read,
+and terms whose results record a failure, or an unsuccessful download,
+are never journaled, so that they are attempted again.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from src.config import config
+from src.log import logger
+from src.serials import term_key
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from src.config import FilePath
+
+JOURNAL_DIR = "journals"
+MISSING = object()
+
+
+@dataclass
+class RunJournal:
+    """
+    RunJournal records each completed term of a fetch, with its results.
+
+    Attributes
+    ---------
+    location : Path
+        The journal file.
+    sync_every : int
+        The number of records written between each fsync.
+    sync_interval : float
+        The greatest number of seconds between each fsync.
+    entries : dict
+        The results of each term completed in an earlier run,
+        by the term's key, which are removed as they are looked up.
+    """
+
+    location: Path
+    sync_every: int = config.journal_sync_every
+    sync_interval: float = config.journal_sync_interval
+    entries: dict[Any, Any] = field(default_factory=dict)
+    _file: IO[bytes] | None = field(default=None, repr=False)
+    _unsynced: int = field(default=0, repr=False)
+    _last_sync: float = field(default_factory=time.monotonic, repr=False)
+
+    @classmethod
+    def load(cls, location: FilePath) -> RunJournal:
+        """Reads the records of an earlier run from `location`, if any,
+        truncating any record that was cut short."""
+        journal = cls(Path(location))
+        if not journal.location.exists():
+            return journal
+        with open(journal.location, "rb+") as file:
+            end = 0
+            while True:
+                try:
+                    key, results = pickle.load(file)
+                except EOFError:
+                    break
+                except (pickle.UnpicklingError, ValueError, TypeError) as e:
+                    logger.error(
+                        "journal=%s, error=%s, action_undertaken=%s",
+                        journal.location,
+                        e,
+                        "Discarding incomplete record",
+                    )
+                    break
+                journal.entries[key] = results
+                end = file.tell()
+            file.truncate(end)
+        logger.info(
+            "journal=%s, completed_terms=%d",
+            journal.location,
+            len(journal.entries),
+        )
+        return journal
+
+    def __enter__(self) -> RunJournal:
+        self.location.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.location, "ab")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def lookup(self, term: Any) -> Any:
+        """Returns, and forgets, the results journaled for `term`,
+        or `MISSING` if it has not been completed."""
+        key = term_key(term)
+        if key is None:  # Unhashable terms are never journaled.
+            return MISSING
+        return self.entries.pop(key, MISSING)
+
+    def record(self, term: Any, results: list[Any]) -> None:
+        """Appends a completed term, and its results, to the journal."""
+        if self._file is None:
+            raise RuntimeError("The journal must be opened before recording.")
+        key = term_key(term)
+        if key is None or not completed(results):
+            return
+        pickle.dump((key, results), self._file, pickle.HIGHEST_PROTOCOL)
+        self._file.flush()
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.sync_every
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Forces every record written so far onto the disk."""
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def discard(self) -> None:
+        """Removes the journal, once its fetch has completed."""
+        self.location.unlink(missing_ok=True)
+
+
+def completed(results: list[Any]) -> bool:
+    """Returns whether none of a term's results record a failure,
+    or an unsuccessful download."""
+    return not any(
+        field_of(result, "failure") is not None
+        or field_of(result, "success", True) is False
+        for result in results
+    )
+
+
+def field_of(result: Any, name: str, default: Any = None) -> Any:
+    """Returns a field of a result, which may be a dataclass
+    or a dict row, such as those of `ScoringDownloader`."""
+    if isinstance(result, Mapping):
+        return result.get(name, default)
+    return getattr(result, name, default)
@@ -0,0 +1,219 @@
+"""manifest.py keeps a persistent record of every .pdf scored in
+`directory` mode, so that later runs only process new or changed files.
+
+Each entry stores the path, size, modification time and content hash
+of a file, along with the `DocumentResult` it last produced.
+Entries are appended as JSON lines while a run is in progress,
+and the file is compacted once the run finishes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from hashlib import blake2b
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.config import UTF, FilePath
+from src.docscraper import DocumentResult
+from src.log import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import TracebackType
+    from typing import IO
+
+MANIFEST_NAME = "sciscraper_manifest.jsonl"
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(filepath: FilePath, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    Returns the blake2b digest of a file's contents,
+    read in chunks so that large .pdfs are never held in memory.
+
+    :param FilePath filepath: The file to be hashed.
+    :param int chunk_size: The number of bytes read at a time.
+    :rtype str:
+    :returns: The hexadecimal digest of the file.
+    """
+    digest = blake2b(digest_size=20)
+    with open(filepath, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """
+    A single file recorded in the manifest.
+
+    Attributes
+    ---------
+    path : str
+        The resolved path to the file.
+    size : int
+        The size of the file in bytes.
+    mtime_ns : int
+        The modification time of the file in nanoseconds.
+    content_hash : str
+        The blake2b digest of the file's contents.
+    result : dict | None
+        The `DocumentResult` last produced for the file, as a dict.
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    result: dict[str, Any] | None = None
+
+
+@dataclass
+class Manifest:
+    """
+    Manifest maps each previously scored .pdf to the
+    `DocumentResult` it produced, so unchanged files can be skipped.
+
+    A file is considered unchanged if its size and modification
+    time match the manifest, or, failing that, if its content hash
+    does. Files that were moved or renamed are found by their hash.
+    """
+
+    location: Path
+    entries: dict[str, ManifestEntry] = field(default_factory=dict)
+    _by_hash: dict[str, str] = field(default_factory=dict, repr=False)
+    _journal: IO[str] | None = field(default=None, repr=False)
+
+    @classmethod
+    def load(cls, location: FilePath) -> Manifest:
+        """Reads a manifest from `location`, if there is one.
+        Later lines take precedence over earlier ones."""
+        manifest = cls(Path(location))
+        if not manifest.location.exists():
+            return manifest
+        with open(manifest.location, encoding=UTF) as file:
+            for line in file:
+                try:
+                    entry = ManifestEntry(**json.loads(line))
+                except (TypeError, ValueError) as e:
+                    logger.error(
+                        "manifest=%s, error=%s, action_undertaken=%s",
+                        manifest.location,
+                        e,
+                        "Skipping malformed entry",
+                    )
+                    continue
+                manifest.add(entry)
+        return manifest
+
+    def __enter__(self) -> Manifest:
+        self.location.parent.mkdir(parents=True, exist_ok=True)
+        self._journal = open(self.location, "a", encoding=UTF)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def add(self, entry: ManifestEntry) -> None:
+        """Adds an entry to the manifest, replacing any prior entry for the same path."""
+        self.entries[entry.path] = entry
+        self._by_hash[entry.content_hash] = entry.path
+
+    def lookup(self, filepath: FilePath) -> DocumentResult | None:
+        """
+        Returns the cached `DocumentResult` for `filepath`
+        if the file is unchanged since it was last scored, otherwise None.
+        """
+        path = Path(filepath).resolve()
+        key = str(path)
+        stat = path.stat()
+        entry = self.entries.get(key)
+        if entry is not None and (entry.size, entry.mtime_ns) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            return restore_document_result(entry.result)
+
+        if entry is not None and entry.size != stat.st_size:
+            return None
+
+        content_hash = hash_file(path)
+        known_path = self._by_hash.get(content_hash)
+        if known_path is None:
+            return None
+        known = self.entries[known_path]
+        if known.size != stat.st_size or known.result is None:
+            return None
+        self.record(path, known.result, content_hash)
+        return restore_document_result(known.result)
+
+    def record(
+        self,
+        filepath: FilePath,
+        result: DocumentResult | dict[str, Any] | None,
+        content_hash: str | None = None,
+    ) -> None:
+        """Records the `result` for `filepath`, appending it to the manifest on disk."""
+        path = Path(filepath).resolve()
+        stat = path.stat()
+        entry = ManifestEntry(
+            path=str(path),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            content_hash=content_hash or hash_file(path),
+            result=(
+                asdict(result)
+                if isinstance(result, DocumentResult)
+                else result
+            ),
+        )
+        self.add(entry)
+        if self._journal is not None:
+            self._journal.write(json.dumps(asdict(entry)) + "\n")
+            self._journal.flush()
+
+    def retain(self, filepaths: Iterable[FilePath]) -> None:
+        """Drops every entry whose file is not among `filepaths`."""
+        keep = {str(Path(filepath).resolve()) for filepath in filepaths}
+        self.entries = {
+            key: entry for key, entry in self.entries.items() if key in keep
+        }
+        self._by_hash = {
+            entry.content_hash: key for key, entry in self.entries.items()
+        }
+
+    def save(self) -> None:
+        """Compacts the manifest, writing one line per entry."""
+        self.location.parent.mkdir(parents=True, exist_ok=True)
+        staging = self.location.with_suffix(".tmp")
+        with open(staging, "w", encoding=UTF) as file:
+            for entry in self.entries.values():
+                file.write(json.dumps(asdict(entry)) + "\n")
+        os.replace(staging, self.location)
+        logger.debug(
+            "manifest=%s, entries=%d", self.location, len(self.entries)
+        )
+
+
+def restore_document_result(
+    result: dict[str, Any] | None,
+) -> DocumentResult | None:
+    """Rebuilds a `DocumentResult` from its JSON form,
+    turning the frequency distributions back into tuples."""
+    if result is None:
+        return None
+    restored = dict(result)
+    for key in ("target_terms_top_3", "bycatch_terms_top_3"):
+        restored[key] = [tuple(pair) for pair in restored.get(key, [])]
+    return DocumentResult(**restored)
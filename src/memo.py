@@ -0,0 +1,119 @@
+"""memo.py stores the output of a `ScrapeFetcher` on disk, so that
+later runs over the same input file can skip straight to their stager.
+
+Most modes begin by scraping the same .csv with the same scraper,
+so their first stage is memoized, keyed by the content hash of the
+input file and by the configuration of the stage: the scraper's
+settings, the contents of any files it reads, such as word lists,
+and the serializer that reads the input. Changing any of these gives
+a new key, and so a fresh scrape.
+
+The same keys name each fetch's journal, so that an interrupted run
+only resumes from a journal of the same input and stage.
+
+Memos are pickled dataframes, which are read back far faster than
+they are scraped, and keep every column's dtype, including lists.
+Delete the memo directory to clear them.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from dataclasses import fields, is_dataclass
+from functools import partial
+from hashlib import blake2b
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+from src.log import logger
+from src.manifest import hash_file
+
+if TYPE_CHECKING:
+    from src.config import FilePath
+
+MEMO_DIR = "memo"
+
+
+def strategy_name(func: Any) -> str:
+    """Returns a name for a serializer that is the same in every run,
+    including the arguments of a `functools.partial`."""
+    if isinstance(func, partial):
+        return f"{strategy_name(func.func)}{func.args!r}{func.keywords!r}"
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def configuration(scraper: Any) -> str:
+    """Returns the scraper's repr, followed by the content hash of every
+    file that its fields name, so that editing a word list invalidates
+    the memo as well as changing a setting does."""
+    if not is_dataclass(scraper):
+        return repr(scraper)
+    values = (getattr(scraper, item.name) for item in fields(scraper))
+    return repr(scraper) + "".join(
+        hash_file(value)
+        for value in values
+        if isinstance(value, Path) and value.is_file()
+    )
+
+
+def memo_key(target: FilePath, *parts: str) -> str:
+    """Returns the key of a memo: the digest of the input file's content
+    hash, and of every part of the stage's configuration. A directory
+    is known by its resolved path, as its files are tracked apart."""
+    source = (
+        hash_file(target)
+        if Path(target).is_file()
+        else str(Path(target).resolve())
+    )
+    return digest_of(source, *parts)
+
+
+def frame_key(dataframe: pd.DataFrame, *parts: str) -> str:
+    """Returns the key of a staged input: the digest of the dataframe's
+    columns and values, and of every part of the stage's configuration."""
+    hashes = pd.util.hash_pandas_object(dataframe.astype(str), index=False)
+    return digest_of(
+        "\0".join(map(str, dataframe.columns)),
+        hashes.to_numpy().tobytes(),
+        *parts,
+    )
+
+
+def digest_of(*parts: str | bytes) -> str:
+    digest = blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_memo(location: FilePath) -> pd.DataFrame | None:
+    """Reads a memoized dataframe, or returns None if there is none,
+    or it cannot be read."""
+    try:
+        with open(location, "rb") as file:
+            return pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError, AttributeError) as e:
+        logger.error(
+            "memo=%s, error=%s, action_undertaken=%s",
+            location,
+            e,
+            "Scraping afresh",
+        )
+        return None
+
+
+def save_memo(location: FilePath, dataframe: pd.DataFrame) -> None:
+    """Writes a memoized dataframe, replacing any earlier memo at once,
+    so that an interrupted write never leaves a partial memo behind."""
+    location = Path(location)
+    location.parent.mkdir(parents=True, exist_ok=True)
+    staging = location.with_suffix(".tmp")
+    with open(staging, "wb") as file:
+        pickle.dump(dataframe, file, pickle.HIGHEST_PROTOCOL)
+    os.replace(staging, location)
@@ -16,6 +16,7 @@ from src.config import config
 if TYPE_CHECKING:
     from argparse import Namespace
 
+    from src.batch import BatchSciScraper
     from src.fetch import SciScraper
 
 
@@ -34,7 +35,9 @@ def _kill(proc_pid: int) -> None:
     process.kill()
 
 
-def run_benchmark(args: Namespace, sciscrape: SciScraper) -> None:
+def run_benchmark(
+    args: Namespace, sciscrape: SciScraper | BatchSciScraper
+) -> None:
     """
     Run a benchmark on the given SciScraper instance by profiling its execution and printing the results.
 
@@ -72,12 +75,14 @@ def run_benchmark(args: Namespace, sciscrape: SciScraper) -> None:
 
 
 @memory_profiler.profile(precision=4)  # type: ignore[misc]
-def run_memory_profiler(args: Namespace, sciscrape: SciScraper) -> None:
+def run_memory_profiler(
+    args: Namespace, sciscrape: SciScraper | BatchSciScraper
+) -> None:
     """Benchmark the line by line memory usage of the `sciscraper` program."""
     sciscrape(args.file)
 
 
-def run_bytecode_profiler(sciscrape: SciScraper) -> None:
+def run_bytecode_profiler(sciscrape: SciScraper | BatchSciScraper) -> None:
     """
     Reproduces the bytecode of the entire `sciscraper` program.
 
@@ -90,7 +95,7 @@ def run_bytecode_profiler(sciscrape: SciScraper) -> None:
     dis.dis(sciscrape.__call__)
 
 
-def get_profiler(args: Namespace, sciscrape: SciScraper) -> None:  # type: ignore[misc]
+def get_profiler(args: Namespace, sciscrape: SciScraper | BatchSciScraper) -> None:  # type: ignore[misc]
     """
     Get the profiler based on the given arguments and sciscraper function.
 
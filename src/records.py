@@ -0,0 +1,51 @@
+"""records.py contains the base of sciscraper's compact result records.
+
+Results are created once per paper, or once per citation, so runs can
+hold millions of them at once. Each record class is a frozen dataclass
+declared with `slots=True`, so its instances have no `__dict__`,
+and inherits from `CompactRecord`, which:
+
+- interns the string fields named in `interned`, so that values
+  repeated across many rows, such as journal titles, are stored once;
+- pickles each record as its class and a tuple of its field values,
+  rather than a dictionary keyed by field name, so that records cross
+  process boundaries cheaply.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import fields
+from functools import cache
+from typing import Any, ClassVar
+
+
+class CompactRecord:
+    """
+    A mixin for slotted, frozen result dataclasses.
+
+    Attributes
+    ---------
+    interned : ClassVar[tuple[str, ...]]
+        The fields whose string values are interned.
+    """
+
+    __slots__ = ()
+    interned: ClassVar[tuple[str, ...]] = ()
+
+    def __post_init__(self) -> None:
+        for name in self.interned:
+            value = getattr(self, name)
+            if type(value) is str:
+                object.__setattr__(self, name, sys.intern(value))
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        return type(self), tuple(
+            getattr(self, name) for name in field_names(type(self))
+        )
+
+
+@cache
+def field_names(cls: type) -> tuple[str, ...]:
+    """Returns the names of a dataclass's fields, in order."""
+    return tuple(item.name for item in fields(cls))
@@ -0,0 +1,69 @@
+"""scheduling.py orders work for the parallel .pdf pipeline.
+
+`serialize_from_directory` returns files in `rglob` order, so a few
+enormous .pdfs that happen to be found last leave every other worker
+idle at the end of a run. Handing out the most expensive work first,
+and letting each idle worker take the next queued item, keeps the
+workers evenly loaded (the "longest processing time first" rule).
+"""
+
+from __future__ import annotations
+
+import heapq
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.extractors import count_pages
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+
+def file_size(item: Any) -> float:
+    """Estimates the cost of scoring a .pdf from its size on disk.
+    Items that are not files are given no cost."""
+    try:
+        return float(Path(item).stat().st_size)
+    except (OSError, TypeError):
+        return 0.0
+
+
+def page_count(item: Any) -> float:
+    """Estimates the cost of scoring a .pdf from its page count,
+    read from the document's header and cross-reference table.
+    Falls back to the file's size if the .pdf cannot be opened."""
+    try:
+        return float(count_pages(item))
+    except Exception:
+        return file_size(item)
+
+
+def largest_first(
+    items: Iterable[Any], cost: Callable[[Any], float]
+) -> tuple[list[tuple[int, Any]], list[float]]:
+    """
+    Orders `items` from the most to the least expensive.
+
+    :param Iterable items: The items to be scheduled.
+    :param Callable cost: Estimates the cost of a single item.
+    :rtype tuple:
+    :returns: Each item alongside its original position, in the order
+        they should be handed out, and the estimated cost of each
+        item, in their original order.
+    """
+    indexed = list(enumerate(items))
+    costs = [cost(item) for _, item in indexed]
+    indexed.sort(key=lambda pair: costs[pair[0]], reverse=True)
+    return indexed, costs
+
+
+def simulate_makespan(costs: Sequence[float], workers: int) -> float:
+    """
+    Returns how long `workers` would take to finish every task,
+    handed out in the given order, with each task going to whichever
+    worker becomes idle first.
+    """
+    finish_times = [0.0] * max(1, workers)
+    for cost in costs:
+        heapq.heappush(finish_times, heapq.heappop(finish_times) + cost)
+    return max(finish_times)
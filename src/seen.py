@@ -0,0 +1,166 @@
+"""seen.py remembers, across runs, every term a fetcher has completed,
+such as each DOI that has been downloaded, or scored.
+
+A `SeenSet` answers "has this term been fetched before?" without
+loading a table into memory. A Bloom filter, memory-mapped from disk,
+answers "no" for almost every new term after reading a few bits. Only
+terms that the filter reports as present are looked up in an SQLite
+table of every term in the set, which rules out the filter's false
+positives.
+
+Bits are set before their terms are committed to the table, so a run
+that stops partway through can only leave the filter reporting a term
+that the table then rules out, and never the reverse.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import struct
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.config import config
+from src.log import logger
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+SEEN_DIR = "seen"
+HEADER = struct.Struct("<8sII")
+MAGIC = b"SSBLOOM1"
+COMMIT_EVERY = 1_000
+MAX_KEY_LENGTH = 256
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> tuple[int, int]:
+    """Returns the number of bits, rounded up to a whole number of bytes,
+    and the number of hashes, that hold `capacity` terms with a false
+    positive rate of `error_rate`."""
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    bits = max(8, -(-bits // 8) * 8)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+@dataclass
+class SeenSet:
+    """
+    SeenSet is a persistent set of the terms a fetcher has completed.
+
+    Attributes
+    ---------
+    location : Path
+        The Bloom filter. The table of terms is kept beside it,
+        with the suffix ".sqlite".
+    capacity : int
+        The number of terms the filter is sized for, when it is created.
+    error_rate : float
+        The filter's false positive rate, at `capacity` terms.
+    """
+
+    location: Path
+    capacity: int = config.seen_capacity
+    error_rate: float = config.seen_error_rate
+    _bits: np.memmap | None = field(default=None, repr=False)
+    _hashes: int = field(default=0, repr=False)
+    _connection: sqlite3.Connection | None = field(default=None, repr=False)
+    _uncommitted: int = field(default=0, repr=False)
+
+    def __enter__(self) -> SeenSet:
+        self.location.parent.mkdir(parents=True, exist_ok=True)
+        if not self.location.exists():
+            bits, hashes = bloom_parameters(self.capacity, self.error_rate)
+            with open(self.location, "wb") as file:
+                file.write(HEADER.pack(MAGIC, hashes, 0))
+                file.truncate(HEADER.size + bits // 8)
+            logger.info(
+                "seen_set=%s, bits=%d, hashes=%d", self.location, bits, hashes
+            )
+        with open(self.location, "rb") as file:
+            magic, self._hashes, _ = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{self.location} is not a Bloom filter.")
+        self._bits = np.memmap(
+            self.location, dtype=np.uint8, mode="r+", offset=HEADER.size
+        )
+        self._connection = sqlite3.connect(
+            self.location.with_suffix(".sqlite")
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY)"
+            " WITHOUT ROWID"
+        )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._bits is not None:
+            self._bits.flush()
+            self._bits = None
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+        self._uncommitted = 0
+
+    def __contains__(self, term: Any) -> bool:
+        key = self.key(term)
+        if key is None or self._bits is None or self._connection is None:
+            return False
+        byte, mask = self.positions(key)
+        if not np.all(self._bits[byte] & mask):
+            return False
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM seen WHERE key = ?", (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def add(self, term: Any) -> None:
+        """Adds a completed term to the set."""
+        key = self.key(term)
+        if key is None or self._bits is None or self._connection is None:
+            return
+        byte, mask = self.positions(key)
+        np.bitwise_or.at(self._bits, byte, mask)
+        self._connection.execute(
+            "INSERT OR IGNORE INTO seen VALUES (?)", (key,)
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_EVERY:
+            self._bits.flush()
+            self._connection.commit()
+            self._uncommitted = 0
+
+    def positions(self, key: str) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the byte, and the bit within it, of each of the key's
+        hashes, derived from two halves of a single digest."""
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        first, second = np.frombuffer(digest, dtype=np.uint64)
+        bits = len(self._bits) * 8  # type: ignore[arg-type]
+        steps = np.arange(self._hashes, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            positions = (first + steps * second) % np.uint64(bits)
+        return positions // 8, (1 << (positions % 8)).astype(np.uint8)
+
+    @staticmethod
+    def key(term: Any) -> str | None:
+        """Returns the key of a term, or None if it is not a string.
+        DOIs, and other identifiers, are compared without case,
+        and longer text, such as abstracts, by its digest."""
+        if not isinstance(term, str) or not term.strip():
+            return None
+        if len(term) > MAX_KEY_LENGTH:
+            return blake2b(term.encode(), digest_size=20).hexdigest()
+        return term.strip().lower()
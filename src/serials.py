@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import ast
+import json
+import tarfile
+import zipfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from hashlib import blake2b
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import pandas as pd
 
@@ -8,7 +16,63 @@ from src.config import UTF, FilePath
 from src.log import logger
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Hashable, Iterator, Sequence
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+CSV_ENGINE = "c" if pa is None else "pyarrow"
+CSV_CHUNK_ROWS = 50_000
+NESTED_CELL_CACHE_SIZE = 65_536
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """
+    A file read out of an archive, without being unpacked to disk.
+
+    Attributes
+    ---------
+    identifier : str
+        The archive's path and the member's path within it,
+        e.g. 'papers.zip!/2021/smith.pdf'.
+    data : bytes
+        The contents of the member.
+    """
+
+    identifier: str
+    data: bytes = field(repr=False)
+
+    def __str__(self) -> str:
+        return self.identifier
+
+
+def term_key(term: Any) -> Hashable | None:
+    """
+    Returns a small, hashable stand-in for `term`, by which repeated
+    terms may be recognised without holding on to the term itself.
+    Archive members, and raw bytes, are known by the digest of their
+    contents, and other terms by themselves. Unhashable terms have
+    no key.
+
+    :param Any term: A search term, as produced by a serializer or stager.
+    :rtype Hashable | None:
+    :returns: The term's key, or None if it has none.
+    """
+    if isinstance(term, ArchiveMember):
+        digest = blake2b(term.data, digest_size=16).hexdigest()
+        return f"{term.identifier}#{digest}"
+    if isinstance(term, bytes):
+        return blake2b(term, digest_size=16).hexdigest()
+    try:
+        hash(term)
+    except TypeError:
+        return None
+    return term
 
 
 def serialize_from_txt(target: FilePath) -> list[str]:
@@ -43,6 +107,68 @@ def serialize_from_csv(target: FilePath, column: str = "doi") -> list[str]:
     return cleaned_data
 
 
+def stream_from_csv(
+    target: FilePath,
+    column: str = "doi",
+    carry: Sequence[str] = (),
+    engine: str = CSV_ENGINE,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> Iterator[Any]:
+    """
+    Streams a .csv file of papers, `target`, in chunks, and yields the
+    entries in `column`, alongside those of any `carry` columns,
+    from a single pass over the file. Only one chunk is held in memory
+    at a time, however large the file is.
+
+    :param FilePath target: The target .csv file, always as a pathname
+    :param str column: The specific column of interest. Defaults to "doi".
+    :param Sequence[str] carry: Further columns to be read alongside `column`.
+    :param str engine: "pyarrow", if it is installed, or pandas' "c" parser.
+    :param int chunk_rows: Roughly how many rows are read at a time.
+
+    :rtype Iterator:
+    :returns: Each row's entry in `column`, or, if any columns are carried,
+        a tuple of its entries in `column` and each of `carry`, in order.
+    """
+    columns = [column, *carry]
+    for chunk in read_csv_in_chunks(target, columns, engine, chunk_rows):
+        cells = [
+            clean_nested_series(chunk[name].fillna("N/A"), name)
+            for name in columns
+        ]
+        yield from zip(*cells) if carry else cells[0]
+
+
+def read_csv_in_chunks(
+    target: FilePath,
+    columns: Sequence[str],
+    engine: str = CSV_ENGINE,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """Reads only `columns` of a .csv, as strings, a chunk at a time."""
+    if engine == "pyarrow":
+        # pyarrow reads in blocks of bytes, rather than rows.
+        reader = pa_csv.open_csv(
+            target,
+            read_options=pa_csv.ReadOptions(block_size=chunk_rows * 1024),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=list(columns),
+                column_types={name: pa.string() for name in columns},
+                strings_can_be_null=True,
+            ),
+        )
+        for batch in reader:
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(
+        target,
+        skip_blank_lines=True,
+        usecols=list(columns),
+        dtype=str,
+        chunksize=chunk_rows,
+    )
+
+
 def serialize_from_directory(
     target: FilePath, suffix: str = "pdf"
 ) -> list[Path]:
@@ -63,27 +189,131 @@ def serialize_from_directory(
     return data_list
 
 
+def serialize_from_archive(
+    target: FilePath, suffix: str = "pdf"
+) -> Iterator[ArchiveMember]:
+    """
+    serialize_from_archive streams the files in a .zip or .tar archive,
+    `target`, or in every archive within a directory, `target`,
+    that adhere to the requested format `suffix`.
+
+    Members are read lazily, one at a time, so that an archive
+    never has to be unpacked, or held in memory, as a whole.
+
+    :param FilePath target: The target archive, or a directory of archives.
+    :param str suffix: The file extensions of interest. Defaults to "pdf".
+
+    :rtype Iterator:
+    :returns: Each matching member, identified by its path within its archive.
+    """
+    archives = (
+        sorted(
+            path
+            for path in Path(target).rglob("*")
+            if path.name.lower().endswith(ARCHIVE_SUFFIXES)
+        )
+        if Path(target).is_dir()
+        else [Path(target)]
+    )
+    for archive in archives:
+        logger.debug(
+            "serializer=%s, archive=%s", serialize_from_archive, archive
+        )
+        if zipfile.is_zipfile(archive):
+            yield from read_zip_members(archive, suffix)
+        else:
+            yield from read_tar_members(archive, suffix)
+
+
+def read_zip_members(archive: Path, suffix: str) -> Iterator[ArchiveMember]:
+    with zipfile.ZipFile(archive) as zipped:
+        for info in zipped.infolist():
+            if not info.is_dir() and info.filename.lower().endswith(
+                f".{suffix}"
+            ):
+                yield ArchiveMember(
+                    f"{archive}!/{info.filename}", zipped.read(info)
+                )
+
+
+def read_tar_members(archive: Path, suffix: str) -> Iterator[ArchiveMember]:
+    # Opened as a stream, so compressed tarballs are read front to back once.
+    with tarfile.open(archive, mode="r|*") as tarball:
+        for member in tarball:
+            if not member.isfile() or not member.name.lower().endswith(
+                f".{suffix}"
+            ):
+                continue
+            contents = tarball.extractfile(member)
+            if contents is not None:
+                yield ArchiveMember(
+                    f"{archive}!/{member.name}", contents.read()
+                )
+
+
 def clean_any_nested_columns(data_list: list[str], column: str) -> list[str]:
     """
     This function takes a list of strings and a column name and returns a list of cleaned strings.
-    The function first filters out any strings that do not start with a curly brace,
-    then it extracts any strings that start with a curly brace and attempts to evaluate them as Python code.
-    If the evaluation is successful, the function retrieves the value of the specified column from the resulting object,
-    and adds it to the list of cleaned strings.
-    Finally, the function returns the combined list of cleaned strings.
+    Any strings that start with a curly brace are decoded as dicts,
+    and replaced with their value for the specified column.
+    Every other string is kept as-is, and the original order is preserved.
 
     :param list data_list: A list of strings to be cleaned.
     :param str column: The name of the column to be extracted from the nested objects.
     :rtype list:
     :return: A list of cleaned strings.
     """
-    initial_terms = [term for term in data_list if not term.startswith("{")]
-    nested_terms = [
-        eval(term).get(column, "")
-        for term in data_list
-        if term.startswith("{")
-    ]
-    return initial_terms + nested_terms
+    return clean_nested_series(
+        pd.Series(data_list, dtype=object), column
+    ).to_list()
+
+
+def clean_nested_series(series: pd.Series, column: str) -> pd.Series:
+    """
+    Replaces any dict-encoded cells in `series` with their entry for
+    `column`, or an empty string if they have none. Each distinct
+    payload is only decoded once, and the cells keep their order.
+
+    :param pd.Series series: The cells to be cleaned.
+    :param str column: The name of the column to be extracted from the nested objects.
+    :rtype pd.Series:
+    :return: The cleaned cells, with the same index as `series`.
+    """
+    if not (
+        pd.api.types.is_object_dtype(series)
+        or pd.api.types.is_string_dtype(series)
+    ):
+        return series
+    nested = series.str.startswith("{", na=False)
+    if not nested.any():
+        return series
+    payloads = series[nested]
+    entries = {
+        payload: nested_entry(payload, column) for payload in payloads.unique()
+    }
+    return series.mask(nested, payloads.map(entries))
+
+
+def nested_entry(payload: str, column: str) -> Any:
+    decoded = decode_nested_cell(payload)
+    return decoded.get(column, "") if isinstance(decoded, dict) else ""
+
+
+@lru_cache(maxsize=NESTED_CELL_CACHE_SIZE)
+def decode_nested_cell(payload: str) -> Any:
+    """
+    Decodes a dict-encoded cell, written either as JSON or as a Python
+    literal, without evaluating it as code. Returns None if it is neither.
+    """
+    try:
+        return json.loads(payload)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(payload)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        logger.debug("Could not decode nested cell: %s", payload)
+        return None
 
 
 def list_with_na_replacement(
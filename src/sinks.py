@@ -0,0 +1,137 @@
+"""sinks.py journals scraped results to disk while a run is in progress.
+
+A `ResultSink` is given batches of results as they are collected,
+and writes each to a `.part` directory in the export directory,
+so that a run that crashes hours in leaves every result collected
+so far on disk. Once the fetch finishes, the batches are read back
+into a single frame, and the `.part` directory is removed.
+
+The sink makes a run durable, not smaller: while results are fetched
+only one batch of them is held in memory, but the finished frame is
+still built whole, as it is cast, stored and exported as one.
+
+A `.part` directory that has not been written to for
+`sink_stale_after` seconds was left by a run that failed. `stale`
+finds those left by a fetcher, and `ResultSink.recover` reopens one,
+so that its batches can be read back.
+
+Each batch is pickled to a file of its own, so that it is read back
+exactly as it was written: lists stay lists, strings such as "N/A"
+stay strings, and every column keeps its dtype, however many batches
+a run is split into.
+"""
+
+from __future__ import annotations
+
+import pickle
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from src.config import config
+from src.log import logger
+
+if TYPE_CHECKING:
+    from src.config import FilePath
+
+
+def stale(
+    sink_dir: FilePath,
+    name: str,
+    older_than: float = config.sink_stale_after,
+) -> list[Path]:
+    """Returns the `.part` directories in `sink_dir` that were opened
+    for `name`, on any day, and not written to for `older_than`
+    seconds, oldest first."""
+    cutoff = time.time() - older_than
+    found = []
+    for location in Path(sink_dir).glob(f"*_{name}_*.part"):
+        if not location.is_dir():
+            continue
+        written = max(
+            (path.stat().st_mtime for path in location.iterdir()),
+            default=location.stat().st_mtime,
+        )
+        if written < cutoff:
+            found.append((written, location))
+    return [location for _, location in sorted(found)]
+
+
+@dataclass
+class ResultSink:
+    """
+    ResultSink writes batches of results to a `.part` directory,
+    and reads them back in the order they were written.
+
+    Attributes
+    ---------
+    location : Path
+        The `.part` directory the batches are written into.
+    buffer_rows : int
+        The number of rows a `ColumnarBuilder` collects before
+        each batch is written.
+    """
+
+    location: Path
+    buffer_rows: int = config.sink_buffer_rows
+    _parts: list[Path] = field(default_factory=list, init=False, repr=False)
+    rows: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.location.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def open(
+        cls, sink_dir: FilePath, name: str, **kwargs: object
+    ) -> ResultSink:
+        """Opens a sink in a new `.part` directory, named after `name`,
+        inside `sink_dir`."""
+        Path(sink_dir).mkdir(parents=True, exist_ok=True)
+        location = Path(
+            mkdtemp(prefix=f"{name}_", suffix=".part", dir=sink_dir)
+        )
+        logger.info("Journaling results to %s", location)
+        return cls(location, **kwargs)  # type: ignore[arg-type]
+
+    @classmethod
+    def recover(cls, location: FilePath, **kwargs: object) -> ResultSink:
+        """Reopens a `.part` directory left by a run that failed,
+        so that the batches written to it can be read back."""
+        sink = cls(Path(location), **kwargs)  # type: ignore[arg-type]
+        sink._parts = sorted(sink.location.glob("*.pkl"))
+        for part in sink._parts:
+            sink.rows += len(pd.read_pickle(part))
+        logger.info("sink=%s, recovered_rows=%d", sink.location, sink.rows)
+        return sink
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        """Writes a batch of results to disk."""
+        if not len(dataframe):
+            return
+        part = Path(self.location, f"{len(self._parts):05d}.pkl")
+        # Written under another name first, so that a batch cut short
+        # by a crash is never read back.
+        partial = part.with_suffix(".tmp")
+        with open(partial, "wb") as file:
+            pickle.dump(dataframe, file, pickle.HIGHEST_PROTOCOL)
+        partial.replace(part)
+        self._parts.append(part)
+        self.rows += len(dataframe)
+        logger.debug("sink=%s, rows=%d", self.location, self.rows)
+
+    def read(self) -> pd.DataFrame:
+        """Reads every batch back into a single frame."""
+        if not self._parts:
+            return pd.DataFrame()
+        return pd.concat(
+            [pd.read_pickle(part) for part in self._parts], ignore_index=True
+        )
+
+    def discard(self) -> None:
+        """Removes the `.part` directory, and every batch in it."""
+        shutil.rmtree(self.location, ignore_errors=True)
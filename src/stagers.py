@@ -1,21 +1,48 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from itertools import islice
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_list_like
 
 from src.log import logger
-from src.serials import clean_any_nested_columns, list_with_na_replacement
+from src.serials import clean_nested_series
 
 if TYPE_CHECKING:
-    import pandas as pd
+    from collections.abc import Iterable, Iterator
+
+STAGING_CHUNK_ROWS = 10_000
+
+
+class StagedReference(NamedTuple):
+    """
+    A compact representation of terms staged with a reference
+    to the rows they came from.
+
+    Attributes
+    ---------
+    terms : Iterator[str]
+        The staged terms, e.g. every citation of every paper, read lazily.
+    sources : np.ndarray
+        The position, in the original dataframe, of each term's source row.
+    source_titles : pd.Categorical
+        The title of every source row, stored once per distinct title.
+    """
+
+    terms: Iterator[str]
+    sources: np.ndarray
+    source_titles: pd.Categorical
 
 
 def stage_from_series(
     target: pd.DataFrame, column: str = "abstract"
-) -> list[str]:
+) -> Iterator[str]:
     """
     stage_from_series reads a `column` of interest from a
-    dataframe `target`, which gets copied internally, and then
-    returns a list of entries.
+    dataframe `target`, without copying it, and then
+    lazily yields its entries, a chunk at a time.
 
     Unavailable entries are filled in with 'N/A'.
 
@@ -24,7 +51,7 @@ def stage_from_series(
         column(str): The column of interest to be isolated. Defaults to "abstract".
 
     Returns:
-        list[str]: A list of entries from the provided column.
+        Iterator[str]: The entries from the provided column, in order.
 
     See Also:
         `stage_with_reference`: Takes two columns from a dataframe and returns two lists of entries as a tuple.
@@ -39,36 +66,34 @@ def stage_from_series(
          'orange'    10          ['d', 'e']
               NaN    10          ['f', 'g']
     ...
-        >>> stage_from_series(df, 'A') =
+        >>> list(stage_from_series(df, 'A')) =
         ['apple','orange','N/A']
     """
-    raw_terms: list[str] = list_with_na_replacement(target.copy(), column)
-    staged_terms = clean_any_nested_columns(raw_terms, column)
     logger.debug(
-        "stager=%s, terms=%s",
+        "stager=%s, column=%s, rows=%d",
         stage_from_series,
-        staged_terms,
+        column,
+        len(target),
     )
-    return staged_terms
+    return stream_cells(target[column], column)
 
 
 def stage_with_reference(
     target: pd.DataFrame,
     column_x: str = "citations",
     column_y: str = "title",
-) -> tuple[list[str], list[str]]:
+) -> StagedReference:
     """
-    stage_with_reference takes a dataframe `target`, transforms each
-    element of list-like data in `column_x` into a row
-    of its own, and replicates its index values into a new,
-    intermediary dataframe.
+    stage_with_reference takes a dataframe `target`, and lazily
+    transforms each element of list-like data in `column_x` into
+    a row of its own, without copying the rest of the dataframe.
 
-    From that intermediary dataframe, it isolates the new row-wise
-    `column_x`, and also `column_y`, which serves as the initial
-    source titles to which the values in `column_x` were
-    initially lists of citations.
+    Rather than replicating `column_y`, which serves as the initial
+    source titles to which the values in `column_x` were initially
+    lists of citations, into every new row, it records the position
+    of each new row's source, and the titles once, as categories.
 
-    It returns them both as a tuple of lists of strings.
+    It returns them together as a `StagedReference`.
 
     Args:
         target(pd.DataFrame): The initial dataframe to be expanded upon and referenced.
@@ -79,8 +104,8 @@ def stage_with_reference(
 
 
     Returns:
-        tuple[list[str], list[str]]: A tuple of two lists of strings, containing rows from the
-        aforementioned columns.
+        StagedReference: The exploded `column_x`, as a lazy iterator of strings,
+        the position of each of its sources, and the categorical `column_y`.
 
     See Also: `stage_from_series`: Take a dataframe's column and return a list of entries.
 
@@ -94,32 +119,65 @@ def stage_with_reference(
         'orange'  1     ['d', 'e']
         'banana'  1     ['f', 'g']
     ...
-    >>> stage_with_reference(df)
-        df = target.explode('C')
-        df =
-                A  B      C
-        'apple'  1     'a'
-        'apple'  1     'b'
-        'apple'  1     'c'
-        'orange'  1     'd'
-        'orange'  1     'e'
-        'banana'  1     'f'
-        'banana'  1     'g'
-    ...
-    >>> df['C'].to_list() = ['a','b','c','d','e','f','g']
-    >>> df['A'].to_list() = ['apple','apple','apple','orange','orange','banana','banana',]
-    >>> stage_with_reference(df) =
-    return (['a','b','c','d','e','f','g'],['apple','apple','apple','orange','orange','banana','banana'])
+    >>> staged = stage_with_reference(target, 'C', 'A')
+    >>> list(staged.terms) = ['a','b','c','d','e','f','g']
+    >>> staged.sources = array([0, 0, 0, 1, 1, 2, 2], dtype=int32)
+    >>> staged.source_titles = ['apple', 'orange', 'banana']
+        Categories (3, object): ['apple', 'banana', 'orange']
     """
-    data = target.copy().explode(column_x)
-    data_col_x = clean_any_nested_columns(
-        list_with_na_replacement(data, column_x),
+    lists = target[column_x]
+    lengths = lists.map(
+        lambda cell: max(len(cell), 1) if is_list_like(cell) else 1
+    )
+    sources = np.repeat(
+        np.arange(len(lists), dtype=np.int32), lengths.to_numpy()
+    )
+    source_titles = pd.Categorical(
+        clean_nested_series(target[column_y].fillna("N/A"), column_y)
+    )
+    logger.debug(
+        "stager=%s, column=%s, rows=%d, titles=%d",
+        stage_with_reference,
         column_x,
+        len(sources),
+        len(source_titles.categories),
     )
-    data_col_y = clean_any_nested_columns(
-        list_with_na_replacement(data, column_y),
-        column_y,
+    return StagedReference(
+        stream_cells(explode_lazily(lists), column_x), sources, source_titles
     )
-    staged_terms = data_col_x, data_col_y
-    logger.debug("stager=%s, terms=%s", stage_with_reference, staged_terms)
-    return staged_terms
+
+
+def explode_lazily(series: pd.Series) -> Iterator[Any]:
+    """Yields each element of the list-like cells in `series`, as
+    `pd.Series.explode` would, without building the exploded series."""
+    for cell in series:
+        if not is_list_like(cell):
+            yield cell
+        elif len(cell):
+            yield from cell
+        else:
+            yield None
+
+
+def stream_cells(
+    cells: pd.Series | Iterable[Any],
+    column: str,
+    chunk_rows: int = STAGING_CHUNK_ROWS,
+) -> Iterator[str]:
+    """
+    Lazily yields `cells`, with unavailable entries filled in with 'N/A',
+    and nested entries decoded. Only one chunk of cells is copied at a time.
+    """
+    if isinstance(cells, pd.Series):
+        chunks: Iterator[pd.Series] = (
+            cells.iloc[start : start + chunk_rows]
+            for start in range(0, len(cells), chunk_rows)
+        )
+    else:
+        iterator = iter(cells)
+        chunks = (
+            pd.Series(chunk, dtype=object)
+            for chunk in iter(lambda: list(islice(iterator, chunk_rows)), [])
+        )
+    for chunk in chunks:
+        yield from clean_nested_series(chunk.fillna("N/A"), column)
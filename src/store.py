@@ -0,0 +1,290 @@
+"""store.py keeps every paper sciscraper has seen, across runs,
+in a single SQLite database in the export directory.
+
+Each run upserts its final dataframe into the `papers` table, keyed by
+the paper's DOI or, failing that, its Dimensions ID. For each paper,
+the table records when it was last scraped, enriched, scored and
+downloaded, and keeps every field any run has found for it in a JSON
+`record`, with later values taking the place of earlier ones.
+Stages whose `status` a paper already has may skip it in later runs,
+so the exports of those runs only hold the papers they processed,
+unless the stage takes the papers it skipped from their records.
+
+The database may be queried with any SQLite client, for example::
+
+    SELECT doi, json_extract(record, '$.wordscore') AS wordscore
+    FROM papers WHERE scored_at IS NOT NULL ORDER BY wordscore DESC;
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from src.log import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from types import TracebackType
+
+    from src.config import FilePath
+
+STORE_NAME = "sciscraper.sqlite"
+STATUSES = ("scraped", "enriched", "scored", "downloaded")
+KEY_COLUMNS = ("doi", "doi_from_pdf", "internal_id")
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS papers (
+    key TEXT PRIMARY KEY,
+    doi TEXT,
+    internal_id TEXT,
+    title TEXT,
+    {", ".join(f"{status}_at TEXT" for status in STATUSES)},
+    record TEXT NOT NULL DEFAULT '{{}}'
+);
+CREATE INDEX IF NOT EXISTS papers_internal_id ON papers (internal_id);
+"""
+UPSERT = f"""
+INSERT INTO papers (key, doi, internal_id, title, record,
+    {", ".join(f"{status}_at" for status in STATUSES)})
+VALUES (?, ?, ?, ?, ?, {", ".join("?" for _ in STATUSES)})
+ON CONFLICT (key) DO UPDATE SET
+    doi = coalesce(excluded.doi, doi),
+    internal_id = coalesce(excluded.internal_id, internal_id),
+    title = coalesce(excluded.title, title),
+    record = json_patch(record, excluded.record),
+    {", ".join(
+        f"{status}_at = coalesce(excluded.{status}_at, {status}_at)"
+        for status in STATUSES
+    )}
+"""
+
+
+def paper_keys(dataframe: pd.DataFrame) -> pd.Series:
+    """
+    Returns the key of each row: its DOI, in lower case, as DOIs are
+    case-insensitive, or else its Dimensions ID. Rows with neither
+    have no key, and are not stored.
+    """
+    keys = pd.Series(None, index=dataframe.index, dtype=object)
+    for column in KEY_COLUMNS:
+        if column not in dataframe:
+            continue
+        values = (
+            dataframe[column].astype(object).where(dataframe[column].notna())
+        )
+        values = values.map(
+            lambda value: (
+                value.strip().lower() or None
+                if isinstance(value, str)
+                else None
+            )
+        )
+        if column == "internal_id":
+            values = values.map(
+                lambda value: value if value is None else f"id:{value}"
+            )
+        keys = keys.where(keys.notna(), values)
+    return keys
+
+
+def completed_rows(dataframe: pd.DataFrame) -> pd.Series:
+    """Returns whether each row records neither a failure,
+    nor an unsuccessful download."""
+    done = pd.Series(True, index=dataframe.index)
+    if "failure" in dataframe:
+        done &= dataframe["failure"].isna()
+    if "success" in dataframe:
+        done &= dataframe["success"].astype(object).ne(False)
+    return done
+
+
+@dataclass
+class ResultStore:
+    """
+    ResultStore upserts the results of each run into an SQLite database,
+    and answers which papers have already reached a given status.
+    Each thread that opens the store has a connection of its own,
+    so that the branches of a batch run may share it.
+
+    Attributes
+    ---------
+    location : Path
+        The SQLite database.
+    """
+
+    location: Path
+    _local: threading.local = field(
+        default_factory=threading.local, repr=False
+    )
+
+    def __enter__(self) -> ResultStore:
+        self.location.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.location, timeout=30.0)
+        connection.executescript(SCHEMA)
+        self._local.connection = connection
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            raise RuntimeError("The store must be opened before it is used.")
+        return connection
+
+    def upsert(
+        self,
+        dataframe: pd.DataFrame,
+        statuses: Iterable[str] = ("scraped",),
+        reached: Mapping[str, Iterable[bool]] | None = None,
+    ) -> int:
+        """
+        Upserts each row of `dataframe` that has a key, marking it
+        with each of `statuses`, unless it records a failure.
+
+        :param pd.DataFrame dataframe: The results of a run.
+        :param Iterable[str] statuses: The statuses the run's results have.
+        :param Mapping[str, Iterable[bool]] | None reached: For any status
+            only some rows have, such as that of a stage which found
+            nothing for some papers, whether each row has it.
+        :rtype int:
+        :returns: The number of rows upserted.
+        """
+        statuses = set(statuses)
+        if unknown := statuses.difference(STATUSES):
+            raise ValueError(f"Unknown statuses: {sorted(unknown)}")
+        keys = paper_keys(dataframe)
+        keyed = keys.notna().to_numpy()
+        if not keyed.any():
+            return 0
+        dataframe, keys = dataframe[keyed], keys[keyed]
+        done = completed_rows(dataframe).to_numpy()
+        # Rows that failed are only recorded as having been scraped.
+        masks = {
+            status: (
+                np.ones(len(keys), dtype=bool)
+                if status == "scraped"
+                else done.copy()
+            )
+            for status in statuses
+        }
+        for status, rows in (reached or {}).items():
+            if status in masks:
+                masks[status] &= np.fromiter(rows, dtype=bool)[keyed]
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        stamps = zip(*(
+            (
+                np.where(masks[status], now, None)
+                if status in masks
+                else np.full(len(keys), None)
+            )
+            for status in STATUSES
+        ))
+        records = dataframe.to_json(
+            orient="records",
+            lines=True,
+            date_format="iso",
+            default_handler=str,
+        ).splitlines()
+        columns = {
+            name: (
+                dataframe[name].astype(object)
+                if name in dataframe
+                else pd.Series(None, index=dataframe.index, dtype=object)
+            )
+            for name in ("doi", "internal_id", "title")
+        }
+        rows = (
+            (
+                key,
+                str_or_none(doi),
+                str_or_none(internal_id),
+                str_or_none(title),
+                json.dumps({
+                    name: value
+                    for name, value in json.loads(record).items()
+                    if value is not None
+                }),
+                *stamp,
+            )
+            for key, doi, internal_id, title, record, stamp in zip(
+                keys,
+                columns["doi"],
+                columns["internal_id"],
+                columns["title"],
+                records,
+                stamps,
+            )
+        )
+        with self.connection:
+            self.connection.executemany(UPSERT, rows)
+        logger.info(
+            "store=%s, upserted=%d, unkeyed=%d, statuses=%s",
+            self.location,
+            len(keys),
+            len(keyed) - len(keys),
+            ",".join(sorted(statuses)),
+        )
+        return len(keys)
+
+    def known(self, keys: Iterable[str], status: str) -> set[str]:
+        """Returns those of `keys` whose papers already have `status`."""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status: {status}")
+        self.want(keys)
+        return {
+            key
+            for (key,) in self.connection.execute(
+                "SELECT key FROM papers JOIN wanted USING (key)"
+                f" WHERE {status}_at IS NOT NULL"
+            )
+        }
+
+    def records(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Returns the fields recorded for each of `keys` in the store."""
+        self.want(keys)
+        return {
+            key: json.loads(record)
+            for key, record in self.connection.execute(
+                "SELECT key, record FROM papers JOIN wanted USING (key)"
+            )
+        }
+
+    def want(self, keys: Iterable[str]) -> None:
+        """Fills the temporary `wanted` table with `keys`,
+        which the lookups join on."""
+        self.connection.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS wanted (key TEXT PRIMARY KEY)"
+        )
+        with self.connection:
+            self.connection.execute("DELETE FROM wanted")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO wanted VALUES (?)",
+                ((key,) for key in keys),
+            )
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> pd.DataFrame:
+        """Runs a query against the store, returning its rows."""
+        return pd.read_sql_query(sql, self.connection, params=tuple(params))
+
+
+def str_or_none(value: Any) -> str | None:
+    return value if isinstance(value, str) else None
@@ -0,0 +1,315 @@
+"""watch.py provides a long-running watch mode, which scores .pdfs
+as they land in the configured `source_dir`.
+
+New files are noticed through filesystem events when the optional
+`watchdog` package is installed, and through polling otherwise.
+Polling only lists the directories whose modification time has
+changed, so files rewritten in place are only noticed with `watchdog`.
+A file is only scored once its size and modification time have
+settled, so partially written files are never read. Results are
+appended to a rolling export, one file per day, and recorded in the
+directory-mode manifest so that later `directory` runs reuse them.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from itertools import count
+from pathlib import Path
+from queue import Empty, SimpleQueue
+from threading import Event
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+from src.config import FilePath, config
+from src.docscraper import DocScraper, DocumentResult
+from src.log import logger
+from src.manifest import MANIFEST_NAME, Manifest
+from src.workers import SupervisedPool, WorkerFailure
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dependency
+    Observer = None
+    FileSystemEventHandler = object
+
+FileSignature = tuple[int, int]
+
+
+class _EventQueueHandler(FileSystemEventHandler):  # type: ignore[misc, valid-type]
+    """Forwards the paths of created, modified and moved files to a queue."""
+
+    def __init__(self, paths: SimpleQueue[Path], suffix: str) -> None:
+        super().__init__()
+        self.paths = paths
+        self.suffix = f".{suffix}"
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.is_directory:
+            return
+        # A file moved away is forwarded too, so that it is forgotten.
+        for name in (event.src_path, getattr(event, "dest_path", "")):
+            path = Path(name)
+            if name and path.suffix.lower() == self.suffix:
+                self.paths.put(path)
+
+
+def scan_directory(target: FilePath, suffix: str = "pdf") -> Iterator[Path]:
+    """Recursively yields every file in `target` with the given `suffix`."""
+    with os.scandir(target) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_directory(entry.path, suffix)
+            elif entry.name.lower().endswith(f".{suffix}"):
+                yield Path(entry.path)
+
+
+def signature(path: Path) -> FileSignature | None:
+    """Returns the size and modification time of `path`,
+    or None if it no longer exists."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+@dataclass
+class DirectoryWatcher:
+    """
+    DirectoryWatcher watches `source_dir` for new or changed .pdfs,
+    and scores each with `scraper` in a pool of supervised worker processes.
+
+    Attributes
+    ---------
+    scraper : DocScraper
+        The scraper that scores each .pdf.
+    source_dir : FilePath
+        The directory to be watched.
+    export_dir : FilePath
+        The directory into which the rolling export and manifest are written.
+    pool : SupervisedPool
+        The worker processes, and the time and memory limits they run under.
+    poll_interval : float
+        The time, in seconds, between checks for new files. Defaults to 2.0.
+    settle_time : float
+        How long, in seconds, a file must be left unchanged before it is
+        considered fully written. Defaults to 1.0.
+    """
+
+    scraper: DocScraper
+    source_dir: FilePath = config.source_dir
+    export_dir: FilePath = Path(config.export_dir)
+    pool: SupervisedPool = field(default_factory=SupervisedPool)
+    poll_interval: float = 2.0
+    settle_time: float = 1.0
+    suffix: str = "pdf"
+    _pending: dict[Path, tuple[FileSignature, float]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    # Files submitted, or that failed, in their current state. Those
+    # recorded in the manifest, or since removed, are left to it.
+    _handled: dict[Path, FileSignature] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _directories: dict[Path, int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _events: SimpleQueue[Path] = field(
+        default_factory=SimpleQueue, init=False, repr=False
+    )
+
+    def run(self, stop: Event | None = None) -> None:
+        """
+        Watches the source directory until `stop` is set,
+        or until interrupted from the keyboard.
+        """
+        stop = stop or Event()
+        manifest = Manifest.load(Path(self.export_dir, MANIFEST_NAME))
+        observer = self.start_observer()
+        tickets = count()
+        in_flight: dict[int, Path] = {}
+        logger.info(
+            "Watching '%s' for new .%s files, using %s...",
+            self.source_dir,
+            self.suffix,
+            "filesystem events" if observer else "polling",
+        )
+        self.pool.start(self.scraper.obtain)
+        with manifest:
+            try:
+                if observer is not None:
+                    for path in scan_directory(self.source_dir, self.suffix):
+                        self._events.put(path)
+                while not stop.is_set():
+                    if observer is None:
+                        self.poll()
+                    for path in self.settled_paths():
+                        if self.is_already_scored(manifest, path):
+                            del self._handled[path]
+                            continue
+                        ticket = next(tickets)
+                        in_flight[ticket] = path
+                        self.pool.submit(ticket, path)
+                    self.export_completed(
+                        self.pool.collect(), in_flight, manifest
+                    )
+                    stop.wait(self.poll_interval)
+            except KeyboardInterrupt:
+                logger.info(
+                    "Watch mode interrupted, finishing queued files..."
+                )
+            finally:
+                if observer is not None:
+                    observer.stop()
+                    observer.join()
+                while self.pool.backlog:
+                    self.export_completed(
+                        self.pool.collect(), in_flight, manifest
+                    )
+                self.pool.shutdown()
+        manifest.save()
+
+    def start_observer(self) -> Any:
+        """Starts a `watchdog` observer on the source directory,
+        if the package is installed."""
+        if Observer is None:
+            return None
+        observer = Observer()
+        observer.schedule(
+            _EventQueueHandler(self._events, self.suffix),
+            str(self.source_dir),
+            recursive=True,
+        )
+        observer.start()
+        return observer
+
+    def poll(self) -> None:
+        """
+        Queues the files in each directory of `source_dir` that is new,
+        or whose modification time has changed since the last poll.
+        Every other directory is only stat-ed, not listed.
+        """
+        if not self._directories:
+            self._directories[Path(self.source_dir)] = -1
+        for directory, mtime_ns in list(self._directories.items()):
+            try:
+                current = directory.stat().st_mtime_ns
+            except FileNotFoundError:
+                del self._directories[directory]
+                continue
+            if current != mtime_ns:
+                self._directories[directory] = current
+                self.list_directory(directory)
+
+    def list_directory(self, directory: Path) -> None:
+        """Queues the files in `directory`, and in any directory
+        within it that has not been listed before."""
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                if path not in self._directories:
+                    # Stat-ed before it is listed, so that a file added
+                    # while it is listed is found by the next poll.
+                    self._directories[path] = entry.stat(
+                        follow_symlinks=False
+                    ).st_mtime_ns
+                    self.list_directory(path)
+            elif entry.name.lower().endswith(f".{self.suffix}"):
+                self._events.put(path)
+
+    def settled_paths(self) -> list[Path]:
+        """
+        Drains the queue of changed paths, and returns those whose
+        size and modification time have not changed for `settle_time`.
+        Files that have been handled in their current state are skipped.
+        """
+        while True:
+            try:
+                path = self._events.get_nowait()
+            except Empty:
+                break
+            self._pending.setdefault(path, ((-1, -1), monotonic()))
+
+        now = monotonic()
+        ready: list[Path] = []
+        for path, (last_seen, since) in list(self._pending.items()):
+            current = signature(path)
+            if current is None:
+                del self._pending[path]
+                self._handled.pop(path, None)
+            elif self._handled.get(path) == current:
+                del self._pending[path]
+            elif current != last_seen:
+                self._pending[path] = (current, now)
+            elif current[0] > 0 and now - since >= self.settle_time:
+                del self._pending[path]
+                self._handled[path] = current
+                ready.append(path)
+        return ready
+
+    def is_already_scored(self, manifest: Manifest, path: Path) -> bool:
+        try:
+            return manifest.lookup(path) is not None
+        except FileNotFoundError:
+            return True
+
+    def export_completed(
+        self,
+        finished: list[tuple[int, Any]],
+        in_flight: dict[int, Path],
+        manifest: Manifest,
+    ) -> None:
+        """Appends the outcome of every finished file to the rolling export.
+        Files that failed are exported with the reason,
+        but left out of the manifest so that they are retried."""
+        rows: list[dict[str, Any]] = []
+        for ticket, outcome in finished:
+            path = in_flight.pop(ticket)
+            result: DocumentResult | None = (
+                self.scraper.failed(path, outcome.reason)
+                if isinstance(outcome, WorkerFailure)
+                else outcome
+            )
+            if result is None:
+                continue
+            if result.failure is None:
+                manifest.record(path, result)
+                self._handled.pop(path, None)
+            rows.append({"filepath": str(path), **asdict(result)})
+        if rows:
+            self.append_to_export(pd.DataFrame(rows))
+
+    def append_to_export(self, dataframe: pd.DataFrame) -> None:
+        """Appends rows to today's rolling export, writing a header
+        only if the file is new."""
+        export_path = self.export_path()
+        export_path.parent.mkdir(parents=True, exist_ok=True)
+        dataframe.to_csv(
+            export_path,
+            mode="a",
+            header=not export_path.exists(),
+            index=False,
+        )
+        logger.info(
+            "%d newly scored file(s) appended to %s.",
+            len(dataframe),
+            export_path,
+        )
+
+    def export_path(self) -> Path:
+        """Returns the rolling export for today's date."""
+        today = date.today().strftime("%y%m%d")
+        return Path(self.export_dir, f"{today}_sciscraper_watch.csv")
@@ -6,17 +6,18 @@ from dataclasses import dataclass, field
 from enum import Enum
 from json import loads
 from time import sleep
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 from urllib.parse import urlencode
 
-from requests import Response, Session
+from requests import RequestException, Response, Session
 from selectolax.parser import HTMLParser, Node
 
 from src.config import DIMENSIONS_AI_KEYS, config
 from src.log import logger
+from src.records import CompactRecord
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Sequence
 
     from numpy import _SupportsItem
 
@@ -24,10 +25,12 @@ if TYPE_CHECKING:
 client = Session()
 
 
-@dataclass(frozen=True)
-class WebScrapeResult:
+@dataclass(frozen=True, slots=True)
+class WebScrapeResult(CompactRecord):
     """Represents a result from a scrape to be passed back to the dataframe."""
 
+    interned: ClassVar[tuple[str, ...]] = ("pub_date", "journal_title")
+
     title: str
     pub_date: str
     doi: str
@@ -208,6 +211,57 @@ class DimensionsScraper(WebScraper):
         data = self.enrich_response(response)
         return WebScrapeResult(**data)
 
+    def obtain_batch(
+        self, search_texts: Sequence[str]
+    ) -> list[dict[str, Any]] | None:
+        """
+        obtain_batch requests several dimensions.ai ids in a single query,
+        and returns the bibliographic fields of each that was found,
+        keyed as in `DIMENSIONS_AI_KEYS`. Unlike `obtain`, no further
+        requests are made to enrich the results.
+        Returns None if the request itself fails, or its response
+        cannot be read.
+        """
+        querystring = self.create_batch_querystring(search_texts)
+        try:
+            response = self.get_docs(querystring)
+        except RequestException as e:
+            logger.error(
+                "search_texts=%d, scraper=%r, error=%s",
+                len(search_texts),
+                self,
+                e,
+            )
+            return None
+        logger.debug(
+            "search_texts=%d, scraper=%r, status_code=%s",
+            len(search_texts),
+            self,
+            response.status_code,
+        )
+        if response.status_code != 200:
+            return None
+        try:
+            docs = loads(response.text).get("docs", [])
+        except ValueError as e:
+            logger.error(
+                "search_texts=%d, scraper=%r, error=%s",
+                len(search_texts),
+                self,
+                e,
+            )
+            return None
+
+        requested = set(search_texts)
+        return [
+            {
+                key: doc.get(value)
+                for (key, value) in DIMENSIONS_AI_KEYS.items()
+            }
+            for doc in docs
+            if doc.get("id") in requested
+        ]
+
     def get_docs(self, querystring: dict[Any, Any]) -> Response:
         sleep(self.sleep_val)
         return client.get(self.url, params=querystring)
@@ -275,6 +329,16 @@ class DimensionsScraper(WebScraper):
             }
         )
 
+    def create_batch_querystring(
+        self, search_texts: Sequence[str]
+    ) -> dict[str, str]:
+        return {
+            "search_mode": "content",
+            "search_text": " OR ".join(search_texts),
+            "search_type": "kws",
+            "search_field": "text_search",
+        }
+
 
 class Style(Enum):
     """An enum that represents
@@ -0,0 +1,363 @@
+"""workers.py runs scrapes in supervised worker processes.
+
+Each worker scrapes one term at a time, and is watched by the
+supervisor for the wall-clock time and resident memory it uses.
+A worker that exceeds either limit, or that crashes outright, is killed
+and replaced, and its term is reported back as a `WorkerFailure`,
+so that one malformed or enormous file cannot stall an entire run.
+
+Work that mostly waits on the network, such as downloading papers,
+is instead run in a `ThreadedPool`, which keeps several terms in flight
+at once without the cost of a process per worker.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import psutil
+
+from src.log import logger
+from src.scheduling import largest_first, simulate_makespan
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Future
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
+
+MEBIBYTE = 1 << 20
+
+
+@dataclass(frozen=True)
+class WorkerFailure:
+    """
+    A record of a term that could not be scraped by a worker.
+
+    Attributes
+    ---------
+    item : Any
+        The term the worker was given.
+    reason : str
+        Why the scrape failed, e.g. a time or memory limit, or an exception.
+    """
+
+    item: Any
+    reason: str
+
+
+def _serve(func: Callable[[Any], Any], conn: Connection) -> None:
+    """The loop run by each worker process: receive a term,
+    scrape it, and send back the outcome, until told to stop."""
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if task is None:
+            break
+        ticket, item = task
+        try:
+            outcome = func(item)
+        except Exception as e:
+            outcome = WorkerFailure(item, f"{type(e).__name__}: {e}")
+        try:
+            conn.send((ticket, outcome))
+        except Exception as e:
+            conn.send(
+                (ticket, WorkerFailure(item, f"{type(e).__name__}: {e}"))
+            )
+
+
+def resident_memory(pid: int) -> int:
+    """Returns the resident set size, in bytes, of a process and all of its children."""
+    try:
+        process = psutil.Process(pid)
+        members = [process, *process.children(recursive=True)]
+        return sum(member.memory_info().rss for member in members)
+    except psutil.Error:
+        return 0
+
+
+def kill_process_tree(pid: int) -> None:
+    """Kills a process and all of its children."""
+    try:
+        process = psutil.Process(pid)
+        for child in process.children(recursive=True):
+            child.kill()
+        process.kill()
+    except psutil.Error:
+        pass
+
+
+@dataclass
+class _Worker:
+    process: BaseProcess
+    conn: Connection
+    ticket: int | None = None
+    item: Any = None
+    started: float = 0.0
+
+
+@dataclass
+class SupervisedPool:
+    """
+    SupervisedPool runs a function over many terms in worker processes,
+    enforcing a per-term time limit and a per-worker memory limit.
+
+    Attributes
+    ---------
+    workers : int
+        The number of worker processes. Defaults to 2.
+    timeout : float | None
+        The wall-clock limit, in seconds, for any single term.
+        None disables the limit.
+    max_rss_mb : float | None
+        The resident memory limit, in MiB, for a worker and its children.
+        None disables the limit.
+    poll_interval : float
+        How often, in seconds, the workers are checked against the limits.
+    cost : Callable | None
+        Estimates the cost of an item. If provided, `map` hands out
+        the most expensive items first. Otherwise, items are handed
+        out in the order they arrive.
+    """
+
+    workers: int = 2
+    timeout: float | None = None
+    max_rss_mb: float | None = None
+    poll_interval: float = 0.1
+    cost: Callable[[Any], float] | None = None
+    _func: Callable[[Any], Any] | None = field(
+        default=None, init=False, repr=False
+    )
+    _workers: list[_Worker] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _queue: deque[tuple[int, Any]] = field(
+        default_factory=deque, init=False, repr=False
+    )
+
+    def map(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+    ) -> Iterator[Any]:
+        """
+        Applies `func` to every item, yielding the outcomes in the
+        order of `items`. A failed item yields a `WorkerFailure` in its place.
+        Items are read lazily, unless a `cost` is provided,
+        in which case they are scheduled largest first.
+        """
+        tickets = (
+            enumerate(items)
+            if self.cost is None
+            else self.schedule(items, self.cost)
+        )
+        self.start(func)
+        try:
+            finished: dict[int, Any] = {}
+            upcoming = 0
+            exhausted = False
+            while True:
+                while not exhausted and self.backlog < 2 * self.workers:
+                    try:
+                        self.submit(*next(tickets))
+                    except StopIteration:
+                        exhausted = True
+                finished.update(self.collect())
+                while upcoming in finished:
+                    yield finished.pop(upcoming)
+                    upcoming += 1
+                if exhausted and not self.backlog and not finished:
+                    break
+        finally:
+            self.shutdown()
+
+    def schedule(
+        self, items: Iterable[Any], cost: Callable[[Any], float]
+    ) -> Iterator[tuple[int, Any]]:
+        """Orders the items largest first, logging the estimated
+        makespan against that of handing them out in order."""
+        ordered, costs = largest_first(items, cost)
+        fifo = simulate_makespan(costs, self.workers)
+        scheduled = simulate_makespan(
+            [costs[index] for index, _ in ordered], self.workers
+        )
+        logger.info(
+            "items=%d, workers=%d, estimated_makespan=%.4g,"
+            " fifo_makespan=%.4g, improvement=%.1f%%",
+            len(costs),
+            self.workers,
+            scheduled,
+            fifo,
+            100 * (1 - scheduled / fifo) if fifo else 0.0,
+        )
+        return iter(ordered)
+
+    def start(self, func: Callable[[Any], Any]) -> None:
+        """Starts the worker processes, each of which will run `func`."""
+        self._func = func
+        self._workers = [self._spawn() for _ in range(self.workers)]
+
+    def submit(self, ticket: int, item: Any) -> None:
+        """Queues `item` to be handed to the next idle worker."""
+        self._queue.append((ticket, item))
+
+    @property
+    def backlog(self) -> int:
+        """The number of items queued or in progress."""
+        in_progress = sum(
+            worker.ticket is not None for worker in self._workers
+        )
+        return len(self._queue) + in_progress
+
+    def collect(self, timeout: float | None = None) -> list[tuple[int, Any]]:
+        """
+        Waits up to `timeout` seconds for workers to finish, and returns
+        the ticket and outcome of each item that finished or failed.
+        """
+        self._dispatch()
+        busy = {
+            worker.conn: worker
+            for worker in self._workers
+            if worker.ticket is not None
+        }
+        finished: list[tuple[int, Any]] = []
+        ready = wait(
+            list(busy),
+            self.poll_interval if timeout is None else timeout,
+        )
+        for conn in ready:
+            worker = busy[conn]  # type: ignore[index]
+            try:
+                finished.append(conn.recv())  # type: ignore[union-attr]
+            except (EOFError, OSError):
+                continue  # The worker died; `_enforce_limits` reports it.
+            worker.ticket = None
+            worker.item = None
+        finished.extend(self._enforce_limits())
+        self._dispatch()
+        return finished
+
+    def shutdown(self) -> None:
+        """Stops every worker, killing any that do not exit promptly."""
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.process.join(timeout=1.0)
+            if worker.process.is_alive():
+                kill_process_tree(worker.process.pid)  # type: ignore[arg-type]
+                worker.process.join()
+            worker.conn.close()
+        self._workers = []
+        self._queue.clear()
+
+    def _spawn(self) -> _Worker:
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_serve, args=(self._func, child)
+        )
+        process.start()
+        child.close()
+        return _Worker(process, parent)
+
+    def _dispatch(self) -> None:
+        for worker in self._workers:
+            if not self._queue:
+                return
+            if worker.ticket is None:
+                worker.ticket, worker.item = self._queue.popleft()
+                worker.started = monotonic()
+                try:
+                    worker.conn.send((worker.ticket, worker.item))
+                except OSError:
+                    pass  # The worker died; `_enforce_limits` reports it.
+
+    def _enforce_limits(self) -> list[tuple[int, WorkerFailure]]:
+        failures: list[tuple[int, WorkerFailure]] = []
+        for index, worker in enumerate(self._workers):
+            if worker.ticket is None:
+                continue
+            reason = self._violation(worker)
+            if reason is None:
+                continue
+            logger.error(
+                "item=%s, reason=%s, action_undertaken=%s",
+                worker.item,
+                reason,
+                "Recycling worker",
+            )
+            failures.append(
+                (worker.ticket, WorkerFailure(worker.item, reason))
+            )
+            kill_process_tree(worker.process.pid)  # type: ignore[arg-type]
+            worker.process.join()
+            worker.conn.close()
+            self._workers[index] = self._spawn()
+        return failures
+
+    def _violation(self, worker: _Worker) -> str | None:
+        if not worker.process.is_alive():
+            return f"worker exited with code {worker.process.exitcode}"
+        if self.timeout is not None and (
+            monotonic() - worker.started > self.timeout
+        ):
+            return f"exceeded time limit of {self.timeout:g}s"
+        if self.max_rss_mb is not None and (
+            resident_memory(worker.process.pid)  # type: ignore[arg-type]
+            > self.max_rss_mb * MEBIBYTE
+        ):
+            return f"exceeded memory limit of {self.max_rss_mb:g} MiB"
+        return None
+
+
+@dataclass
+class ThreadedPool:
+    """
+    ThreadedPool runs a function over many terms in a pool of threads,
+    keeping up to `2 * workers` terms in flight, so that the next terms
+    are already underway while earlier outcomes are being consumed.
+
+    Attributes
+    ---------
+    workers : int
+        The number of threads. Defaults to 2.
+    """
+
+    workers: int = 2
+
+    def map(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+    ) -> Iterator[Any]:
+        """
+        Applies `func` to every item, yielding the outcomes in the
+        order of `items`. An item that raises yields a `WorkerFailure`
+        in its place. Items are read lazily.
+        """
+        with ThreadPoolExecutor(self.workers) as executor:
+            pending: deque[Future[Any]] = deque()
+            for item in items:
+                pending.append(executor.submit(_call, func, item))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def _call(func: Callable[[Any], Any], item: Any) -> Any:
+    try:
+        return func(item)
+    except Exception as e:
+        return WorkerFailure(item, f"{type(e).__name__}: {e}")
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from src.batch import LOCAL_LANE, BatchSciScraper, lane
+from src.docscraper import DocScraper
+from src.fetch import SciScraper, StagingFetcher
+from src.webscrapers import DimensionsScraper
+
+
+def staging(scraper, stager):
+    fetcher = mock.Mock(spec=StagingFetcher)
+    fetcher.scraper = scraper
+    fetcher.status = None
+    fetcher.side_effect = stager
+    return fetcher
+
+
+def test_lane_is_the_host_a_stager_requests():
+    dimensions = DimensionsScraper("https://app.dimensions.ai/discover")
+    words = Path("words/target_words.txt")
+    assert lane(staging(dimensions, None)) == "app.dimensions.ai"
+    assert lane(staging(DocScraper(words, words), None)) == "DocScraper"
+    assert lane(None) == LOCAL_LANE
+
+
+def test_batch_shares_the_scrape_and_runs_hosts_concurrently(monkeypatch):
+    scraper = mock.Mock(return_value=pd.DataFrame({"doi": ["10.1/a"]}))
+    barrier = threading.Barrier(2, timeout=5)
+
+    def stager(column):
+        def stage(dataframe):
+            barrier.wait()  # Only returns if both hosts run at once.
+            return dataframe.assign(**{column: [1.0]})
+
+        return stage
+
+    sciscrapers = {
+        "wordscore": SciScraper(
+            scraper, staging(mock.Mock(url="https://a.org"), stager("score"))
+        ),
+        "download": SciScraper(
+            scraper, staging(mock.Mock(url="https://b.org"), stager("got"))
+        ),
+    }
+    exported = {}
+    monkeypatch.setattr(
+        SciScraper,
+        "export_sciscrape_results",
+        staticmethod(
+            lambda dataframe, export_name, **kwargs: exported.update(
+                {str(export_name): dataframe.columns.tolist()}
+            )
+        ),
+    )
+    BatchSciScraper(sciscrapers)(Path("papers.csv"))
+    scraper.assert_called_once_with(Path("papers.csv"))
+    assert sorted(exported.values()) == [["doi", "got"], ["doi", "score"]]
+    assert all(
+        name.endswith(("_wordscore.csv", "_download.csv")) for name in exported
+    )
+
+
+def test_batch_raises_a_failed_branch_after_the_others_finish(monkeypatch):
+    scraper = mock.Mock(return_value=pd.DataFrame({"doi": ["10.1/a"]}))
+    finished = []
+    monkeypatch.setattr(
+        SciScraper,
+        "export_sciscrape_results",
+        staticmethod(
+            lambda dataframe, export_name, **kwargs: finished.append(
+                export_name
+            )
+        ),
+    )
+
+    def fail(dataframe):
+        raise ConnectionError("host unreachable")
+
+    sciscrapers = {
+        "citations": SciScraper(
+            scraper, staging(mock.Mock(url="https://a.org"), fail)
+        ),
+        "fastscore": SciScraper(scraper, None),
+    }
+    with pytest.raises(ConnectionError):
+        BatchSciScraper(sciscrapers)(Path("papers.csv"))
+    assert len(finished) == 1
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.columnar import ColumnarBuilder, TypedColumn
+from src.docscraper import DocumentResult
+
+
+def test_builder_casts_dataclass_fields():
+    builder = ColumnarBuilder()
+    builder.extend(
+        DocumentResult("10.1/a", n, 1, 100, n / 4, [("nudge", n)])
+        for n in range(3)
+    )
+    dataframe = builder.build()
+    expected = pd.DataFrame([
+        DocumentResult("10.1/a", n, 1, 100, n / 4, [("nudge", n)])
+        for n in range(3)
+    ])
+    assert dataframe.columns.tolist() == expected.columns.tolist()
+    assert dataframe["matching_terms"].dtype == np.int64
+    assert dataframe["wordscore"].dtype == np.float64
+    assert dataframe["doi_from_pdf"].dtype == "string"
+    assert dataframe["target_terms_top_3"].tolist() == [
+        [("nudge", 0)],
+        [("nudge", 1)],
+        [("nudge", 2)],
+    ]
+
+
+def test_builder_fills_columns_missing_from_some_rows():
+    builder = ColumnarBuilder(dtypes={})
+    builder.append({"a": 1})
+    builder.append({"b": "x"})
+    builder.append({"a": 2, "b": "y"})
+    dataframe = builder.build()
+    assert dataframe["a"].tolist()[::2] == [1.0, 2.0]
+    assert np.isnan(dataframe["a"][1])
+    assert dataframe["b"].tolist() == [None, "x", "y"]
+
+
+def test_builder_does_not_overflow_narrow_dtypes():
+    builder = ColumnarBuilder()
+    builder.extend([{"total_word_count": 12}, {"total_word_count": 40_000}])
+    assert builder.build()["total_word_count"].tolist() == [12, 40_000]
+
+
+def test_builder_takes_repeated_rows_with_extra_values():
+    builder = ColumnarBuilder(dtypes={})
+    builder.extend([{"score": 1.5}, {"score": 2.5}], (("title", "T"),))
+    dataframe = builder.build(index=[3, 3, 4], rows=np.array([0, 0, 1]))
+    assert dataframe.index.tolist() == [3, 3, 4]
+    assert dataframe["score"].tolist() == [1.5, 1.5, 2.5]
+    assert dataframe["title"].tolist() == ["T", "T", "T"]
+
+
+def test_column_keeps_mixed_values_as_objects():
+    column = TypedColumn()
+    for value in (1, None, 2.5, "three"):
+        column.append(value)
+    assert column.to_series().tolist() == [1.0, None, 2.5, "three"]
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from src.config import config
+from src.crawl import CitationCrawler, CitationGraph, to_csr
+from src.webscrapers import DimensionsScraper
+
+REFERENCES = {
+    "pub.1": ["pub.2", "pub.3"],
+    "pub.2": ["pub.3", "pub.4"],
+    "pub.3": ["pub.5"],
+    "pub.4": [],
+    "pub.5": ["pub.1"],
+}
+
+
+class StubDimensions:
+    def __init__(self) -> None:
+        self.queries: list[list[str]] = []
+
+    def obtain_batch(self, search_texts: list[str]) -> list[dict[str, object]]:
+        self.queries.append(list(search_texts))
+        return [
+            {
+                "internal_id": paper,
+                "doi": f"10.1/{paper}",
+                "title": paper.upper(),
+                "citations": REFERENCES[paper],
+            }
+            for paper in search_texts
+            if paper in REFERENCES
+        ]
+
+
+@pytest.fixture
+def seeds() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "internal_id": ["pub.1"],
+            "doi": ["10.1/pub.1"],
+            "title": ["PUB.1"],
+            "citations": [REFERENCES["pub.1"]],
+        }
+    )
+
+
+def test_to_csr_groups_edges_by_source():
+    indptr, indices = to_csr([2, 0, 2, 0], [1, 2, 0, 1], 3)
+    assert indptr.tolist() == [0, 2, 2, 4]
+    assert indices.tolist() == [2, 1, 1, 0]
+
+
+def test_crawl_expands_each_level_in_batches(seeds: pd.DataFrame):
+    scraper = StubDimensions()
+    crawler = CitationCrawler(scraper, depth=2, batch_size=1)  # type: ignore[arg-type]
+    dataframe = crawler(seeds)
+    assert scraper.queries == [["pub.2"], ["pub.3"]]
+    assert dataframe["internal_id"].tolist() == [
+        "pub.1",
+        "pub.2",
+        "pub.3",
+        "pub.4",
+        "pub.5",
+    ]
+    assert dataframe["depth"].tolist() == [0, 1, 1, 2, 2]
+    assert dataframe["expanded"].tolist() == [True, True, True, False, False]
+    assert dataframe["references"].tolist() == [2, 2, 1, 0, 0]
+    assert dataframe["cited_by"].tolist() == [0, 1, 2, 1, 1]
+
+
+def test_crawl_respects_limits(seeds: pd.DataFrame):
+    scraper = StubDimensions()
+    crawler = CitationCrawler(
+        scraper, depth=3, batch_size=1, max_nodes=3, max_requests=1  # type: ignore[arg-type]
+    )
+    dataframe = crawler(seeds)
+    assert len(scraper.queries) == 1
+    assert len(dataframe) == 3
+    assert dataframe["expanded"].tolist() == [True, True, False]
+
+
+def test_crawl_resumes_from_graph_file(seeds: pd.DataFrame, tmp_path: Path):
+    first = StubDimensions()
+    CitationCrawler(
+        first, graph_dir=tmp_path, depth=2, max_requests=0  # type: ignore[arg-type]
+    )(seeds)
+    assert not first.queries
+
+    second = StubDimensions()
+    crawler = CitationCrawler(
+        second, graph_dir=tmp_path, depth=2  # type: ignore[arg-type]
+    )
+    dataframe = crawler(seeds)
+    assert second.queries == [["pub.2", "pub.3"]]
+    assert dataframe["expanded"].sum() == 3
+
+    graph_file = crawler.graph_file(seeds)
+    assert [path.name for path in tmp_path.iterdir()] == [graph_file.name]
+    graph = CitationGraph.load(graph_file)
+    assert graph.ids == dataframe["internal_id"].tolist()
+    with np.load(graph_file) as saved:
+        assert saved["indptr"].tolist() == [0, 2, 4, 5, 5, 5]
+        assert saved["indices"].tolist() == [1, 2, 2, 3, 4]
+
+
+def test_crawls_of_other_papers_do_not_share_a_graph(
+    seeds: pd.DataFrame, tmp_path: Path
+):
+    crawler = CitationCrawler(
+        StubDimensions(), graph_dir=tmp_path, depth=1  # type: ignore[arg-type]
+    )
+    crawler(seeds)
+    others = pd.DataFrame({"internal_id": ["pub.4"], "citations": [[]]})
+    assert crawler(others)["internal_id"].tolist() == ["pub.4"]
+    assert crawler.graph_file(seeds) != crawler.graph_file(others)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_failed_batches_are_retried_by_the_next_crawl(
+    seeds: pd.DataFrame, tmp_path: Path
+):
+    failing = StubDimensions()
+    failing.obtain_batch = lambda search_texts: None  # type: ignore[method-assign]
+    crawler = CitationCrawler(
+        failing, graph_dir=tmp_path, depth=2  # type: ignore[arg-type]
+    )
+    assert crawler(seeds)["expanded"].tolist() == [True, False, False]
+
+    scraper = StubDimensions()
+    crawler.scraper = scraper  # type: ignore[assignment]
+    dataframe = crawler(seeds)
+    assert scraper.queries == [["pub.2", "pub.3"]]
+    assert dataframe["expanded"].sum() == 3
+
+
+def test_obtain_batch_survives_a_dropped_connection():
+    scraper = DimensionsScraper(config.dimensions_ai_dataset_url)
+    with mock.patch.object(
+        DimensionsScraper,
+        "get_docs",
+        side_effect=requests.ConnectionError("connection reset"),
+    ):
+        assert scraper.obtain_batch(["pub.1"]) is None
@@ -2,13 +2,20 @@ from __future__ import annotations
 
 import re
 from os import path
+from pathlib import Path
 from typing import Literal
 from unittest import mock
 
 import pytest
 
 from src.config import config
-from src.downloaders import BulkPDFScraper, DownloadReceipt, ImagesDownloader
+from src.docscraper import DocumentResult
+from src.downloaders import (
+    BulkPDFScraper,
+    DownloadReceipt,
+    ImagesDownloader,
+    ScoringDownloader,
+)
 
 
 def test_downloader_config(mock_bulkpdfscraper: BulkPDFScraper):
@@ -106,3 +113,91 @@ def test_format_download_link(
 ):
     output = mock_bulkpdfscraper.format_download_link(download_link)
     assert output == expected
+
+
+class StubScorer:
+    def __init__(self, doi: str | None):
+        self.doi = doi
+        self.sources: list = []
+
+    def obtain(self, search_text, document_id=None):
+        self.sources.append(search_text)
+        return DocumentResult(
+            self.doi, 3, 1, 100, 42.0, document_id=document_id
+        )
+
+    def failed(self, search_text, reason):
+        return DocumentResult(
+            None, 0, 0, 0, 0.0, document_id=search_text, failure=reason
+        )
+
+
+@pytest.mark.parametrize(
+    ("found_doi", "confirmed"),
+    (
+        ("10.1038/S41586-020-2003-7", True),
+        ("10.1000/elsewhere", False),
+        (None, False),
+    ),
+)
+def test_scoring_downloader_scores_in_memory(
+    tmp_path, found_doi: str | None, confirmed: bool
+):
+    scorer = StubScorer(found_doi)
+    downloader = ScoringDownloader(
+        config.downloader_url, export_dir=tmp_path, scorer=scorer
+    )
+    with (
+        mock.patch.object(
+            ScoringDownloader, "locate_paper", return_value="https://pdf"
+        ),
+        mock.patch("src.downloaders.client.get") as get,
+    ):
+        get.return_value.ok = True
+        get.return_value.content = b"%PDF-1.4 contents"
+        row = downloader.obtain("10.1038/s41586-020-2003-7")
+
+    assert scorer.sources == [b"%PDF-1.4 contents"]
+    assert row["success"] is True
+    assert row["wordscore"] == 42.0
+    assert row["document_id"] == "10.1038/s41586-020-2003-7"
+    assert row["doi_confirmed"] is confirmed
+    assert (
+        tmp_path / Path(row["filepath"]).name
+    ).read_bytes() == b"%PDF-1.4 contents"
+
+
+def test_scoring_downloader_records_missing_papers(tmp_path):
+    downloader = ScoringDownloader(
+        config.downloader_url, export_dir=tmp_path, scorer=StubScorer(None)
+    )
+    with mock.patch.object(
+        ScoringDownloader, "locate_paper", return_value=None
+    ):
+        row = downloader.obtain("10.1000/missing")
+
+    assert row["success"] is False
+    assert row["failure"] == "No download link found."
+    assert row["doi_confirmed"] is False
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_scoring_downloader_records_failed_downloads(tmp_path):
+    scorer = StubScorer(None)
+    downloader = ScoringDownloader(
+        config.downloader_url, export_dir=tmp_path, scorer=scorer
+    )
+    with (
+        mock.patch.object(
+            ScoringDownloader, "locate_paper", return_value="https://pdf"
+        ),
+        mock.patch("src.downloaders.client.get") as get,
+    ):
+        get.return_value.ok = False
+        get.return_value.status_code = 404
+        row = downloader.obtain("10.1000/gone")
+
+    assert scorer.sources == []
+    assert row["success"] is False
+    assert row["failure"] == "The download failed."
+    assert list(tmp_path.iterdir()) == []
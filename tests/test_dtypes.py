@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dtypes import STRING_DTYPE, optimal_dtype, optimize_dtypes
+from src.fetch import SciScraper
+
+
+@pytest.mark.parametrize(
+    ("values", "expected"),
+    (
+        ([1, 2, 3], np.int8),
+        ([0, 40_000], np.int32),
+        ([-129, 5], np.int16),
+        ([2**40, 0], np.int64),
+    ),
+)
+def test_integers_get_the_smallest_safe_dtype(values, expected):
+    assert optimal_dtype(pd.Series(values)) == expected
+
+
+def test_missing_hinted_integers_become_nullable():
+    values = pd.Series([3.0, np.nan, 40_000.0])
+    assert optimal_dtype(values, np.int64) == "Int32"
+    assert optimal_dtype(values) == np.float32
+
+
+def test_precise_floats_are_not_narrowed():
+    assert optimal_dtype(pd.Series([1e-50, 1.0])) is None
+    assert optimal_dtype(pd.Series([1e39, 1.0])) is None
+    assert optimal_dtype(pd.Series([0.1, 1 / 3])) == np.float32
+
+
+def test_strings_become_categoricals_or_arrow_strings():
+    journals = pd.Series(["Nature", "Science", "Nature", None] * 5)
+    titles = pd.Series([f"Paper {n}" for n in range(20)])
+    lists = pd.Series([["a"], ["b"]])
+    assert optimal_dtype(journals) == "category"
+    assert optimal_dtype(titles) == STRING_DTYPE
+    assert optimal_dtype(lists) is None
+
+
+def test_dataframe_casting_does_not_overflow():
+    dataframe = pd.DataFrame({
+        "times_cited": [40_000.0, np.nan],
+        "total_word_count": [70_000, 12],
+        "downloader": ["BulkPDFScraper", "BulkPDFScraper"],
+        "doi_confirmed": [True, None],
+    })
+    casted = SciScraper.dataframe_casting(dataframe)
+    assert casted["times_cited"].tolist() == [40_000, pd.NA]
+    assert casted["total_word_count"].tolist() == [70_000, 12]
+    assert casted["downloader"].dtype == "category"
+    assert casted["doi_confirmed"].dtype == "boolean"
+
+
+def test_optimize_dtypes_logs_memory_per_column(caplog):
+    with caplog.at_level("INFO", logger="sciscraper"):
+        optimize_dtypes(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}))
+    assert sum("column=" in record.message for record in caplog.records) == 2
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.exporters import export_dataframe, read_export
+from src.fetch import SciScraper
+
+
+@pytest.fixture
+def casted_dataframe() -> pd.DataFrame:
+    return SciScraper.dataframe_casting(
+        pd.DataFrame({
+            "title": ["Paper A", "Paper B", "Paper C", "Paper D"],
+            "pub_date": ["2019-05-01", "2020-01-02", "2020-03-04", None],
+            "journal_title": ["Nature", "Nature", "Nature", "Science"],
+            "times_cited": [40_000.0, None, 3.0, 12.0],
+            "wordscore": [0.5, 12.25, 3.0, 1.0],
+            "citations": [["pub.1"], [], ["pub.2", "pub.3"], None],
+        })
+    )
+
+
+@pytest.mark.parametrize("export_format", ("parquet", "feather"))
+def test_dtypes_survive_a_round_trip(
+    casted_dataframe: pd.DataFrame, tmp_path: Path, export_format: str
+):
+    export_path = export_dataframe(
+        casted_dataframe, tmp_path, "export", export_format
+    )
+    assert export_path == tmp_path / f"export.{export_format}"
+    round_tripped = read_export(export_path)
+    pd.testing.assert_series_equal(
+        round_tripped.dtypes, casted_dataframe.dtypes
+    )
+    assert round_tripped["times_cited"].tolist() == [40_000, pd.NA, 3, 12]
+    assert list(round_tripped["citations"][2]) == ["pub.2", "pub.3"]
+
+
+def test_parquet_is_partitioned_by_year(
+    casted_dataframe: pd.DataFrame, tmp_path: Path
+):
+    export_path = export_dataframe(
+        casted_dataframe, tmp_path, "export", "parquet", True
+    )
+    partitions = sorted(path.name for path in export_path.iterdir())
+    assert partitions == [
+        "pub_year=2019",
+        "pub_year=2020",
+        "pub_year=unknown",
+    ]
+    assert len(read_export(export_path)) == 4
+
+
+def test_unrepresentable_objects_are_exported_as_text(tmp_path: Path):
+    dataframe = pd.DataFrame({"target_terms_top_3": [[("nudge", 3)], None]})
+    export_path = export_dataframe(dataframe, tmp_path, "export", "feather")
+    assert read_export(export_path)["target_terms_top_3"].tolist() == [
+        "[('nudge', 3)]",
+        None,
+    ]
+
+
+def test_missing_pyarrow_falls_back_to_csv(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    monkeypatch.setattr("src.exporters.pa", None)
+    export_path = export_dataframe(
+        pd.DataFrame({"a": [1]}), tmp_path, "export", "parquet"
+    )
+    assert export_path.suffix == ".csv"
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from io import SEEK_END, BytesIO
+from pathlib import Path
+
+import pytest
+
+from src.benchmarks import token_agreement
+from src.docscraper import DocScraper
+from src.extractors import (
+    EXTRACTORS,
+    MemoryReader,
+    PdfplumberExtractor,
+    count_pages,
+    open_pdf,
+    split_pages,
+)
+from src.factories import SCRAPERS, select_extractor
+
+
+@pytest.mark.parametrize("name", list(EXTRACTORS))
+def test_extractors_read_every_page(name: str, test_pdf: str):
+    pages = EXTRACTORS[name]().extract_pages(test_pdf)
+    assert len(pages) == 6
+    assert "implicit" in " ".join(pages).lower()
+
+
+@pytest.mark.parametrize("name", list(EXTRACTORS))
+def test_extractors_read_page_ranges(name: str, test_pdf: str):
+    extractor = EXTRACTORS[name]()
+    pages = extractor.extract_pages(test_pdf)
+    assert extractor.extract_pages(test_pdf, range(2, 4)) == pages[2:4]
+
+
+@pytest.mark.parametrize(
+    ("name", "wrap"),
+    (
+        ("pdfplumber", memoryview),
+        *(
+            (name, wrap)
+            for name in ("pdfminer", "pypdfium2")
+            for wrap in (bytes, bytearray, memoryview, BytesIO)
+        ),
+    ),
+)
+def test_extractors_read_pdfs_in_memory(name: str, wrap, test_pdf: str):
+    extractor = EXTRACTORS[name]()
+    in_memory = wrap(Path(test_pdf).read_bytes())
+    assert extractor.extract_pages(in_memory) == extractor.extract_pages(
+        test_pdf
+    )
+
+
+def test_memory_reader_reads_and_seeks():
+    reader = MemoryReader(memoryview(b"%PDF-1.7 body %%EOF"))
+    assert reader.read(4) == b"%PDF"
+    assert reader.seek(-5, SEEK_END) == 14
+    assert reader.read() == b"%%EOF"
+    buffer = bytearray(3)
+    reader.seek(1)
+    assert reader.readinto(buffer) == 3
+    assert buffer == b"PDF"
+    reader.close()
+    assert reader.closed
+
+
+def test_open_pdf_maps_files_on_disk(test_pdf: str):
+    with open_pdf(test_pdf) as file:
+        assert isinstance(file, MemoryReader)
+        assert file.read(5) == b"%PDF-"
+
+
+def test_count_pages(test_pdf: str):
+    assert count_pages(test_pdf) == 6
+
+
+@pytest.mark.parametrize(
+    ("page_count", "chunks", "expected"),
+    (
+        (6, 3, [range(0, 2), range(2, 4), range(4, 6)]),
+        (7, 3, [range(0, 3), range(3, 6), range(6, 7)]),
+        (2, 8, [range(0, 1), range(1, 2)]),
+        (0, 4, []),
+    ),
+)
+def test_split_pages(page_count: int, chunks: int, expected: list[range]):
+    assert split_pages(page_count, chunks) == expected
+
+
+def test_page_parallel_extraction_keeps_page_order(test_pdf: str):
+    sequential = EXTRACTORS["pypdfium2"](page_threshold=None)
+    parallel = EXTRACTORS["pypdfium2"](page_threshold=2, page_workers=2)
+    assert parallel.extract_text(test_pdf) == sequential.extract_text(
+        test_pdf
+    )
+
+
+def test_docscraper_defaults_to_pdfplumber():
+    scraper = DocScraper("target.txt", "bycatch.txt")
+    assert isinstance(scraper.extractor, PdfplumberExtractor)
+    assert scraper.extractor.x_tolerance == 1
+    assert scraper.extractor.y_tolerance == 3
+
+
+def test_select_extractor():
+    scraper = SCRAPERS["pdf_lookup"].scraper
+    original = scraper.extractor  # type: ignore[union-attr]
+    try:
+        select_extractor("pypdfium2")
+        assert scraper.extractor.name == "pypdfium2"  # type: ignore[union-attr]
+    finally:
+        scraper.extractor = original  # type: ignore[union-attr]
+
+
+@pytest.mark.parametrize(
+    ("text", "reference", "expected"),
+    (
+        ("a b c", "a b c", 1.0),
+        ("a b", "c d", 0.0),
+        ("a a b", "a b b", 0.5),
+        ("", "", 1.0),
+    ),
+)
+def test_token_agreement(text: str, reference: str, expected: float):
+    assert token_agreement(text, reference) == expected
+
+
+def test_page_parallel_extraction_shares_pdfs_in_memory(test_pdf: str):
+    sequential = EXTRACTORS["pypdfium2"](page_threshold=None)
+    parallel = EXTRACTORS["pypdfium2"](page_threshold=2, page_workers=2)
+    in_memory = Path(test_pdf).read_bytes()
+    assert parallel.extract_text(in_memory) == sequential.extract_text(
+        test_pdf
+    )
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import logging
-
+import weakref
+from collections.abc import Iterator
 from typing import Literal
 from unittest import mock
 
@@ -14,10 +15,12 @@ from src.docscraper import DocScraper
 from src.downloaders import Downloader
 from src.factories import SCISCRAPERS
 from src.factories import read_factory
+from src.fetch import Fetcher
 from src.fetch import SciScraper
 from src.fetch import ScrapeFetcher
 from src.fetch import StagingFetcher
 from src.log import logger
+from src.serials import ArchiveMember
 from src.webscrapers import WebScraper
 
 
@@ -156,3 +159,62 @@ def test_fetch_with_staged_reference_empty_tuple():
     scraper = mock.Mock()
     df = StagingFetcher(scraper, stager=None).fetch_with_staged_reference(staged_terms)  # type: ignore
     assert df.empty
+
+
+def test_collect_keeps_dict_rows_whole():
+    row = {"success": True, "wordscore": 42.0}
+    assert Fetcher.collect(row) == [row]
+
+
+def test_fetch_keeps_scoring_downloader_rows_whole():
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda doi: {
+        "success": True,
+        "wordscore": 42.0,
+        "doi_confirmed": doi == "10.1/a",
+    }
+    dataframe = StagingFetcher(scraper, stager=None).fetch(  # type: ignore
+        ["10.1/a", "10.1/b"]
+    )
+    assert dataframe.columns.tolist() == [
+        "success",
+        "wordscore",
+        "doi_confirmed",
+    ]
+    assert dataframe["doi_confirmed"].tolist() == [True, False]
+
+
+def test_fetch_scrapes_repeated_terms_once():
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda term: {"term": term}
+    fetcher = StagingFetcher(scraper, stager=None)  # type: ignore
+    df = fetcher.fetch(iter(["a", "b", "a", "c", "b", "a"]))
+    assert [call.args[0] for call in scraper.obtain.call_args_list] == [
+        "a",
+        "b",
+        "c",
+    ]
+    assert list(df.index) == [0, 1, 2, 3, 4, 5]
+    assert list(df["term"]) == ["a", "b", "a", "c", "b", "a"]
+
+
+def test_fetch_does_not_deduplicate_unhashable_terms():
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda term: {"term": term[0]}
+    fetcher = StagingFetcher(scraper, stager=None)  # type: ignore
+    df = fetcher.fetch([["a"], ["a"]])
+    assert scraper.obtain.call_count == 2
+    assert list(df["term"]) == ["a", "a"]
+
+
+def test_deduplicate_does_not_hold_on_to_archive_members():
+    def members() -> Iterator[ArchiveMember]:
+        for name in ("a", "b", "a", "c"):
+            yield ArchiveMember(f"papers.zip!/{name}.pdf", bytes(1024))
+
+    occurrences: list[list[int]] = []
+    terms = Fetcher.deduplicate(members(), occurrences)
+    refs = [weakref.ref(next(terms)) for _ in range(3)]
+    # Only the term the generator last yielded is still referenced.
+    assert [ref() is None for ref in refs] == [True, True, False]
+    assert occurrences == [[0, 2], [1], [3]]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import pickle
+from functools import partial
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from src.docscraper import DocumentResult
+from src.fetch import ScrapeFetcher, StagingFetcher
+from src.journal import MISSING, RunJournal, completed
+from src.serials import ArchiveMember
+from src.stagers import stage_from_series
+
+
+def test_journal_reads_back_records_and_drops_a_torn_one(tmp_path):
+    location = tmp_path / "run.journal"
+    with RunJournal.load(location) as journal:
+        journal.record("a", [{"term": "a"}])
+        journal.record("b", [])
+    with open(location, "ab") as file:
+        file.write(pickle.dumps(("c", [{"term": "c"}]))[:-3])
+    journal = RunJournal.load(location)
+    assert journal.lookup("a") == [{"term": "a"}]
+    assert journal.lookup("b") == []
+    assert journal.lookup("c") is MISSING
+    assert location.stat().st_size == len(
+        pickle.dumps(("a", [{"term": "a"}]), pickle.HIGHEST_PROTOCOL)
+    ) + len(pickle.dumps(("b", []), pickle.HIGHEST_PROTOCOL))
+
+
+def test_journal_skips_failed_results(tmp_path):
+    failed = DocumentResult("10.1/a", 0, 0, 0, 0.0, [], failure="timeout")
+    with RunJournal.load(tmp_path / "run.journal") as journal:
+        journal.record("a", [failed])
+        journal.record(["unhashable"], [{"term": "x"}])
+    assert not RunJournal.load(tmp_path / "run.journal").entries
+
+
+def test_fetch_resumes_from_the_first_incomplete_term(tmp_path):
+    scraper = mock.Mock()
+    calls: list[str] = []
+    failures = ["c"]
+
+    def obtain(term):
+        calls.append(term)
+        if term in failures:
+            failures.remove(term)
+            raise ConnectionError("connection lost")
+        return {"term": term}
+
+    scraper.obtain.side_effect = obtain
+    fetcher = StagingFetcher(scraper, stager=None, journal_dir=tmp_path)  # type: ignore
+    with pytest.raises(ConnectionError):
+        fetcher.fetch(["a", "b", "c", "d"])
+    assert len(list(tmp_path.iterdir())) == 1
+
+    calls.clear()
+    dataframe = fetcher.fetch(["a", "b", "c", "d"])
+    assert calls == ["c", "d"]
+    assert dataframe["term"].tolist() == ["a", "b", "c", "d"]
+    assert not list(tmp_path.iterdir())
+
+
+def test_journals_are_kept_apart_by_input(tmp_path):
+    failures = ["10.1/bb"]
+
+    def obtain(doi):
+        if doi in failures:
+            failures.remove(doi)
+            raise ConnectionError("connection lost")
+        return {"wordscore": len(doi)}
+
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = obtain
+    fetcher = StagingFetcher(
+        scraper,
+        partial(stage_from_series, column="doi"),
+        journal_dir=tmp_path,
+        name="abstracts",
+    )
+    first = pd.DataFrame({"doi": ["10.1/a", "10.1/bb"]})
+    with pytest.raises(ConnectionError):
+        fetcher(first)
+    fetcher(pd.DataFrame({"doi": ["10.1/c"]}))
+    assert [path.name for path in tmp_path.iterdir()] == [
+        f"abstracts_{fetcher.run_key(first)}.journal"
+    ]
+
+    scraper.obtain.reset_mock()
+    assert fetcher(first)["wordscore"].tolist() == [6, 7]
+    scraper.obtain.assert_called_once_with("10.1/bb")
+    assert not list(tmp_path.iterdir())
+
+
+def test_journal_records_archive_members_by_key(tmp_path):
+    member = ArchiveMember("papers.zip!/a.pdf", b"%PDF-1.4 contents")
+    with RunJournal.load(tmp_path / "run.journal") as journal:
+        journal.record(member, [{"wordscore": 1.0}])
+    assert b"%PDF" not in (tmp_path / "run.journal").read_bytes()
+    journal = RunJournal.load(tmp_path / "run.journal")
+    assert (
+        journal.lookup(ArchiveMember("papers.zip!/a.pdf", b"%PDF-1.4 changed"))
+        is MISSING
+    )
+    assert journal.lookup(member) == [{"wordscore": 1.0}]
+
+
+def test_fetch_resumes_when_the_last_term_is_journaled(tmp_path):
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda term: {"term": term}
+    fetcher = StagingFetcher(scraper, stager=None, journal_dir=tmp_path)  # type: ignore
+    with fetcher.open_journal() as journal:  # type: ignore[union-attr]
+        journal.record("a", [{"term": "a"}])
+        journal.record("c", [{"term": "c"}])
+
+    dataframe = fetcher.fetch(["a", "b", "c"])
+    scraper.obtain.assert_called_once_with("b")
+    assert dataframe["term"].tolist() == ["a", "b", "c"]
+    assert not list(tmp_path.iterdir())
+
+
+def test_carried_columns_keep_a_journaled_last_term(tmp_path):
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda abstract: {"wordscore": 1.0}
+    fetcher = ScrapeFetcher(
+        scraper,
+        lambda target: [("a new abstract", "New"), ("an old abstract", "Old")],
+        carried_columns=("title",),
+        journal_dir=tmp_path / "journals",
+    )
+    target = tmp_path / "papers.csv"
+    target.write_text("abstract,title\n")
+    with fetcher.open_journal(fetcher.run_key(target)) as journal:  # type: ignore[union-attr]
+        journal.record("an old abstract", [{"wordscore": 2.0}])
+
+    dataframe = fetcher(target)
+    assert dataframe["title"].tolist() == ["New", "Old"]
+    assert dataframe["wordscore"].tolist() == [1.0, 2.0]
+    scraper.obtain.assert_called_once_with("a new abstract")
+
+
+def test_failed_dict_rows_are_not_completed():
+    assert not completed([{"success": False, "failure": "No download link"}])
+    assert not completed([{"success": True, "failure": "ValueError: bad pdf"}])
+    assert completed([{"success": True, "failure": None, "wordscore": 1.0}])
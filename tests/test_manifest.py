@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import shutil
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src.docscraper import DocumentResult
+from src.fetch import ScrapeFetcher
+from src.manifest import Manifest, hash_file
+from src.serials import serialize_from_directory
+
+
+@pytest.fixture()
+def document_result():
+    return DocumentResult(
+        doi_from_pdf="10.1000/12345",
+        matching_terms=3,
+        bycatch_terms=1,
+        total_word_count=100,
+        wordscore=0.5,
+        target_terms_top_3=[("nudge", 2), ("choice", 1)],
+        bycatch_terms_top_3=[("soil", 1)],
+    )
+
+
+@pytest.fixture()
+def library(tmp_path: Path, test_pdf: str):
+    papers = tmp_path / "papers"
+    papers.mkdir()
+    shutil.copy(test_pdf, papers / "first.pdf")
+    shutil.copy(test_pdf, papers / "second.pdf")
+    return papers
+
+
+def test_hash_file_is_stable(library: Path):
+    assert hash_file(library / "first.pdf") == hash_file(
+        library / "second.pdf"
+    )
+
+
+def test_manifest_round_trip(
+    tmp_path: Path, library: Path, document_result: DocumentResult
+):
+    location = tmp_path / "manifest.jsonl"
+    with Manifest.load(location) as manifest:
+        manifest.record(library / "first.pdf", document_result)
+    reloaded = Manifest.load(location)
+    assert reloaded.lookup(library / "first.pdf") == document_result
+
+
+def test_manifest_detects_changed_file(
+    tmp_path: Path, library: Path, document_result: DocumentResult
+):
+    manifest = Manifest(tmp_path / "manifest.jsonl")
+    pdf = library / "first.pdf"
+    manifest.record(pdf, document_result)
+    pdf.write_bytes(pdf.read_bytes() + b"\n%%EOF\n")
+    assert manifest.lookup(pdf) is None
+
+
+def test_manifest_ignores_touched_but_unchanged_file(
+    tmp_path: Path, library: Path, document_result: DocumentResult
+):
+    manifest = Manifest(tmp_path / "manifest.jsonl")
+    pdf = library / "first.pdf"
+    manifest.record(pdf, document_result)
+    stat = pdf.stat()
+    os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert manifest.lookup(pdf) == document_result
+
+
+def test_manifest_finds_renamed_file(
+    tmp_path: Path, library: Path, document_result: DocumentResult
+):
+    manifest = Manifest(tmp_path / "manifest.jsonl")
+    manifest.record(library / "first.pdf", document_result)
+    renamed = library / "renamed.pdf"
+    (library / "first.pdf").rename(renamed)
+    assert manifest.lookup(renamed) == document_result
+
+
+def test_fetch_incrementally_skips_unchanged_files(
+    tmp_path: Path, library: Path, document_result: DocumentResult
+):
+    scraper = mock.Mock()
+    scraper.obtain.return_value = document_result
+    fetcher = ScrapeFetcher(
+        scraper,
+        serialize_from_directory,
+        manifest_file=tmp_path / "manifest.jsonl",
+    )
+    first = fetcher(library)
+    assert scraper.obtain.call_count == 2
+
+    scraper.obtain.reset_mock()
+    second = fetcher(library)
+    scraper.obtain.assert_not_called()
+    assert first.equals(second)
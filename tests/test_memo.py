@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from functools import partial
+from unittest import mock
+
+import pandas as pd
+
+from src.fetch import ScrapeFetcher
+from src.memo import strategy_name
+from src.serials import stream_from_csv
+
+
+def test_strategy_name_is_stable_for_partials():
+    assert (
+        strategy_name(partial(stream_from_csv, column="doi"))
+        == "src.serials.stream_from_csv(){'column': 'doi'}"
+    )
+
+
+def test_scrape_fetcher_memoizes_by_file_content(tmp_path):
+    target = tmp_path / "papers.txt"
+    target.write_text("a\nb\n")
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda term: {"term": term, "hits": [1, 2]}
+    fetcher = ScrapeFetcher(
+        scraper,
+        lambda path: path.read_text().split(),
+        memo_dir=tmp_path / "memo",
+    )
+    first = fetcher(target)
+    assert scraper.obtain.call_count == 2
+
+    pd.testing.assert_frame_equal(fetcher(target), first)
+    assert scraper.obtain.call_count == 2
+
+    fetcher.force = True
+    fetcher(target)
+    assert scraper.obtain.call_count == 4
+
+    fetcher.force = False
+    target.write_text("a\nc\n")
+    assert fetcher(target)["term"].tolist() == ["a", "c"]
+    assert scraper.obtain.call_count == 6
+    assert len(list((tmp_path / "memo").iterdir())) == 2
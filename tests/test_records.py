@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from src.docscraper import DocumentResult, FreqDistAndCount
+from src.doifrompdf import DOIFromPDFResult
+from src.downloaders import DownloadReceipt
+from src.webscrapers import WebScrapeResult
+
+RECORDS = (
+    DocumentResult("10.1/a", 3, 1, 100, 2.5, [("nudge", 3)], failure=None),
+    FreqDistAndCount(3, [("nudge", 3)]),
+    DOIFromPDFResult("10.1/a", "doi", True),
+    DownloadReceipt("BulkPDFScraper", True, "exports/a.pdf"),
+    WebScrapeResult("Title", "2020", "10.1/a", "pub.1", "Journal", 4),
+)
+
+
+@pytest.mark.parametrize("record", RECORDS)
+def test_records_have_no_instance_dict(record: object):
+    assert not hasattr(record, "__dict__")
+
+
+@pytest.mark.parametrize("record", RECORDS)
+def test_records_pickle_as_field_values(record: object):
+    pickled = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+    assert pickle.loads(pickled) == record
+    assert b"journal_title" not in pickled
+    assert b"filepath" not in pickled
+
+
+def test_repeated_strings_are_interned():
+    first = WebScrapeResult(
+        "A", "20" + "20", "10.1/a", None, "".join(["Jour", "nal"]), None
+    )
+    second = WebScrapeResult(
+        "B", "".join(["20", "20"]), "10.1/b", None, "Jour" + "nal", None
+    )
+    assert first.journal_title is second.journal_title
+    assert first.pub_date is second.pub_date
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.benchmarks import benchmark_scheduling, mixed_size_costs
+from src.scheduling import file_size, largest_first, simulate_makespan
+from src.workers import SupervisedPool
+
+
+def identity(item: float) -> float:
+    return item
+
+
+@pytest.mark.parametrize(
+    ("costs", "workers", "expected"),
+    (
+        ([1, 1, 1, 1], 2, 2),
+        ([1, 1, 1, 5], 2, 6),
+        ([5, 1, 1, 1], 2, 5),
+        ([3, 3, 2, 2, 2], 2, 7),
+        ([], 4, 0),
+    ),
+)
+def test_simulate_makespan(costs, workers, expected):
+    assert simulate_makespan(costs, workers) == expected
+
+
+def test_largest_first_keeps_original_positions():
+    ordered, costs = largest_first(["bb", "a", "ccc"], len)
+    assert ordered == [(2, "ccc"), (0, "bb"), (1, "a")]
+    assert costs == [2, 1, 3]
+
+
+def test_file_size(tmp_path: Path):
+    pdf = tmp_path / "paper.pdf"
+    pdf.write_bytes(b"0" * 128)
+    assert file_size(pdf) == 128
+    assert file_size(tmp_path / "missing.pdf") == 0
+    assert file_size(None) == 0
+
+
+def test_scheduled_pool_yields_in_original_order():
+    pool = SupervisedPool(workers=2, cost=float)
+    items = [1.0, 5.0, 2.0, 4.0, 3.0]
+    assert list(pool.map(identity, items)) == items
+
+
+def test_largest_first_beats_fifo_on_mixed_sizes():
+    results = benchmark_scheduling(
+        mixed_size_costs(), workers=4, seconds_per_run=None
+    )
+    assert (
+        results.loc["largest_first", "estimated_makespan"]
+        < results.loc["fifo", "estimated_makespan"]
+    )
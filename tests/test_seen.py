@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from functools import partial
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from src.docscraper import DocumentResult
+from src.factories import SCRAPERS, STAGERS
+from src.fetch import ScrapeFetcher, StagingFetcher
+from src.manifest import Manifest
+from src.seen import SeenSet, bloom_parameters
+from src.serials import serialize_from_directory
+from src.stagers import stage_from_series
+
+
+def test_bloom_parameters_match_capacity_and_error_rate():
+    bits, hashes = bloom_parameters(1_000_000, 0.01)
+    assert bits % 8 == 0
+    assert 9_500_000 < bits < 9_700_000
+    assert hashes == 7
+
+
+def test_seen_set_persists_terms_across_runs(tmp_path):
+    location = tmp_path / "downloaded.bloom"
+    with SeenSet(location, capacity=1_000, error_rate=0.01) as seen:
+        for n in range(500):
+            seen.add(f"10.1000/{n}")
+        assert "10.1000/7" in seen
+    with SeenSet(location) as seen:
+        assert "10.1000/499" in seen
+        assert "10.1000/ABC" not in seen
+        assert "10.1000/7".upper() in seen
+        assert all(f"10.2000/{n}" not in seen for n in range(2_000))
+        assert None not in seen
+
+
+def test_fetch_skips_seen_terms_unless_forced(tmp_path):
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda doi: {"doi": doi, "success": True}
+    seen = SeenSet(tmp_path / "downloaded.bloom", capacity=100)
+    fetcher = StagingFetcher(scraper, stager=None, seen=seen)  # type: ignore
+    fetcher.fetch(["10.1/a", "10.1/b"])
+    scraper.obtain.reset_mock()
+
+    dataframe = fetcher.fetch(["10.1/a", "10.1/c"])
+    scraper.obtain.assert_called_once_with("10.1/c")
+    assert dataframe["doi"].tolist() == ["10.1/c"]
+    assert dataframe.index.tolist() == [1]
+
+    fetcher.force = True
+    scraper.obtain.reset_mock()
+    fetcher.fetch(["10.1/a"])
+    scraper.obtain.assert_called_once_with("10.1/a")
+
+
+@pytest.mark.parametrize(
+    "dois", (["10.1/new", "10.1/old"], ["10.1/old"], ["10.1/old", "10.1/old"])
+)
+def test_fetch_lines_up_results_when_the_last_term_is_seen(tmp_path, dois):
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda doi: {"success": True}
+    seen = SeenSet(tmp_path / "download.bloom", capacity=100)
+    with seen:
+        seen.add("10.1/old")
+    fetcher = StagingFetcher(
+        scraper, partial(stage_from_series, column="doi"), seen=seen
+    )
+    dataframe = fetcher(pd.DataFrame({"doi": dois}))
+    assert dataframe["doi"].tolist() == dois
+    assert dataframe.reindex(columns=["success"])[
+        "success"
+    ].notna().tolist() == [doi == "10.1/new" for doi in dois]
+
+
+def test_manifest_scans_rescore_changed_files_despite_seen_sets(tmp_path):
+    papers = tmp_path / "papers"
+    papers.mkdir()
+    paper = papers / "a.pdf"
+    paper.write_bytes(b"%PDF-1.4 first")
+    scraper = mock.Mock()
+    scraper.obtain.return_value = DocumentResult("10.1/a", 3, 1, 100, 0.5)
+    fetcher = ScrapeFetcher(
+        scraper,
+        lambda target: list(map(str, serialize_from_directory(target))),
+        manifest_file=tmp_path / "manifest.jsonl",
+        seen=SeenSet(tmp_path / "pdf_lookup.bloom", capacity=100),
+    )
+    assert fetcher(papers)["doi_from_pdf"].tolist() == ["10.1/a"]
+
+    paper.write_bytes(b"%PDF-1.4 edited in place")
+    scraper.obtain.return_value = DocumentResult("10.1/b", 3, 1, 100, 0.5)
+    assert fetcher(papers)["doi_from_pdf"].tolist() == ["10.1/b"]
+    entries = Manifest.load(tmp_path / "manifest.jsonl").entries
+    assert entries[str(paper.resolve())].result["doi_from_pdf"] == "10.1/b"
+
+
+def test_factories_give_each_fetcher_a_seen_set_of_its_own():
+    assert SCRAPERS["pdf_lookup"].seen is None
+    assert SCRAPERS["archive_lookup"].seen is None
+    locations = [
+        fetcher.seen.location
+        for fetcher in (*SCRAPERS.values(), *STAGERS.values())
+        if fetcher.seen is not None
+    ]
+    assert len(locations) == len(set(locations)) == 4
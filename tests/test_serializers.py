@@ -1,8 +1,23 @@
+import tarfile
+import zipfile
+from io import BytesIO
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
-from src.serials import serialize_from_csv, serialize_from_directory
+from src.docscraper import DocScraper
+from src.fetch import ScrapeFetcher
+from src.serials import (
+    ArchiveMember,
+    clean_any_nested_columns,
+    clean_nested_series,
+    serialize_from_archive,
+    serialize_from_csv,
+    serialize_from_directory,
+    stream_from_csv,
+)
+from src.workers import SupervisedPool, WorkerFailure
 
 
 @pytest.mark.skip
@@ -56,3 +71,113 @@ def test_serialize_from_directory():
     output = serialize_from_directory(test_path)
 
     assert output == test_path
+
+
+@pytest.fixture()
+def archived_pdfs(tmp_path: Path, test_pdf: str) -> Path:
+    contents = Path(test_pdf).read_bytes()
+    with zipfile.ZipFile(tmp_path / "papers.zip", "w") as zipped:
+        zipped.writestr("2021/smith.pdf", contents)
+        zipped.writestr("2021/notes.txt", "not a paper")
+    with tarfile.open(tmp_path / "papers.tar.gz", "w:gz") as tarball:
+        info = tarfile.TarInfo("2022/jones.PDF")
+        info.size = len(contents)
+        tarball.addfile(info, BytesIO(contents))
+    return tmp_path
+
+
+def test_serialize_from_archive_streams_members(
+    archived_pdfs: Path, test_pdf: str
+):
+    members = serialize_from_archive(archived_pdfs)
+    assert not isinstance(members, list)
+    members = list(members)
+    assert [str(member) for member in members] == [
+        f"{archived_pdfs / 'papers.tar.gz'}!/2022/jones.PDF",
+        f"{archived_pdfs / 'papers.zip'}!/2021/smith.pdf",
+    ]
+    assert all(
+        member.data == Path(test_pdf).read_bytes() for member in members
+    )
+
+
+def member_size(member: ArchiveMember) -> int:
+    return len(member.data)
+
+
+def test_archive_members_run_in_worker_processes(archived_pdfs: Path):
+    members = list(serialize_from_archive(archived_pdfs / "papers.zip"))
+    pool = SupervisedPool(workers=2)
+    assert list(pool.map(member_size, iter(members))) == [len(members[0].data)]
+    failure = ScrapeFetcher(DocScraper("", "", True), list).recover(
+        WorkerFailure(members[0], "exceeded time limit of 300s")
+    )
+    assert failure.document_id == members[0].identifier  # type: ignore[union-attr]
+
+
+@pytest.mark.parametrize("engine", ("c", "pyarrow"))
+def test_stream_from_csv_reads_columns_in_one_pass(engine: str):
+    rows = list(
+        stream_from_csv(
+            "tests/test_dirs/test_example_file_1.csv",
+            "authors",
+            carry=("title", "times_cited"),
+            engine=engine,
+            chunk_rows=2,
+        )
+    )
+    assert rows == [
+        ("Darius Lettsgetham", "Fake News and Misinformation", "5"),
+        ("Anne Elon-Ux", "Prosocial Eurythmics", "N/A"),
+        ("I. Ron Butterfly", "Gamification on Social Media", "N/A"),
+        (
+            "Jujubee",
+            "Memoirs of a Gaysha, Jujubee's Journey, I'm Still Here",
+            "9001",
+        ),
+    ]
+
+
+def test_stream_from_csv_is_lazy():
+    terms = stream_from_csv("tests/test_dirs/test_example_file_1.csv")
+    assert next(iter(terms)) == "10.1000/12345"
+
+
+class SkipsSecondTerm:
+    def obtain(self, search_text: str) -> dict[str, str] | None:
+        return None if search_text == "b" else {"scored": search_text.upper()}
+
+
+def test_carried_columns_stay_aligned_with_results():
+    fetcher = ScrapeFetcher(
+        SkipsSecondTerm(),  # type: ignore[arg-type]
+        lambda _: iter([("a", "A paper"), ("b", "B paper"), ("c", "C paper")]),
+        carried_columns=("title",),
+    )
+    dataframe = fetcher(Path("export.csv"))
+    assert dataframe.to_dict("records") == [
+        {"scored": "A", "title": "A paper"},
+        {"scored": "C", "title": "C paper"},
+    ]
+
+
+def test_clean_any_nested_columns_keeps_row_order():
+    cells = [
+        "Jujubee",
+        "{'authors': 'I. Ron Butterfly', 'authors_id': 28252}",
+        '{"authors": "Anne Elon-Ux"}',
+        "{'uni_id': '0600055000200019000'}",
+        "Darius Lettsgetham",
+    ]
+    assert clean_any_nested_columns(cells, "authors") == [
+        "Jujubee",
+        "I. Ron Butterfly",
+        "Anne Elon-Ux",
+        "",
+        "Darius Lettsgetham",
+    ]
+
+
+def test_nested_cells_are_never_evaluated_as_code():
+    cells = pd.Series(["{__import__('os').getcwd(): 1}", "{not a dict"])
+    assert clean_nested_series(cells, "authors").to_list() == ["", ""]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.columnar import ColumnarBuilder
+from src.fetch import StagingFetcher
+from src.sinks import ResultSink, stale
+
+
+def test_sink_reads_batches_back_in_order(tmp_path):
+    sink = ResultSink(tmp_path / "a.part", 2)
+    sink.write(pd.DataFrame({"doi": ["10.1/a", "10.1/b"], "count": [1, 2]}))
+    sink.write(pd.DataFrame({"doi": ["10.1/c"], "title": ["C"]}))
+    assert sink.rows == 3
+    assert len(list(sink.location.iterdir())) == 2
+    dataframe = sink.read()
+    assert dataframe["doi"].tolist() == ["10.1/a", "10.1/b", "10.1/c"]
+    assert dataframe["title"].isna().tolist() == [True, True, False]
+    sink.discard()
+    assert not sink.location.exists()
+
+
+def test_builder_spills_to_sink_and_reads_back(tmp_path):
+    rows = [{"doi": f"10.1/{n}", "citations": n * 10} for n in range(7)]
+    spilled = ColumnarBuilder(sink=ResultSink(tmp_path / "b.part", 3))
+    spilled.extend(rows)
+    in_memory = ColumnarBuilder()
+    in_memory.extend(rows)
+    assert spilled.sink.rows == 6
+    take = np.array([6, 0, 0, 3])
+    pd.testing.assert_frame_equal(
+        spilled.build(index=[0, 1, 2, 3], rows=take),
+        in_memory.build(index=[0, 1, 2, 3], rows=take),
+    )
+
+
+def test_spilled_results_round_trip_exactly(tmp_path):
+    rows = [
+        {
+            "doi": "N/A" if n % 3 else f"10.1/{n}",
+            "citations": [f"pub.{n}", "N/A"][: n % 3],
+            "times_cited": n,
+            "wordscore": n / 2,
+        }
+        for n in range(7)
+    ]
+    spilled = ColumnarBuilder(sink=ResultSink(tmp_path / "c.part", 2))
+    spilled.extend(rows)
+    in_memory = ColumnarBuilder()
+    in_memory.extend(rows)
+    dataframe = spilled.build()
+    pd.testing.assert_frame_equal(dataframe, in_memory.build())
+    assert dataframe["citations"][4] == ["pub.4"]
+    assert dataframe["doi"][1] == "N/A"
+
+
+def test_fetch_removes_journal_only_when_it_completes(tmp_path):
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda term: {"term": term}
+    fetcher = StagingFetcher(scraper, stager=None, sink_dir=tmp_path)  # type: ignore
+    assert fetcher.fetch(["a", "b", "a"])["term"].tolist() == ["a", "b", "a"]
+    assert not list(tmp_path.iterdir())
+
+    scraper.obtain.side_effect = RuntimeError("connection lost")
+    with pytest.raises(RuntimeError):
+        fetcher.fetch(["c"])
+    assert [path.suffix for path in tmp_path.iterdir()] == [".part"]
+
+
+def test_recover_reads_back_a_failed_runs_batches(tmp_path):
+    sink = ResultSink.open(tmp_path, "260101_Scraper")
+    sink.write(pd.DataFrame({"doi": ["10.1/a", "10.1/b"]}))
+    sink.write(pd.DataFrame({"doi": ["10.1/c"]}))
+    Path(sink.location, "00002.tmp").write_bytes(b"cut short")
+    recovered = ResultSink.recover(sink.location)
+    assert recovered.rows == 3
+    assert recovered.read()["doi"].tolist() == ["10.1/a", "10.1/b", "10.1/c"]
+
+
+def test_fetch_clears_stale_sinks_it_journals(tmp_path):
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda term: {"term": term}
+    name = type(scraper).__name__
+    old = ResultSink.open(tmp_path, f"260101_{name}")
+    old.write(pd.DataFrame({"term": ["a"]}))
+    other = ResultSink.open(tmp_path, "260101_OtherScraper")
+    for location in (old.location, other.location):
+        for path in (location, *location.iterdir()):
+            os.utime(path, (0, 0))
+    assert stale(tmp_path, name) == [old.location]
+
+    unjournaled = StagingFetcher(scraper, stager=None, sink_dir=tmp_path)  # type: ignore
+    unjournaled.fetch(["a"])
+    assert old.location.exists()
+
+    journaled = StagingFetcher(
+        scraper,  # type: ignore
+        stager=None,
+        sink_dir=tmp_path,
+        journal_dir=tmp_path / "journals",
+    )
+    journaled.fetch(["a"])
+    assert not old.location.exists()
+    assert other.location.exists()
@@ -1,7 +1,16 @@
+from unittest import mock
+
+import numpy as np
 from pandas import DataFrame
 import pytest
 
-from src.stagers import stage_from_series
+from src.fetch import StagingFetcher
+from src.stagers import (
+    StagedReference,
+    stage_from_series,
+    stage_with_reference,
+    stream_cells,
+)
 
 
 @pytest.mark.skip
@@ -40,3 +49,86 @@ def test_stage_from_series(mock_dataframe: DataFrame, column, expected):
     output = stage_from_series(mock_dataframe, column=column)
     assert isinstance(output, list)
     assert output == expected
+
+
+@pytest.fixture
+def prior_dataframe() -> DataFrame:
+    return DataFrame(
+        {
+            "title": ["apple", "orange", None],
+            "doi": ["10.1000/1", None, "{'doi': '10.1000/3'}"],
+            "citations": [["a", "b", "c"], ["d", "e"], []],
+        },
+        index=[7, 7, 9],
+    )
+
+
+def test_stage_from_series_streams_without_copying(
+    prior_dataframe: DataFrame,
+):
+    with mock.patch.object(DataFrame, "copy") as copy:
+        staged = stage_from_series(prior_dataframe, "doi")
+        assert not isinstance(staged, list)
+        assert list(staged) == ["10.1000/1", "N/A", "10.1000/3"]
+    copy.assert_not_called()
+
+
+def test_stage_with_reference_indexes_sources_compactly(
+    prior_dataframe: DataFrame,
+):
+    staged = stage_with_reference(prior_dataframe)
+    assert isinstance(staged, StagedReference)
+    assert list(staged.terms) == ["a", "b", "c", "d", "e", "N/A"]
+    assert staged.sources.dtype == np.int32
+    assert staged.sources.tolist() == [0, 0, 0, 1, 1, 2]
+    assert list(staged.source_titles.categories) == ["N/A", "apple", "orange"]
+    assert list(staged.source_titles[staged.sources]) == [
+        "apple",
+        "apple",
+        "apple",
+        "orange",
+        "orange",
+        "N/A",
+    ]
+
+
+@pytest.mark.parametrize("lazy", (False, True))
+def test_stream_cells_reads_in_chunks(prior_dataframe: DataFrame, lazy: bool):
+    titles = prior_dataframe["title"]
+    cells = stream_cells(iter(titles) if lazy else titles, "title", 1)
+    assert list(cells) == ["apple", "orange", "N/A"]
+
+
+def test_staged_reference_joins_titles_on_source_positions(
+    prior_dataframe: DataFrame,
+):
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda term: (
+        None if term == "b" else {"citation": term}
+    )
+    fetcher = StagingFetcher(scraper, stage_with_reference)
+    dataframe = fetcher(prior_dataframe)
+    assert dataframe["source_titles"].dtype == "category"
+    assert dataframe[["citation", "source_titles"]].values.tolist() == [
+        ["a", "apple"],
+        ["c", "apple"],
+        ["d", "orange"],
+        ["e", "orange"],
+        ["N/A", "N/A"],
+    ]
+
+
+def test_staged_series_joins_by_position_on_a_repeated_index(
+    prior_dataframe: DataFrame,
+):
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda doi: (
+        None if doi == "N/A" else {"wordscore": int(doi[-1])}
+    )
+    fetcher = StagingFetcher(
+        scraper, lambda dataframe: stage_from_series(dataframe, "doi")
+    )
+    dataframe = fetcher(prior_dataframe)
+    assert dataframe.index.tolist() == [7, 7, 9]
+    assert dataframe["title"].tolist() == ["apple", "orange", None]
+    assert dataframe["wordscore"].fillna(0).tolist() == [1, 0, 3]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+from functools import partial
+from unittest import mock
+
+import pandas as pd
+
+from src.fetch import SciScraper, ScrapeFetcher, StagingFetcher
+from src.stagers import stage_from_series
+from src.store import ResultStore, paper_keys
+
+
+def test_paper_keys_prefer_lower_case_dois():
+    dataframe = pd.DataFrame({
+        "doi": ["10.1/ABC", None, None],
+        "internal_id": ["pub.1", "pub.2", None],
+    })
+    assert paper_keys(dataframe).tolist() == ["10.1/abc", "id:pub.2", None]
+
+
+def test_upsert_merges_runs_and_records_statuses(tmp_path):
+    with ResultStore(tmp_path / "store.sqlite") as store:
+        store.upsert(
+            pd.DataFrame({
+                "doi": ["10.1/a", "10.1/b"],
+                "title": ["A", None],
+                "times_cited": [3, 4],
+            })
+        )
+        store.upsert(
+            pd.DataFrame({
+                "doi": ["10.1/A", "10.1/b", None],
+                "success": [True, False, True],
+            }),
+            {"scraped", "downloaded"},
+        )
+        papers = store.query("SELECT * FROM papers ORDER BY key")
+        assert papers["key"].tolist() == ["10.1/a", "10.1/b"]
+        assert papers["title"].tolist() == ["A", None]
+        assert papers["downloaded_at"].notna().tolist() == [True, False]
+        assert json.loads(papers["record"][0]) == {
+            "doi": "10.1/A",
+            "title": "A",
+            "times_cited": 3,
+            "success": True,
+        }
+        assert store.known(["10.1/a", "10.1/b", "10.1/c"], "downloaded") == {
+            "10.1/a"
+        }
+
+
+def test_staging_fetcher_skips_papers_with_its_status(tmp_path):
+    store = ResultStore(tmp_path / "store.sqlite")
+    with store:
+        store.upsert(pd.DataFrame({"doi": ["10.1/a"]}), {"downloaded"})
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda doi: {"success": True}
+    fetcher = StagingFetcher(
+        scraper,
+        partial(stage_from_series, column="doi"),
+        store=store,
+        status="downloaded",
+    )
+    dataframe = fetcher(pd.DataFrame({"doi": ["10.1/a", "10.1/b"]}))
+    assert dataframe["doi"].tolist() == ["10.1/b"]
+    scraper.obtain.assert_called_once_with("10.1/b")
+
+    fetcher.force = True
+    dataframe = fetcher(pd.DataFrame({"doi": ["10.1/a", "10.1/b"]}))
+    assert dataframe["doi"].tolist() == ["10.1/a", "10.1/b"]
+
+
+def test_upsert_stamps_partly_reached_statuses_per_row(tmp_path):
+    with ResultStore(tmp_path / "store.sqlite") as store:
+        store.upsert(
+            pd.DataFrame({"doi": ["10.1/a", "10.1/b"]}),
+            {"scraped", "enriched"},
+            {"enriched": [False, True]},
+        )
+        papers = store.query("SELECT * FROM papers ORDER BY key")
+    assert papers["scraped_at"].notna().tolist() == [True, True]
+    assert papers["enriched_at"].notna().tolist() == [False, True]
+
+
+def test_branch_only_gives_the_stager_status_to_rows_it_found(tmp_path):
+    store = ResultStore(tmp_path / "store.sqlite")
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda doi: (
+        {"times_cited": 3} if doi == "10.1/b" else None
+    )
+    sciscraper = SciScraper(
+        ScrapeFetcher(mock.Mock(), serializer=list),
+        StagingFetcher(
+            scraper,
+            partial(stage_from_series, column="doi"),
+            status="enriched",
+        ),
+        export=False,
+        store=store,
+    )
+    sciscraper.branch(pd.DataFrame({"doi": ["10.1/a", "10.1/b"]}))
+    with store:
+        papers = store.query("SELECT * FROM papers ORDER BY key")
+    assert papers["scraped_at"].notna().tolist() == [True, True]
+    assert papers["enriched_at"].notna().tolist() == [False, True]
+
+
+def test_staging_fetcher_keeps_known_papers_from_the_store(tmp_path):
+    store = ResultStore(tmp_path / "store.sqlite")
+    with store:
+        store.upsert(
+            pd.DataFrame({
+                "doi_from_pdf": ["10.1/a"],
+                "wordscore": [1.0],
+                "times_cited": [7],
+            }),
+            {"enriched"},
+        )
+    scraper = mock.Mock()
+    scraper.obtain.side_effect = lambda doi: {"times_cited": 3}
+    fetcher = StagingFetcher(
+        scraper,
+        partial(stage_from_series, column="doi_from_pdf"),
+        store=store,
+        status="enriched",
+        keep_known=True,
+    )
+    prior = pd.DataFrame(
+        {"doi_from_pdf": ["10.1/b", "10.1/a", "10.1/c"], "wordscore": 2.0},
+        index=[5, 5, 6],
+    )
+    dataframe = fetcher(prior)
+    assert scraper.obtain.call_count == 2
+    assert dataframe.index.tolist() == [5, 5, 6]
+    assert dataframe["doi_from_pdf"].tolist() == ["10.1/b", "10.1/a", "10.1/c"]
+    assert dataframe["times_cited"].tolist() == [3, 7, 3]
+    assert dataframe["wordscore"].tolist() == [2.0, 2.0, 2.0]
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import shutil
+import threading
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.docscraper import DocumentResult
+from src.watch import DirectoryWatcher, scan_directory
+from src.workers import SupervisedPool
+
+
+@dataclass
+class StubScraper:
+    """A picklable stand-in for `DocScraper`."""
+
+    def obtain(self, search_text: Path) -> DocumentResult:
+        return DocumentResult(None, 1, 0, 10, 0.5)
+
+    def failed(self, search_text: Path, reason: str) -> DocumentResult:
+        return DocumentResult(None, 0, 0, 0, 0.0, failure=reason)
+
+
+@pytest.fixture()
+def watcher(tmp_path: Path):
+    source = tmp_path / "papers"
+    source.mkdir()
+    return DirectoryWatcher(
+        StubScraper(),  # type: ignore[arg-type]
+        source_dir=source,
+        export_dir=tmp_path / "exports",
+        pool=SupervisedPool(1),
+        poll_interval=0.05,
+        settle_time=0.1,
+    )
+
+
+def test_scan_directory_is_recursive(tmp_path: Path):
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "a.pdf").touch()
+    (tmp_path / "nested" / "b.PDF").touch()
+    (tmp_path / "c.txt").touch()
+    assert {path.name for path in scan_directory(tmp_path)} == {
+        "a.pdf",
+        "b.PDF",
+    }
+
+
+def test_settled_paths_waits_for_writes_to_finish(watcher: DirectoryWatcher):
+    pdf = Path(watcher.source_dir, "partial.pdf")
+    pdf.write_bytes(b"%PDF-1.4")
+    watcher._events.put(pdf)
+    assert watcher.settled_paths() == []
+    pdf.write_bytes(b"%PDF-1.4 more bytes")
+    assert watcher.settled_paths() == []
+    time.sleep(0.15)
+    assert watcher.settled_paths() == [pdf]
+    watcher._events.put(pdf)
+    assert watcher.settled_paths() == []
+
+
+def test_watcher_scores_new_files(watcher: DirectoryWatcher, test_pdf: str):
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, args=(stop,))
+    thread.start()
+    try:
+        shutil.copy(test_pdf, Path(watcher.source_dir, "arrival.pdf"))
+        deadline = time.monotonic() + 10
+        while not watcher.export_path().exists():
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        thread.join()
+    export = pd.read_csv(watcher.export_path())
+    assert export["filepath"].str.endswith("arrival.pdf").all()
+    assert len(export) == 1
+    # Files in the manifest are left to it.
+    assert not watcher._handled
+
+
+def drain(watcher: DirectoryWatcher) -> set[str]:
+    names = set()
+    while not watcher._events.empty():
+        names.add(watcher._events.get().name)
+    return names
+
+
+def test_poll_only_lists_changed_directories(watcher: DirectoryWatcher):
+    source = Path(watcher.source_dir)
+    (source / "nested").mkdir()
+    (source / "a.pdf").touch()
+    (source / "nested" / "b.pdf").touch()
+    watcher.poll()
+    assert drain(watcher) == {"a.pdf", "b.pdf"}
+    watcher.poll()
+    assert drain(watcher) == set()
+
+    (source / "nested" / "c.pdf").touch()
+    (source / "a.pdf").write_bytes(b"%PDF-1.4")
+    watcher.poll()
+    assert drain(watcher) == {"b.pdf", "c.pdf"}
+
+    (source / "new").mkdir()
+    (source / "new" / "d.pdf").touch()
+    watcher.poll()
+    assert drain(watcher) == {"a.pdf", "d.pdf"}
+
+
+def test_settled_paths_forgets_removed_files(watcher: DirectoryWatcher):
+    pdf = Path(watcher.source_dir, "gone.pdf")
+    pdf.write_bytes(b"%PDF-1.4")
+    watcher._events.put(pdf)
+    watcher.settled_paths()
+    time.sleep(0.15)
+    assert watcher.settled_paths() == [pdf]
+    assert pdf in watcher._handled
+    pdf.unlink()
+    watcher._events.put(pdf)
+    assert watcher.settled_paths() == []
+    assert pdf not in watcher._handled
@@ -123,3 +123,20 @@ def test_google_scholar_scraper():
         assert result.keywords == ["10.1007/s42979-022-00422-4"]
         assert result.figures == None
         assert result.biblio == None
+
+
+def test_obtain_batch_keeps_only_requested_ids(requests_mock):
+    scraper = DimensionsScraper(config.dimensions_ai_dataset_url, sleep_val=0)
+    requests_mock.get(
+        config.dimensions_ai_dataset_url,
+        json={
+            "docs": [
+                {"id": "pub.1", "doi": "10.1/a", "cited_dimensions_ids": []},
+                {"id": "pub.9", "doi": "10.1/z"},
+            ]
+        },
+    )
+    results = scraper.obtain_batch(["pub.1", "pub.2"])
+    assert requests_mock.call_count == 1
+    assert [result["internal_id"] for result in results] == ["pub.1"]
+    assert results[0]["citations"] == []
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from src.docscraper import DocScraper, DocumentResult
+from src.fetch import ScrapeFetcher
+from src.workers import (
+    MEBIBYTE,
+    SupervisedPool,
+    ThreadedPool,
+    WorkerFailure,
+)
+
+
+def square(item: int) -> int:
+    return item * item
+
+
+def slow_on_three(item: int) -> int:
+    if item == 3:
+        time.sleep(30)
+    return item
+
+
+def hoard_memory(item: int) -> int:
+    if item == 1:
+        hoard = bytearray(256 * MEBIBYTE)
+        time.sleep(30)
+        return len(hoard)
+    return item
+
+
+def raise_on_two(item: int) -> int:
+    if item == 2:
+        raise ValueError("malformed")
+    return item
+
+
+def test_map_preserves_order():
+    pool = SupervisedPool(workers=3)
+    assert list(pool.map(square, range(10))) == [n * n for n in range(10)]
+
+
+def test_map_accepts_lazy_items():
+    pool = SupervisedPool(workers=2)
+    assert list(pool.map(square, iter([4, 5]))) == [16, 25]
+
+
+def test_timeout_recycles_worker():
+    pool = SupervisedPool(workers=2, timeout=0.5)
+    outcomes = list(pool.map(slow_on_three, range(6)))
+    failure = outcomes[3]
+    assert isinstance(failure, WorkerFailure)
+    assert failure.item == 3
+    assert "time limit" in failure.reason
+    assert outcomes[:3] + outcomes[4:] == [0, 1, 2, 4, 5]
+
+
+def test_memory_limit_recycles_worker():
+    pool = SupervisedPool(workers=1, max_rss_mb=128)
+    outcomes = list(pool.map(hoard_memory, range(3)))
+    assert isinstance(outcomes[1], WorkerFailure)
+    assert "memory limit" in outcomes[1].reason
+    assert outcomes[0] == 0
+    assert outcomes[2] == 2
+
+
+def test_exceptions_become_failures():
+    pool = SupervisedPool(workers=1)
+    outcomes = list(pool.map(raise_on_two, range(4)))
+    assert outcomes[2] == WorkerFailure(2, "ValueError: malformed")
+    assert outcomes[3] == 3
+
+
+def test_fetch_records_failed_document_rows():
+    fetcher = ScrapeFetcher(DocScraper("", "", True), list)
+    failure = WorkerFailure("huge.pdf", "exceeded time limit of 300s")
+    result = fetcher.recover(failure)
+    assert isinstance(result, DocumentResult)
+    assert result.document_id == "huge.pdf"
+    assert result.failure == "exceeded time limit of 300s"
+
+
+@pytest.mark.parametrize("workers", (1, 4))
+def test_shutdown_leaves_no_workers(workers: int):
+    pool = SupervisedPool(workers=workers)
+    list(pool.map(square, range(3)))
+    assert pool.backlog == 0
+    assert pool._workers == []
+
+
+def test_threaded_pool_preserves_order_and_failures():
+    pool = ThreadedPool(workers=3)
+    outcomes = list(pool.map(raise_on_two, iter(range(8))))
+    assert outcomes[2] == WorkerFailure(2, "ValueError: malformed")
+    assert outcomes[:2] + outcomes[3:] == [0, 1, 3, 4, 5, 6, 7]